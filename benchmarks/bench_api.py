@@ -0,0 +1,135 @@
+"""Teste de carga da API HTTP/JSON em localhost
+
+Uso: python -m benchmarks.bench_api [--url http://127.0.0.1:8080] [--clientes 8] [--segundos 5]
+
+Sem --url, cria um banco temporário com dados de teste e sobe o servidor em
+uma thread, numa porta livre. Cada cliente mantém uma conexão keep-alive e
+dispara requisições em laço durante o tempo indicado, por cenário:
+- GET /itens/{id} (cache de itens aquecido);
+- GET /itens?limite=20 (página por nome);
+- POST /movimentacoes (entrada unitária);
+- POST /movimentacoes/lote (lotes de --lote entradas).
+
+Reporta requisições por segundo, p50/p95 de latência e erros.
+"""
+import argparse
+import http.client
+import json
+import os
+import random
+import statistics
+import tempfile
+import threading
+import time
+from pathlib import Path
+from urllib.parse import urlsplit
+
+def popular(itens: int):
+    from src.core.database import db_manager
+    with db_manager.conexao() as conn:
+        conn.executemany(
+            "INSERT OR IGNORE INTO itens (id, nome, quantidade, preco, tipo, nome_normalizado) "
+            "VALUES (?, ?, 0, 1, 'bench', ?)",
+            ((i, f"Bench {i:05d}", f"bench {i:05d}") for i in range(1, itens + 1)))
+
+def subir_servidor_local(itens: int) -> str:
+    tmp = tempfile.mkdtemp(prefix="bench_api_")
+    os.environ.setdefault("ALMOX_DB_PATH", str(Path(tmp) / "bench.db"))
+    os.environ.setdefault("ALMOX_BACKUP_DIR", str(Path(tmp) / "backups"))
+
+    from src.api import criar_servidor
+    popular(itens)
+    servidor = criar_servidor("127.0.0.1", 0)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    host, porta = servidor.server_address[:2]
+    return f"http://{host}:{porta}"
+
+def cenarios(itens: int, lote: int):
+    def obter_item():
+        return "GET", f"/itens/{random.randint(1, itens)}", None
+
+    def pagina_itens():
+        return "GET", "/itens?limite=20", None
+
+    def entrada():
+        return "POST", "/movimentacoes", {
+            'item_id': random.randint(1, itens), 'tipo': 'entrada',
+            'quantidade': 1, 'responsavel': 'bench'}
+
+    def entrada_lote():
+        return "POST", "/movimentacoes/lote", [
+            {'item_id': random.randint(1, itens), 'tipo': 'entrada',
+             'quantidade': 1, 'responsavel': 'bench'} for _ in range(lote)]
+
+    return {
+        "GET /itens/{id}": obter_item,
+        "GET /itens?limite=20": pagina_itens,
+        "POST /movimentacoes": entrada,
+        f"POST /movimentacoes/lote ({lote})": entrada_lote,
+    }
+
+def cliente(url, gerar, fim: float, latencias: list, erros: list):
+    partes = urlsplit(url)
+    conn = http.client.HTTPConnection(partes.hostname, partes.port, timeout=30)
+    try:
+        while time.perf_counter() < fim:
+            metodo, caminho, dados = gerar()
+            corpo = json.dumps(dados).encode() if dados is not None else None
+            cabecalhos = {'Content-Type': 'application/json'} if corpo else {}
+            inicio = time.perf_counter()
+            try:
+                conn.request(metodo, caminho, body=corpo, headers=cabecalhos)
+                resposta = conn.getresponse()
+                resposta.read()
+                if resposta.status >= 400:
+                    erros.append(resposta.status)
+            except (OSError, http.client.HTTPException) as e:
+                erros.append(str(e))
+                conn.close()
+                conn = http.client.HTTPConnection(partes.hostname, partes.port, timeout=30)
+                continue
+            latencias.append(time.perf_counter() - inicio)
+    finally:
+        conn.close()
+
+def medir(url: str, gerar, clientes: int, segundos: float) -> dict:
+    latencias, erros = [], []
+    fim = time.perf_counter() + segundos
+    threads = [threading.Thread(target=cliente, args=(url, gerar, fim, latencias, erros))
+               for _ in range(clientes)]
+    inicio = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    duracao = time.perf_counter() - inicio
+
+    ordenadas = sorted(latencias) or [0.0]
+    return {
+        "requisicoes_por_segundo": len(latencias) / duracao,
+        "p50_ms": statistics.median(ordenadas) * 1000,
+        "p95_ms": ordenadas[min(len(ordenadas) - 1, int(len(ordenadas) * 0.95))] * 1000,
+        "erros": len(erros),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", help="API já em execução (padrão: sobe um servidor local temporário)")
+    parser.add_argument("--itens", type=int, default=1000)
+    parser.add_argument("--clientes", type=int, default=8)
+    parser.add_argument("--segundos", type=float, default=5)
+    parser.add_argument("--lote", type=int, default=50)
+    args = parser.parse_args()
+
+    url = args.url or subir_servidor_local(args.itens)
+    print(f"Alvo: {url} | {args.clientes} clientes | {args.segundos:.0f}s por cenário\n")
+
+    print(f"{'CENÁRIO':<32} | {'REQ/S':>8} | {'P50 ms':>7} | {'P95 ms':>7} | {'ERROS':>5}")
+    print("-" * 72)
+    for nome, gerar in cenarios(args.itens, args.lote).items():
+        r = medir(url, gerar, args.clientes, args.segundos)
+        print(f"{nome:<32} | {r['requisicoes_por_segundo']:>8.0f} | {r['p50_ms']:>7.2f} | "
+              f"{r['p95_ms']:>7.2f} | {r['erros']:>5}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""Compara a latência do caminho síncrono com a fachada asyncio dos serviços
+
+Uso: python -m benchmarks.bench_async [--itens 50] [--movimentacoes 200000] [--consultas 200]
+
+Cria um banco temporário e mede:
+- histórico por item: item + checkpoints + saldos + listagem em sequência
+  (MovimentacaoService) contra as mesmas leituras combinadas com gather;
+- escritas concorrentes: N saídas disparadas de uma vez pelo caminho
+  síncrono (uma transação cada) contra a fachada assíncrona (escritor com
+  commit em grupo).
+
+Para cada cenário são reportados média, p50 e p95 da latência por operação.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+_TMP = tempfile.TemporaryDirectory()
+os.environ.setdefault("ALMOX_DB_PATH", str(Path(_TMP.name) / "bench.db"))
+os.environ.setdefault("ALMOX_BACKUP_DIR", str(Path(_TMP.name) / "backups"))
+
+from src.core.database import db_manager  # noqa: E402
+from src.core.escritor import escritor  # noqa: E402
+from src.services import async_service  # noqa: E402
+from src.services.async_service import AsyncMovimentacaoService  # noqa: E402
+from src.services.item_service import ItemService  # noqa: E402
+from src.services.movimentacao_service import MovimentacaoService  # noqa: E402
+
+def popular(itens: int, movimentacoes: int):
+    """Cria 'itens' itens com estoque alto e distribui as movimentações entre eles"""
+    with db_manager.conexao() as conn:
+        conn.execute("DELETE FROM movimentacoes")
+        conn.execute("DELETE FROM itens")
+        conn.executemany(
+            "INSERT INTO itens (id, nome, quantidade, preco, tipo, nome_normalizado) "
+            "VALUES (?, ?, 1000000, 1, 'bench', ?)",
+            ((i, f"Bench {i}", f"bench {i}") for i in range(1, itens + 1)))
+        conn.executemany(
+            "INSERT INTO movimentacoes (item_id, tipo, quantidade, data, responsavel, motivo) "
+            "VALUES (?, 'entrada', ?, ?, 'bench', 'carga de teste')",
+            ((1 + i % itens, 1 + i % 50, f"2024-{1 + i % 12:02d}-{1 + i % 28:02d} 12:00:00")
+             for i in range(movimentacoes)))
+    MovimentacaoService.atualizar_checkpoints()
+
+def resumo(latencias: list) -> str:
+    ordenadas = sorted(latencias)
+    p95 = ordenadas[min(len(ordenadas) - 1, int(len(ordenadas) * 0.95))]
+    return (f"{statistics.mean(ordenadas) * 1000:>8.2f} | {statistics.median(ordenadas) * 1000:>8.2f} | "
+            f"{p95 * 1000:>8.2f}")
+
+def historico_sincrono(itens: int, consultas: int) -> list:
+    item_service = ItemService()
+    latencias = []
+    for i in range(consultas):
+        item_id = 1 + i % itens
+        inicio = time.perf_counter()
+        item_service.buscar_por_id(item_id)
+        MovimentacaoService.historico_por_item(item_id, "01/03/2024", "30/09/2024")
+        latencias.append(time.perf_counter() - inicio)
+    return latencias
+
+async def historico_assincrono(itens: int, consultas: int) -> list:
+    servico = AsyncMovimentacaoService()
+    latencias = []
+    for i in range(consultas):
+        inicio = time.perf_counter()
+        await servico.item_com_historico(1 + i % itens, "01/03/2024", "30/09/2024")
+        latencias.append(time.perf_counter() - inicio)
+    return latencias
+
+def escritas_sincronas(itens: int, total: int, threads: int) -> list:
+    def saida(i):
+        inicio = time.perf_counter()
+        MovimentacaoService.registrar_movimentacao(1 + i % itens, 'saída', 1, 'bench', 'síncrono')
+        return time.perf_counter() - inicio
+
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        return list(executor.map(saida, range(total)))
+
+async def escritas_assincronas(itens: int, total: int) -> list:
+    servico = AsyncMovimentacaoService()
+
+    async def saida(i):
+        inicio = time.perf_counter()
+        await servico.registrar_movimentacao(1 + i % itens, 'saída', 1, 'bench', 'assíncrono')
+        return time.perf_counter() - inicio
+
+    return await asyncio.gather(*(saida(i) for i in range(total)))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--itens", type=int, default=50)
+    parser.add_argument("--movimentacoes", type=int, default=200_000)
+    parser.add_argument("--consultas", type=int, default=200)
+    parser.add_argument("--escritas", type=int, default=2000)
+    parser.add_argument("--threads", type=int, default=8)
+    args = parser.parse_args()
+
+    popular(args.itens, args.movimentacoes)
+
+    print(f"{'CENÁRIO':<34} | {'MÉDIA ms':>8} | {'P50 ms':>8} | {'P95 ms':>8}")
+    print("-" * 68)
+    print(f"{'histórico (síncrono)':<34} | {resumo(historico_sincrono(args.itens, args.consultas))}")
+    print(f"{'histórico (asyncio + gather)':<34} | "
+          f"{resumo(asyncio.run(historico_assincrono(args.itens, args.consultas)))}")
+
+    inicio = time.perf_counter()
+    latencias = escritas_sincronas(args.itens, args.escritas, args.threads)
+    duracao_sinc = time.perf_counter() - inicio
+    print(f"{f'saídas ({args.threads} threads, síncrono)':<34} | {resumo(latencias)}")
+
+    inicio = time.perf_counter()
+    latencias = asyncio.run(escritas_assincronas(args.itens, args.escritas))
+    duracao_async = time.perf_counter() - inicio
+    print(f"{'saídas (asyncio, commit em grupo)':<34} | {resumo(latencias)}")
+
+    print(f"\nVazão de escrita: síncrono {args.escritas / duracao_sinc:.0f} op/s | "
+          f"asyncio {args.escritas / duracao_async:.0f} op/s")
+
+    escritor.parar()
+    async_service.encerrar()
+    db_manager.fechar_conexoes()
+
+if __name__ == "__main__":
+    main()
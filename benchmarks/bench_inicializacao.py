@@ -0,0 +1,111 @@
+"""Mede a partida a frio do sistema até o prompt de login
+
+Uso: python -m benchmarks.bench_inicializacao [--execucoes 10] [--orcamento-ms 250] [--banco caminho.db]
+
+Cada execução inicia 'python main.py' num processo novo e cronometra até o
+texto "Usuário:" aparecer na saída. Antes, um processo à parte prepara o
+banco (esquema na versão atual), como numa instalação já em uso. Também são
+listados os módulos de importação mais lentos (python -X importtime) e o
+tempo de um interpretador vazio, como referência.
+
+Termina com código 1 se a mediana passar do orçamento.
+"""
+import argparse
+import os
+import re
+import selectors
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+PROMPT = "Usuário:".encode()
+
+def _ambiente(diretorio: Path, banco: Path) -> dict:
+    ambiente = dict(os.environ)
+    ambiente["ALMOX_DB_PATH"] = str(banco)
+    ambiente["ALMOX_BACKUP_DIR"] = str(diretorio / "backups")
+    ambiente["PYTHONPATH"] = str(RAIZ)
+    return ambiente
+
+def ate_prompt(diretorio: Path, ambiente: dict, limite: float = 30.0) -> float:
+    """Segundos entre iniciar main.py e o prompt de login aparecer"""
+    inicio = time.perf_counter()
+    processo = subprocess.Popen([sys.executable, "-u", str(RAIZ / "main.py")], cwd=diretorio, env=ambiente,
+                                stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    saida = b""
+    try:
+        with selectors.DefaultSelector() as seletor:
+            seletor.register(processo.stdout, selectors.EVENT_READ)
+            while PROMPT not in saida:
+                if time.perf_counter() - inicio > limite or not seletor.select(limite):
+                    raise TimeoutError("Prompt de login não apareceu")
+                bloco = os.read(processo.stdout.fileno(), 4096)
+                if not bloco:
+                    raise RuntimeError(f"main.py terminou antes do login: {saida.decode(errors='replace')}")
+                saida += bloco
+        return time.perf_counter() - inicio
+    finally:
+        processo.kill()
+        processo.wait()
+
+def interpretador_vazio(ambiente: dict) -> float:
+    inicio = time.perf_counter()
+    subprocess.run([sys.executable, "-c", "pass"], env=ambiente, check=True)
+    return time.perf_counter() - inicio
+
+def importacoes_lentas(diretorio: Path, ambiente: dict, quantidade: int) -> list:
+    """(módulo, próprio µs, acumulado µs) dos módulos com maior tempo próprio em 'import main'"""
+    resultado = subprocess.run([sys.executable, "-X", "importtime", "-c", "import main"],
+                               cwd=diretorio, env=ambiente, capture_output=True, text=True, check=True)
+    linhas = []
+    for linha in resultado.stderr.splitlines():
+        encontrado = re.match(r"import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)", linha)
+        if encontrado:
+            linhas.append((encontrado.group(4), int(encontrado.group(1)), int(encontrado.group(2))))
+    total = next((acumulado for nome, _, acumulado in linhas if nome == "main"), 0)
+    return total, sorted(linhas, key=lambda linha: linha[1], reverse=True)[:quantidade]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--execucoes", type=int, default=10)
+    parser.add_argument("--orcamento-ms", type=float, default=250)
+    parser.add_argument("--banco", type=Path, help="Banco a copiar (ex.: um gerado por benchmarks.gerador)")
+    parser.add_argument("--modulos", type=int, default=12, help="Quantos módulos lentos listar")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        diretorio = Path(tmp)
+        banco = diretorio / "almoxarifado.db"
+        if args.banco:
+            shutil.copyfile(args.banco, banco)
+        ambiente = _ambiente(diretorio, banco)
+        subprocess.run([sys.executable, "-c",
+                        "from src.core.database import db_manager; db_manager.criar_conexao().close()"],
+                       cwd=diretorio, env=ambiente, check=True)
+
+        vazio = statistics.median(interpretador_vazio(ambiente) for _ in range(5)) * 1000
+        tempos = sorted(ate_prompt(diretorio, ambiente) * 1000 for _ in range(args.execucoes))
+        total_importacao, lentos = importacoes_lentas(diretorio, ambiente, args.modulos)
+
+    mediana = statistics.median(tempos)
+    print(f"Interpretador vazio:       {vazio:8.1f} ms")
+    print(f"'import main':             {total_importacao / 1000:8.1f} ms")
+    print(f"Partida até o login (n={args.execucoes}): mediana {mediana:.1f} ms | "
+          f"mín {tempos[0]:.1f} ms | máx {tempos[-1]:.1f} ms")
+    print(f"\n{'MÓDULO':<45} | {'PRÓPRIO ms':>10} | {'ACUMULADO ms':>12}")
+    print("-" * 74)
+    for nome, proprio, acumulado in lentos:
+        print(f"{nome:<45} | {proprio / 1000:>10.1f} | {acumulado / 1000:>12.1f}")
+
+    if mediana > args.orcamento_ms:
+        print(f"\n⚠️ Partida acima do orçamento de {args.orcamento_ms:.0f} ms")
+        sys.exit(1)
+    print(f"\n✅ Dentro do orçamento de {args.orcamento_ms:.0f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""Compara memória e vazão ao materializar movimentações em diferentes representações
+
+Uso: python -m benchmarks.bench_modelos [--linhas 200000]
+
+Cria um banco temporário, insere as movimentações e mede, para cada modo:
+- dataclass comum (com __dict__) montada campo a campo, como antes;
+- Movimentacao com __slots__ via fábrica de linha registrada;
+- MovimentacaoView (tupla nomeada) convertida em blocos;
+- tupla crua do sqlite3, como referência do custo mínimo.
+
+O tempo reportado é o melhor de algumas repetições.
+"""
+import argparse
+import gc
+import os
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+_TMP = tempfile.TemporaryDirectory()
+os.environ.setdefault("ALMOX_DB_PATH", str(Path(_TMP.name) / "bench.db"))
+os.environ.setdefault("ALMOX_BACKUP_DIR", str(Path(_TMP.name) / "backups"))
+
+from src.core.database import db_manager  # noqa: E402
+from src.repositories.movimentacao_repository import MovimentacaoRepository, COLUNAS  # noqa: E402
+
+@dataclass
+class MovimentacaoSemSlots:
+    id: Optional[int] = None
+    item_id: int = 0
+    tipo: str = ""
+    quantidade: int = 0
+    data: str = ""
+    responsavel: str = ""
+    motivo: Optional[str] = None
+
+def popular(linhas: int):
+    """Insere um item e 'linhas' movimentações de entrada"""
+    with db_manager.conexao() as conn:
+        conn.execute("DELETE FROM movimentacoes")
+        conn.execute(
+            "INSERT OR IGNORE INTO itens (id, nome, quantidade, preco, tipo, nome_normalizado) "
+            "VALUES (1, 'Bench', 0, 1, 'bench', 'bench')")
+        conn.executemany(
+            "INSERT INTO movimentacoes (item_id, tipo, quantidade, data, responsavel, motivo) "
+            "VALUES (1, 'entrada', ?, ?, 'bench', 'carga de teste')",
+            ((1 + i % 50, f"2024-{1 + i % 12:02d}-{1 + i % 28:02d} 12:00:00") for i in range(linhas)))
+
+def modo_sem_slots():
+    with db_manager.conexao() as conn:
+        cursor = conn.cursor()
+        cursor.execute(f"SELECT {COLUNAS} FROM movimentacoes ORDER BY data DESC, id DESC")
+        return [
+            MovimentacaoSemSlots(
+                id=row[0], item_id=row[1], tipo=row[2], quantidade=row[3],
+                data=row[4], responsavel=row[5], motivo=row[6]
+            ) for row in cursor.fetchall()
+        ]
+
+def modo_slots():
+    return list(MovimentacaoRepository.iter_todas())
+
+def modo_visao():
+    return list(MovimentacaoRepository.iter_todas(visao=True))
+
+def modo_tupla():
+    with db_manager.conexao() as conn:
+        cursor = conn.cursor()
+        cursor.execute(f"SELECT {COLUNAS} FROM movimentacoes ORDER BY data DESC, id DESC")
+        return cursor.fetchall()
+
+MODOS = {
+    "dataclass (__dict__)": modo_sem_slots,
+    "dataclass (__slots__)": modo_slots,
+    "view (tupla nomeada)": modo_visao,
+    "tupla crua (referência)": modo_tupla,
+}
+
+def medir(funcao, linhas: int, repeticoes: int = 3) -> dict:
+    duracao = float("inf")
+    for _ in range(repeticoes):
+        gc.collect()
+        inicio = time.perf_counter()
+        resultado = funcao()
+        duracao = min(duracao, time.perf_counter() - inicio)
+        assert len(resultado) == linhas
+        del resultado
+
+    gc.collect()
+    tracemalloc.start()
+    resultado = funcao()
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del resultado
+
+    return {
+        "segundos": duracao,
+        "linhas_por_segundo": linhas / duracao,
+        "pico_mb": pico / 1024 / 1024,
+        "bytes_por_linha": pico / linhas,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--linhas", type=int, default=200_000)
+    args = parser.parse_args()
+
+    popular(args.linhas)
+
+    print(f"{'MODO':<24} | {'TEMPO (s)':>9} | {'LINHAS/S':>10} | {'PICO (MB)':>9} | {'B/LINHA':>7}")
+    print("-" * 72)
+    for nome, funcao in MODOS.items():
+        r = medir(funcao, args.linhas)
+        print(f"{nome:<24} | {r['segundos']:>9.3f} | {r['linhas_por_segundo']:>10.0f} | "
+              f"{r['pico_mb']:>9.1f} | {r['bytes_por_linha']:>7.0f}")
+
+    db_manager.fechar_conexoes()
+
+if __name__ == "__main__":
+    main()
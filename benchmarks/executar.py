@@ -0,0 +1,216 @@
+"""Mede os pontos de entrada de repositórios e serviços sobre um banco sintético
+
+Uso:
+    python -m benchmarks.executar [--itens 100000] [--movimentacoes 10000000] [--semente 42]
+                                  [--repeticoes 5] [--saida resultado.json]
+                                  [--comparar base.json] [--tolerancia 0.20]
+
+O banco é gerado uma vez por combinação de parâmetros (benchmarks/.dados) e
+copiado para um diretório temporário a cada execução, então casos que
+escrevem não contaminam as execuções seguintes. Cada caso roda uma vez para
+aquecer e depois 'repeticoes' vezes; o JSON guarda mínimo, mediana, p95 e
+média em milissegundos.
+
+Com --comparar, os casos cuja mediana piorou mais que a tolerância em
+relação ao JSON de base são apontados e o processo termina com código 1.
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+DIR_DADOS = Path(__file__).parent / ".dados"
+DIR_RESULTADOS = Path(__file__).parent / "resultados"
+
+def preparar_banco(itens: int, movimentacoes: int, semente: int) -> Path:
+    """Gera (se preciso) o banco base e devolve uma cópia descartável dele"""
+    base = DIR_DADOS / f"almox_{itens}_{movimentacoes}_{semente}.db"
+    if not base.exists():
+        print(f"Gerando banco base {base.name} ...")
+        subprocess.run(
+            [sys.executable, "-m", "benchmarks.gerador", "--banco", str(base),
+             "--itens", str(itens), "--movimentacoes", str(movimentacoes), "--semente", str(semente)],
+            check=True)
+
+    destino = Path(tempfile.mkdtemp(prefix="almox_bench_")) / "almoxarifado.db"
+    shutil.copyfile(base, destino)
+    return destino
+
+def medir(funcao: Callable, repeticoes: int, aquecer: bool = True) -> dict:
+    if aquecer:
+        funcao()
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append((time.perf_counter() - inicio) * 1000)
+    ordenados = sorted(tempos)
+    return {
+        "repeticoes": repeticoes,
+        "min_ms": round(ordenados[0], 3),
+        "mediana_ms": round(statistics.median(ordenados), 3),
+        "p95_ms": round(ordenados[min(len(ordenados) - 1, int(len(ordenados) * 0.95))], 3),
+        "media_ms": round(statistics.mean(ordenados), 3),
+    }
+
+def casos(itens: int) -> List[tuple]:
+    """(nome, função, aquecer, repetições fixas) na ordem de execução; casos que escrevem ficam por último"""
+    from src.models.movimentacao import Movimentacao
+    from src.repositories.item_repository import ItemRepository
+    from src.repositories.movimentacao_repository import MovimentacaoRepository
+    from src.services import ItemService, MovimentacaoService, RelatorioService, analise_consumo
+
+    item_service = ItemService()
+    # Item popular (muitas movimentações) e item aleatório de cauda
+    with sqlite3.connect(os.environ["ALMOX_DB_PATH"]) as conn:
+        item_popular = conn.execute(
+            "SELECT item_id FROM movimentacoes GROUP BY item_id ORDER BY COUNT(*) DESC LIMIT 1").fetchone()[0]
+        fim = conn.execute("SELECT MAX(data) FROM movimentacoes").fetchone()[0][:10]
+    item_cauda = max(1, itens // 2)
+    ano = datetime.strptime(fim, "%Y-%m-%d")
+    mes_inicio = ano.replace(day=1).strftime("%d/%m/%Y")
+    mes_fim = ano.strftime("%d/%m/%Y")
+    ano_inicio = ano.replace(month=1, day=1).strftime("%d/%m/%Y")
+
+    contador = {"n": 0}
+
+    def entrada():
+        contador["n"] += 1
+        return Movimentacao(item_id=1 + contador["n"] % itens, tipo='entrada', quantidade=1,
+                            data=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                            responsavel='benchmark', motivo='benchmark')
+
+    def registrar_unitario():
+        for _ in range(100):
+            MovimentacaoRepository.registrar(entrada())
+
+    def registrar_lote():
+        MovimentacaoRepository.registrar_lote([entrada() for _ in range(1000)])
+
+    # A previsão de consumo só roda com o numpy instalado
+    previsao = [("RelatorioService.previsao_consumo (180 dias)",
+                 lambda: RelatorioService.previsao_consumo(mes_fim), True, None)] \
+        if analise_consumo.disponivel() else []
+
+    return [
+        ("atualizar_checkpoints (todos os itens)", MovimentacaoService.atualizar_checkpoints, False, 1),
+        ("ItemRepository.buscar_por_nome (termo comum)", lambda: ItemRepository.buscar_por_nome("papel"), True, None),
+        ("ItemRepository.buscar_por_nome (termo raro)", lambda: ItemRepository.buscar_por_nome("hdmi alfa 0001"), True, None),
+        ("ItemRepository.buscar_por_nome (2 letras)", lambda: ItemRepository.buscar_por_nome("ca"), True, None),
+        ("ItemRepository.buscar_por_id (cache)", lambda: ItemRepository.buscar_por_id(item_popular), True, None),
+        ("ItemService.listar_todos", item_service.listar_todos, True, None),
+        ("ItemService.listar_pagina (20)", lambda: item_service.listar_pagina(20), True, None),
+        ("MovimentacaoService.historico_por_item (popular, mês)",
+         lambda: MovimentacaoService.historico_por_item(item_popular, mes_inicio, mes_fim), True, None),
+        ("MovimentacaoService.historico_por_item (popular, tudo)",
+         lambda: MovimentacaoService.historico_por_item(item_popular), True, None),
+        ("MovimentacaoService.historico_por_item (cauda, tudo)",
+         lambda: MovimentacaoService.historico_por_item(item_cauda), True, None),
+        ("MovimentacaoService.listar_pagina (20)", lambda: MovimentacaoService.listar_pagina(20), True, None),
+        ("RelatorioService.itens_prox_validade (30 dias)", lambda: RelatorioService.itens_prox_validade(30), True, None),
+        ("RelatorioService.estoque_baixo (5)", lambda: RelatorioService.estoque_baixo(5), True, None),
+        ("RelatorioService.movimentacoes_por_periodo (mês)",
+         lambda: RelatorioService.movimentacoes_por_periodo(mes_inicio, mes_fim), True, None),
+        ("RelatorioService.movimentacoes_por_periodo (ano)",
+         lambda: RelatorioService.movimentacoes_por_periodo(ano_inicio, mes_fim), True, None),
+        ("RelatorioService.movimentacoes_detalhadas (mês)",
+         lambda: RelatorioService.movimentacoes_detalhadas(mes_inicio, mes_fim), True, None),
+        ("RelatorioService.curva_abc (estoque)", lambda: RelatorioService.curva_abc('estoque'), True, None),
+        ("RelatorioService.curva_abc (consumo, ano)",
+         lambda: RelatorioService.curva_abc('consumo', ano_inicio, mes_fim), True, None),
+        *previsao,
+        ("MovimentacaoRepository.registrar (100 unitárias)", registrar_unitario, True, None),
+        ("MovimentacaoRepository.registrar_lote (1000)", registrar_lote, True, None),
+        # Só a primeira execução tem vencidos para baixar
+        ("ItemService.processar_vencimentos", item_service.processar_vencimentos, False, 1),
+    ]
+
+def comparar(atual: dict, base: dict, tolerancia: float) -> List[str]:
+    """Casos cuja mediana piorou além da tolerância"""
+    regressoes = []
+    for nome, resultado in atual["casos"].items():
+        anterior = base.get("casos", {}).get(nome)
+        if not anterior or not anterior.get("mediana_ms"):
+            continue
+        variacao = resultado["mediana_ms"] / anterior["mediana_ms"] - 1
+        resultado["variacao_mediana"] = round(variacao, 4)
+        if variacao > tolerancia:
+            regressoes.append(f"{nome}: {anterior['mediana_ms']:.2f} -> {resultado['mediana_ms']:.2f} ms "
+                              f"(+{variacao:.0%})")
+    return regressoes
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--itens", type=int, default=100_000)
+    parser.add_argument("--movimentacoes", type=int, default=10_000_000)
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--repeticoes", type=int, default=5)
+    parser.add_argument("--filtro", help="Executa só os casos cujo nome contém este texto")
+    parser.add_argument("--saida", type=Path, help="Arquivo JSON (padrão: benchmarks/resultados/<data>.json)")
+    parser.add_argument("--comparar", type=Path, help="JSON de uma execução anterior para detectar regressões")
+    parser.add_argument("--tolerancia", type=float, default=0.20, help="Piora aceita na mediana (padrão 20%%)")
+    args = parser.parse_args(argv)
+
+    banco = preparar_banco(args.itens, args.movimentacoes, args.semente)
+    os.environ["ALMOX_DB_PATH"] = str(banco)
+    os.environ["ALMOX_BACKUP_DIR"] = str(banco.parent / "backups")
+
+    from src.core.database import db_manager
+
+    resultado: Dict = {
+        "meta": {
+            "data": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "plataforma": platform.platform(),
+            "itens": args.itens,
+            "movimentacoes": args.movimentacoes,
+            "semente": args.semente,
+            "repeticoes": args.repeticoes,
+        },
+        "casos": {},
+    }
+
+    print(f"{'CASO':<56} | {'MEDIANA ms':>10} | {'P95 ms':>9}")
+    print("-" * 82)
+    try:
+        for nome, funcao, aquecer, repeticoes in casos(args.itens):
+            if args.filtro and args.filtro.lower() not in nome.lower():
+                continue
+            medicao = medir(funcao, repeticoes or args.repeticoes, aquecer)
+            resultado["casos"][nome] = medicao
+            print(f"{nome:<56} | {medicao['mediana_ms']:>10.2f} | {medicao['p95_ms']:>9.2f}")
+    finally:
+        db_manager.fechar_conexoes()
+        shutil.rmtree(banco.parent, ignore_errors=True)
+
+    regressoes = []
+    if args.comparar:
+        regressoes = comparar(resultado, json.loads(args.comparar.read_text(encoding="utf-8")), args.tolerancia)
+        resultado["meta"]["comparado_com"] = str(args.comparar)
+        resultado["regressoes"] = regressoes
+
+    saida = args.saida or DIR_RESULTADOS / f"{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    saida.parent.mkdir(parents=True, exist_ok=True)
+    saida.write_text(json.dumps(resultado, indent=2, ensure_ascii=False), encoding="utf-8")
+    print(f"\nResultados em {saida}")
+
+    if regressoes:
+        print(f"\n⚠️ {len(regressoes)} regressões acima de {args.tolerancia:.0%}:")
+        for linha in regressoes:
+            print(f"- {linha}")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
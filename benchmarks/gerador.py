@@ -0,0 +1,201 @@
+"""Gera um almoxarifado sintético e reprodutível para benchmarks
+
+Uso: python -m benchmarks.gerador --banco caminho.db [--itens 100000] [--movimentacoes 10000000] [--semente 42]
+
+Com a mesma semente, os mesmos parâmetros e a mesma --referencia os dados
+gerados são idênticos. As distribuições tentam imitar um almoxarifado real:
+- categorias com pesos diferentes; perecíveis (limpeza, alimentício, EPI)
+  têm validade espalhada entre vencidos há meses e vencimentos em até 2 anos;
+- preços log-normais;
+- popularidade dos itens em lei de potência (poucos itens concentram a maior
+  parte das movimentações);
+- movimentações em dias úteis, das 8h às 18h, ao longo de 'dias' dias até a
+  data de referência, ~75% saídas pequenas e entradas em lotes de reposição;
+  uma saída sem estoque suficiente vira reposição, então o saldo nunca fica
+  negativo.
+"""
+import argparse
+import os
+import random
+import sqlite3
+import time
+from datetime import date, datetime, timedelta
+from itertools import accumulate
+from pathlib import Path
+
+# (categoria, peso, perecível, unidades, produtos)
+CATEGORIAS = [
+    ("limpeza", 20, True, ("un", "lt", "cx"),
+     ("Detergente", "Sabão em pó", "Desinfetante", "Água sanitária", "Álcool 70%", "Esponja", "Pano de chão")),
+    ("expediente", 25, False, ("un", "cx", "pct", "resma"),
+     ("Papel A4", "Caneta esferográfica", "Grampeador", "Clipes", "Envelope pardo", "Pasta suspensa", "Toner")),
+    ("alimentício", 15, True, ("kg", "un", "pct", "lt"),
+     ("Café torrado", "Açúcar refinado", "Chá mate", "Biscoito água e sal", "Leite UHT", "Adoçante")),
+    ("EPI", 10, True, ("par", "un", "cx"),
+     ("Luva nitrílica", "Máscara PFF2", "Óculos de proteção", "Protetor auricular", "Capacete")),
+    ("informática", 10, False, ("un", "cx"),
+     ("Mouse USB", "Teclado ABNT2", "Cabo HDMI", "Pen drive 32GB", "Filtro de linha")),
+    ("manutenção", 20, False, ("un", "cx", "m", "kg"),
+     ("Lâmpada LED", "Fita isolante", "Parafuso 6mm", "Disjuntor 20A", "Tinta acrílica", "Cabo flexível 2,5mm")),
+]
+MARCAS = ("Alfa", "Brasilux", "Cemar", "Delta", "Estrela", "Fortex", "Gaia", "Horizonte", "Ipê", "Jatobá")
+RESPONSAVEIS = ("Ana", "Bruno", "Carla", "Diego", "Elisa", "Fábio", "Gabriela", "Hugo", "Iara", "João",
+                "Karen", "Luís", "Marta", "Nelson", "Olga", "Paulo", "Rita", "Sérgio", "Tânia", "Vítor")
+MOTIVOS_SAIDA = ("Consumo do setor", "Requisição interna", "Manutenção predial", "Evento", None)
+MOTIVOS_ENTRADA = ("Reposição de estoque", "Compra emergencial", "Doação", None)
+
+LOTE_INSERCAO = 50_000
+
+def _dias_uteis(inicio: date, fim: date):
+    dia = inicio
+    while dia <= fim:
+        if dia.weekday() < 5:
+            yield dia
+        dia += timedelta(days=1)
+
+def gerar_itens(rng: random.Random, quantidade: int, referencia: date):
+    """Gera as linhas de itens (id, nome, marca, saldo inicial, unidade, preço, tipo, descrição, validade)"""
+    pesos = list(accumulate(c[1] for c in CATEGORIAS))
+    for item_id in range(1, quantidade + 1):
+        categoria, _, perecivel, unidades, produtos = rng.choices(CATEGORIAS, cum_weights=pesos)[0]
+        marca = rng.choice(MARCAS)
+        nome = f"{rng.choice(produtos)} {marca} {item_id:06d}"
+        validade = None
+        if perecivel:
+            validade = (referencia + timedelta(days=int(rng.triangular(-120, 720, 180)))).isoformat()
+        yield (item_id, nome, marca, rng.randint(0, 100), rng.choice(unidades),
+               round(rng.lognormvariate(2.5, 1.0), 2), categoria,
+               f"Item sintético da categoria {categoria}", validade)
+
+def gerar_movimentacoes(rng: random.Random, quantidade: int, saldos: list, dias: int, referencia: date):
+    """Gera (item_id, tipo, quantidade, data, responsável, motivo) em ordem cronológica
+
+    'saldos' (indexado por item_id) é atualizado com o estoque resultante.
+    """
+    itens = len(saldos) - 1
+    # Popularidade em lei de potência sobre uma ordem aleatória dos itens
+    ordem = list(range(1, itens + 1))
+    rng.shuffle(ordem)
+    pesos = list(accumulate(1 / (posicao ** 1.1) for posicao in range(1, itens + 1)))
+
+    uteis = list(_dias_uteis(referencia - timedelta(days=dias), referencia - timedelta(days=1)))
+    segundos_uteis = len(uteis) * 10 * 3600
+    passo = segundos_uteis / max(quantidade, 1)
+
+    gerados = 0
+    while gerados < quantidade:
+        escolhidos = rng.choices(ordem, cum_weights=pesos, k=min(10_000, quantidade - gerados))
+        for item_id in escolhidos:
+            deslocamento = int(gerados * passo)
+            dia = uteis[deslocamento // 36000]
+            momento = datetime.combine(dia, datetime.min.time()) + timedelta(seconds=8 * 3600 + deslocamento % 36000)
+
+            if rng.random() < 0.75:
+                qtd = int(rng.expovariate(1 / 4)) + 1
+                if saldos[item_id] >= qtd:
+                    saldos[item_id] -= qtd
+                    yield (item_id, 'saída', qtd, momento.strftime("%Y-%m-%d %H:%M:%S"),
+                           rng.choice(RESPONSAVEIS), rng.choice(MOTIVOS_SAIDA))
+                    gerados += 1
+                    continue
+            qtd = rng.randint(1, 20) * 10
+            saldos[item_id] += qtd
+            yield (item_id, 'entrada', qtd, momento.strftime("%Y-%m-%d %H:%M:%S"),
+                   rng.choice(RESPONSAVEIS), rng.choice(MOTIVOS_ENTRADA))
+            gerados += 1
+
+def gerar(banco: Path, itens: int, movimentacoes: int, semente: int = 42, dias: int = 730,
+          referencia: date = None, verboso: bool = True) -> dict:
+    """Cria o banco em 'banco' (que não deve existir) e retorna os parâmetros usados"""
+    if banco.exists():
+        raise FileExistsError(f"{banco} já existe")
+    banco.parent.mkdir(parents=True, exist_ok=True)
+    os.environ["ALMOX_DB_PATH"] = str(banco)
+    os.environ.setdefault("ALMOX_BACKUP_DIR", str(banco.parent / "backups"))
+    from src.core.database import db_manager
+    from src.utils.helpers import normalizar_texto
+
+    referencia = referencia or date.today()
+    rng = random.Random(semente)
+    inicio = time.perf_counter()
+    conn = db_manager.criar_conexao()
+    try:
+        linhas_itens = list(gerar_itens(rng, itens, referencia))
+        saldos = [0] * (itens + 1)
+        for linha in linhas_itens:
+            saldos[linha[0]] = linha[3]
+
+        conn.execute("BEGIN")
+        conn.executemany(
+            """INSERT INTO itens (id, nome, marca, quantidade, saldo_inicial, unidade, preco, tipo,
+                descricao, data_validade, nome_normalizado, marca_normalizada, tipo_normalizado,
+                descricao_normalizada)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+            ((i, nome, marca, saldo, saldo, unidade, preco, tipo, descricao, validade,
+              normalizar_texto(nome), normalizar_texto(marca), normalizar_texto(tipo), normalizar_texto(descricao))
+             for i, nome, marca, saldo, unidade, preco, tipo, descricao, validade in linhas_itens))
+        conn.commit()
+        del linhas_itens
+
+        gerador = gerar_movimentacoes(rng, movimentacoes, saldos, dias, referencia)
+        inseridas = 0
+        while inseridas < movimentacoes:
+            lote = [linha for _, linha in zip(range(LOTE_INSERCAO), gerador)]
+            if not lote:
+                break
+            conn.execute("BEGIN")
+            conn.executemany(
+                """INSERT INTO movimentacoes (item_id, tipo, quantidade, data, responsavel, motivo)
+                VALUES (?, ?, ?, ?, ?, ?)""", lote)
+            conn.commit()
+            inseridas += len(lote)
+            if verboso:
+                print(f"\r  {inseridas}/{movimentacoes} movimentações", end="", flush=True)
+        if verboso and movimentacoes:
+            print()
+
+        conn.execute("BEGIN")
+        conn.executemany("UPDATE itens SET quantidade = ? WHERE id = ?",
+                         ((saldo, item_id) for item_id, saldo in enumerate(saldos) if item_id))
+        conn.commit()
+
+        conn.execute("ANALYZE")
+    finally:
+        conn.close()
+        db_manager.fechar_conexoes()
+
+    # Arquivo único, sem -wal, para poder ser copiado como base limpa; só
+    # depois de fechar o pool, senão o modo de journal não pode mudar
+    conn = sqlite3.connect(banco)
+    try:
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        conn.execute("PRAGMA journal_mode = DELETE")
+    finally:
+        conn.close()
+
+    parametros = {
+        "itens": itens,
+        "movimentacoes": movimentacoes,
+        "semente": semente,
+        "dias": dias,
+        "referencia": referencia.isoformat(),
+    }
+    if verboso:
+        print(f"Banco gerado em {time.perf_counter() - inicio:.1f}s: {banco}")
+    return parametros
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--banco", type=Path, required=True)
+    parser.add_argument("--itens", type=int, default=100_000)
+    parser.add_argument("--movimentacoes", type=int, default=10_000_000)
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--dias", type=int, default=730, help="Janela de movimentações até a referência")
+    parser.add_argument("--referencia", type=date.fromisoformat, default=None,
+                        help="Data de referência AAAA-MM-DD (padrão: hoje)")
+    args = parser.parse_args()
+
+    gerar(args.banco, args.itens, args.movimentacoes, args.semente, args.dias, args.referencia)
+
+if __name__ == "__main__":
+    main()
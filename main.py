@@ -1,23 +1,120 @@
+import argparse
 import logging
+import signal
+import threading
+from datetime import datetime, timedelta
+from typing import Optional
 
+from src.core import config
+from src.core.agendador import Agendador
 from src.core.auth import Autenticador
+from src.core.database import db_manager
 from src.cli.menu_principal import MenuPrincipal
-from src.services import ItemService
+from src.services import ItemService, MovimentacaoService
+from src.utils.logger import configurar_logger
 
 
+def baixar_vencidos(marca: Optional[str]):
+    """Baixa incremental: só itens vencidos desde a última execução ('marca' = AAAA-MM-DD)"""
+    agora = datetime.now()
+    sucesso, mensagem, itens = ItemService().baixar_vencidos(desde=marca, agora=agora)
+    if not sucesso:
+        raise RuntimeError(mensagem)
+    for _, nome, quantidade in itens:
+        logging.info(f"{nome} - {quantidade} baixados por vencimento")
+    # Itens com validade anterior à data de referência já foram tratados
+    return f"{len(itens)} itens baixados", agora.strftime("%Y-%m-%d")
+
+def varrer_vencidos(marca: Optional[str]):
+    """Varredura completa: itens vencidos que voltaram a ter estoque ou tiveram a validade editada"""
+    mensagem, _ = baixar_vencidos(None)
+    return mensagem, None
+
+def fazer_backup(marca: Optional[str]):
+    # backup_agendado confere a idade do último backup e aplica a retenção
+    novo = db_manager.backup_agendado()
+    return (f"Backup criado: {novo.name}" if novo else "Nenhum backup criado"), None
+
+def atualizar_checkpoints(marca: Optional[str]):
+    return f"{MovimentacaoService.atualizar_checkpoints()} checkpoints de saldo gravados", None
+
+def atualizar_replica(marca: Optional[str]):
+    return f"Réplica de leitura atualizada: {db_manager.atualizar_replica()}", None
+
+def otimizar_banco(marca: Optional[str]):
+    with db_manager.conexao() as conn:
+        conn.execute("PRAGMA optimize")
+    return "PRAGMA optimize executado", None
+
+def criar_agendador() -> Agendador:
+    """Agendador com as rotinas automáticas do sistema"""
+    agendador = Agendador()
+    agendador.registrar("vencimentos", timedelta(minutes=config.VENCIMENTOS_INTERVALO_MIN), baixar_vencidos,
+                        "Baixa automática de itens vencidos desde a última execução")
+    agendador.registrar("vencimentos_completo", timedelta(days=config.VENCIMENTOS_VARREDURA_DIAS),
+                        varrer_vencidos, "Baixa de todos os itens vencidos com estoque")
+    agendador.registrar("backup", timedelta(hours=config.BACKUP_INTERVALO_HORAS), fazer_backup,
+                        "Backup com verificação, compressão e retenção")
+    agendador.registrar("checkpoints", timedelta(hours=config.CHECKPOINTS_INTERVALO_HORAS),
+                        atualizar_checkpoints, "Checkpoints mensais de saldo")
+    if config.LEITURA_MODO == "replica":
+        agendador.registrar("replica", timedelta(minutes=config.LEITURA_REPLICA_INTERVALO_MIN),
+                            atualizar_replica, "Cópia do banco lida pelos relatórios e exportações")
+    agendador.registrar("otimizar", timedelta(hours=config.OTIMIZAR_INTERVALO_HORAS), otimizar_banco,
+                        "Estatísticas do planejador (PRAGMA optimize)")
+    return agendador
+
 def executar_tarefas_agendadas():
-    """Executa rotinas automáticas do sistema"""
-    item_service = ItemService()
-    resultados = item_service.processar_vencimentos()
+    """Executa as rotinas automáticas vencidas, a menos que outra instância (ex.: o daemon) cuide delas"""
+    criar_agendador().executar_uma_vez()
 
-    if resultados:
-        logging.info(f"Baixa automática: {len(resultados)} itens processados")
-        for r in resultados:
-            logging.info(f"{r['item']} - {r['mensagem']}")
+def iniciar_tarefas_agendadas() -> threading.Thread:
+    """Roda as rotinas automáticas em segundo plano, sem atrasar o login
 
-if __name__ == "__main__":
-    executar_tarefas_agendadas()  # Executa antes do menu principal
-    MenuPrincipal.iniciar_sistema()
+    A thread não é daemon: ao sair, o processo espera a baixa e o backup em
+    andamento terminarem em vez de interrompê-los no meio.
+    """
+    def executar():
+        try:
+            executar_tarefas_agendadas()
+        except Exception as e:
+            logging.error(f"Erro nas tarefas agendadas: {e}")
+
+    tarefa = threading.Thread(target=executar, name="tarefas-agendadas")
+    tarefa.start()
+    return tarefa
+
+def executar_daemon(tick: float):
+    """Agendador em primeiro plano até SIGINT/SIGTERM"""
+    agendador = criar_agendador()
+    for sinal in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(sinal, lambda *_: agendador.parar())
+    agendador.executar_continuamente(tick)
+
+def ler_argumentos():
+    parser = argparse.ArgumentParser(description="Sistema de almoxarifado")
+    parser.add_argument("--servidor", action="store_true",
+                        help="Inicia a API HTTP/JSON em vez do menu interativo")
+    parser.add_argument("--host", default="127.0.0.1", help="Endereço da API (padrão: 127.0.0.1)")
+    parser.add_argument("--porta", type=int, default=8080, help="Porta da API (padrão: 8080)")
+    parser.add_argument("--daemon", action="store_true",
+                        help="Executa só o agendador (baixa de vencidos, backup, checkpoints, réplica, otimização)")
+    parser.add_argument("--tick", type=float, default=config.AGENDADOR_TICK_S,
+                        help="Segundos entre verificações do agendador")
+    return parser.parse_args()
 
 if __name__ == "__main__":
-    MenuPrincipal.iniciar_sistema()
\ No newline at end of file
+    args = ler_argumentos()
+    # No menu interativo o log vai só para o arquivo
+    configurar_logger(console=args.daemon or args.servidor)
+
+    if args.daemon:
+        executar_daemon(args.tick)
+    else:
+        iniciar_tarefas_agendadas()  # Em paralelo com o login ou a API
+
+        if args.servidor:
+            from src.api import iniciar_servidor
+            iniciar_servidor(args.host, args.porta)
+        else:
+            MenuPrincipal.iniciar_sistema()
@@ -0,0 +1,3 @@
+from .servidor import criar_servidor, iniciar_servidor
+
+__all__ = ['criar_servidor', 'iniciar_servidor']
@@ -0,0 +1,411 @@
+import json
+import re
+from dataclasses import asdict, is_dataclass
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from itertools import islice
+from datetime import datetime
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from src.core.database import db_manager
+from src.core.escritor import escritor
+from src.models.item import Item
+from src.models.movimentacao import Movimentacao
+from src.services.item_service import ItemService
+from src.services.movimentacao_service import MovimentacaoService
+from src.services.relatorio_service import RelatorioService
+from src.utils.helpers import validar_data
+from src.utils.logger import logger
+
+# Quantidade de registros serializados por bloco nas respostas em streaming
+LINHAS_POR_BLOCO = 500
+
+# Tipo esperado de cada campo do corpo JSON: int, float, str ou um formato de data
+_CAMPOS_ITEM = {
+    'nome': str, 'marca': str, 'quantidade': int, 'saldo_inicial': int, 'unidade': str,
+    'preco': float, 'tipo': str, 'descricao': str, 'data_validade': "%Y-%m-%d",
+}
+_CAMPOS_MOVIMENTACAO = {
+    'item_id': int, 'tipo': str, 'quantidade': int, 'responsavel': str, 'motivo': str,
+    'data': "%Y-%m-%d %H:%M:%S",
+}
+_OBRIGATORIOS_ITEM = ('nome',)
+_OBRIGATORIOS_MOVIMENTACAO = ('item_id', 'tipo', 'quantidade', 'responsavel')
+
+_DESCRICAO_TIPO = {int: "deve ser um número inteiro", float: "deve ser um número", str: "deve ser texto"}
+_FORMATO_EXIBIDO = {"%Y-%m-%d": "AAAA-MM-DD", "%Y-%m-%d %H:%M:%S": "AAAA-MM-DD HH:MM:SS"}
+
+class ErroRequisicao(Exception):
+    """Erro do cliente, devolvido como JSON com o status informado
+
+    'campos' leva as mensagens por campo quando o corpo tem valores inválidos.
+    """
+
+    def __init__(self, mensagem: str, status: HTTPStatus = HTTPStatus.BAD_REQUEST,
+                 campos: Optional[Dict[str, object]] = None):
+        super().__init__(mensagem)
+        self.status = status
+        self.campos = campos
+
+class Streaming:
+    """Marca um iterável de registros para ser enviado como array JSON em blocos"""
+
+    def __init__(self, registros: Iterable):
+        self.registros = registros
+
+def _serializar(obj):
+    if is_dataclass(obj):
+        return asdict(obj)
+    raise TypeError(f"Objeto não serializável: {type(obj).__name__}")
+
+def _registro(obj):
+    # Views são tuplas nomeadas; o json as serializaria como listas
+    return obj._asdict() if hasattr(obj, '_asdict') else obj
+
+def _json(dados) -> bytes:
+    return json.dumps(dados, default=_serializar, ensure_ascii=False).encode('utf-8')
+
+def _array_em_blocos(registros: Iterable) -> Iterator[bytes]:
+    """Gera um array JSON em pedaços de LINHAS_POR_BLOCO registros
+
+    Um erro de leitura no meio do caminho é propagado antes do ']', para que
+    a resposta seja abortada em vez de parecer completa.
+    """
+    iterador = iter(registros)
+    yield b'['
+    primeiro = True
+    while True:
+        bloco = list(islice(iterador, LINHAS_POR_BLOCO))
+        if not bloco:
+            break
+        corpo = b','.join(_json(_registro(registro)) for registro in bloco)
+        yield corpo if primeiro else b',' + corpo
+        primeiro = False
+    yield b']'
+
+def _resultado(sucesso: bool, mensagem: str, status_ok: HTTPStatus = HTTPStatus.OK, **extras):
+    """Converte o (sucesso, mensagem) dos serviços em status HTTP e corpo"""
+    if sucesso:
+        status = status_ok
+    elif "não encontrado" in mensagem:
+        status = HTTPStatus.NOT_FOUND
+    else:
+        status = HTTPStatus.UNPROCESSABLE_ENTITY
+    return status, {'sucesso': sucesso, 'mensagem': mensagem, **extras}
+
+class Requisicao:
+    """Dados já interpretados de uma requisição"""
+    __slots__ = ('parametros', 'consulta', '_corpo')
+
+    def __init__(self, parametros: Tuple[str, ...], consulta: Dict[str, List[str]], corpo: bytes):
+        self.parametros = parametros
+        self.consulta = consulta
+        self._corpo = corpo
+
+    def texto(self, nome: str, padrao: Optional[str] = None) -> Optional[str]:
+        valores = self.consulta.get(nome)
+        return valores[0] if valores else padrao
+
+    def inteiro(self, nome: str, padrao: Optional[int] = None) -> Optional[int]:
+        valor = self.texto(nome)
+        if valor is None:
+            return padrao
+        try:
+            return int(valor)
+        except ValueError:
+            raise ErroRequisicao(f"Parâmetro '{nome}' deve ser inteiro")
+
+    def data(self, nome: str) -> Optional[str]:
+        """Parâmetro de data em DD/MM/AAAA, conferido antes de chegar aos serviços"""
+        valor = self.texto(nome)
+        if valor is not None and not validar_data(valor):
+            raise ErroRequisicao(f"Parâmetro '{nome}' deve ser uma data DD/MM/AAAA")
+        return valor
+
+    def json(self):
+        try:
+            return json.loads(self._corpo or b'null')
+        except json.JSONDecodeError as e:
+            raise ErroRequisicao(f"JSON inválido: {e}")
+
+# Tabela de rotas: (método, expressão do caminho, função)
+ROTAS: List[Tuple[str, re.Pattern, Callable]] = []
+
+def rota(metodo: str, padrao: str):
+    def registrar(funcao):
+        ROTAS.append((metodo, re.compile(f"^{padrao}$"), funcao))
+        return funcao
+    return registrar
+
+_item_service = ItemService()
+
+def _converter(valor, tipo):
+    """Confere o valor JSON contra o tipo do campo; devolve (valor convertido, erro)"""
+    if valor is None:
+        return None, None
+    if isinstance(tipo, str):  # Data no formato informado
+        if isinstance(valor, str):
+            try:
+                datetime.strptime(valor, tipo)
+                return valor, None
+            except ValueError:
+                pass
+        return None, f"deve ser uma data {_FORMATO_EXIBIDO[tipo]}"
+    # bool é subclasse de int, mas true/false não são quantidades
+    if isinstance(valor, bool):
+        return None, _DESCRICAO_TIPO[tipo]
+    if tipo is float and isinstance(valor, (int, float)):
+        return float(valor), None
+    if isinstance(valor, tipo):
+        return valor, None
+    return None, _DESCRICAO_TIPO[tipo]
+
+def _campos_do_corpo(dados, tipos: Dict[str, object], obrigatorios: Tuple[str, ...], objeto: str) -> dict:
+    """Valida nomes, presença e tipos dos campos, juntando as mensagens por campo"""
+    if not isinstance(dados, dict):
+        raise ErroRequisicao(f"{objeto} deve ser um objeto JSON")
+    desconhecidos = set(dados) - set(tipos)
+    if desconhecidos:
+        raise ErroRequisicao(f"Campos desconhecidos: {', '.join(sorted(desconhecidos))}")
+
+    valores, erros = {}, {}
+    for campo in obrigatorios:
+        if dados.get(campo) is None:
+            erros[campo] = "é obrigatório"
+    for campo, valor in dados.items():
+        if campo in erros:
+            continue
+        valores[campo], erro = _converter(valor, tipos[campo])
+        if erro:
+            erros[campo] = erro
+        elif valores[campo] is None:
+            del valores[campo]  # null mantém o valor padrão do modelo
+    if erros:
+        raise ErroRequisicao("Campos inválidos", HTTPStatus.UNPROCESSABLE_ENTITY, erros)
+    return valores
+
+def _item_do_corpo(dados, item_id: Optional[int] = None) -> Item:
+    return Item(id=item_id, **_campos_do_corpo(dados, _CAMPOS_ITEM, _OBRIGATORIOS_ITEM, "Corpo"))
+
+def _movimentacao_do_corpo(dados) -> Movimentacao:
+    return Movimentacao(**_campos_do_corpo(
+        dados, _CAMPOS_MOVIMENTACAO, _OBRIGATORIOS_MOVIMENTACAO, "Cada movimentação"))
+
+@rota('GET', r'/saude')
+def saude(req: Requisicao):
+    return HTTPStatus.OK, {'status': 'ok', 'cache_itens': _item_service.repository.estatisticas_cache()}
+
+@rota('GET', r'/itens')
+def listar_itens(req: Requisicao):
+    """Página de itens por nome (?limite=&apos_nome=&apos_id=) ou todos em streaming (?todos=1)"""
+    if req.texto('todos') == '1':
+        return HTTPStatus.OK, Streaming(_item_service.iter_todos(visao=True))
+
+    limite = req.inteiro('limite', 20)
+    apos = None
+    if req.texto('apos_nome') is not None:
+        apos = (req.texto('apos_nome'), req.inteiro('apos_id', 0))
+    itens = _item_service.listar_pagina(limite + 1, apos=apos)
+    proximo = None
+    if len(itens) > limite:
+        itens = itens[:limite]
+        proximo = {'apos_nome': itens[-1].nome, 'apos_id': itens[-1].id}
+    return HTTPStatus.OK, {'itens': itens, 'proximo': proximo}
+
+@rota('GET', r'/itens/busca')
+def buscar_itens(req: Requisicao):
+    return HTTPStatus.OK, _item_service.buscar_por_nome(req.texto('nome', ''))
+
+@rota('GET', r'/itens/(\d+)')
+def obter_item(req: Requisicao):
+    item = _item_service.buscar_por_id(int(req.parametros[0]))
+    if item is None:
+        raise ErroRequisicao("Item não encontrado", HTTPStatus.NOT_FOUND)
+    return HTTPStatus.OK, item
+
+@rota('POST', r'/itens')
+def cadastrar_item(req: Requisicao):
+    item = _item_do_corpo(req.json())
+    sucesso, mensagem = _item_service.cadastrar(item)
+    return _resultado(sucesso, mensagem, HTTPStatus.CREATED, id=item.id)
+
+@rota('PUT', r'/itens/(\d+)')
+def atualizar_item(req: Requisicao):
+    item = _item_do_corpo(req.json(), int(req.parametros[0]))
+    return _resultado(*_item_service.atualizar(item))
+
+@rota('DELETE', r'/itens/(\d+)')
+def remover_item(req: Requisicao):
+    return _resultado(*_item_service.remover(int(req.parametros[0])))
+
+@rota('GET', r'/itens/(\d+)/historico')
+def historico_item(req: Requisicao):
+    """Histórico e saldos do item no período (?inicio=DD/MM/AAAA&fim=DD/MM/AAAA)"""
+    movimentacoes, saldo_inicial, saldo_final = MovimentacaoService.historico_por_item(
+        int(req.parametros[0]), req.data('inicio'), req.data('fim'))
+    return HTTPStatus.OK, {
+        'saldo_inicial': saldo_inicial,
+        'saldo_final': saldo_final,
+        'movimentacoes': movimentacoes
+    }
+
+@rota('GET', r'/movimentacoes')
+def listar_movimentacoes(req: Requisicao):
+    """Todas as movimentações do período, mais recentes primeiro, em streaming"""
+    return HTTPStatus.OK, Streaming(
+        MovimentacaoService.iter_todas(req.data('inicio'), req.data('fim'), visao=True))
+
+@rota('POST', r'/movimentacoes')
+def registrar_movimentacao(req: Requisicao):
+    dados = _movimentacao_do_corpo(req.json())
+    sucesso, mensagem = MovimentacaoService.registrar_movimentacao(
+        dados.item_id, dados.tipo, dados.quantidade, dados.responsavel, dados.motivo, dados.data)
+    return _resultado(sucesso, mensagem, HTTPStatus.CREATED)
+
+@rota('POST', r'/movimentacoes/lote')
+def registrar_lote(req: Requisicao):
+    """Registra uma lista de movimentações numa única transação (tudo ou nada)"""
+    dados = req.json()
+    if not isinstance(dados, list) or not dados:
+        raise ErroRequisicao("Corpo deve ser uma lista não vazia de movimentações")
+    movimentacoes, erros = [], {}
+    for indice, linha in enumerate(dados):
+        try:
+            movimentacoes.append(_movimentacao_do_corpo(linha))
+        except ErroRequisicao as e:
+            erros[str(indice)] = e.campos or str(e)
+    if erros:
+        # Mensagens indexadas pela posição da movimentação na lista
+        raise ErroRequisicao("Movimentações inválidas", HTTPStatus.UNPROCESSABLE_ENTITY, erros)
+    resultados = MovimentacaoService.registrar_movimentacoes(movimentacoes)
+    sucesso = all(ok for ok, _ in resultados)
+    return (HTTPStatus.CREATED if sucesso else HTTPStatus.UNPROCESSABLE_ENTITY), {
+        'sucesso': sucesso,
+        'resultados': [
+            {'sucesso': ok, 'mensagem': mensagem, 'id': mov.id if ok else None}
+            for (ok, mensagem), mov in zip(resultados, movimentacoes)
+        ]
+    }
+
+@rota('GET', r'/relatorios/validade')
+def relatorio_validade(req: Requisicao):
+    return HTTPStatus.OK, RelatorioService.itens_prox_validade(req.inteiro('dias', 30))
+
+@rota('GET', r'/relatorios/estoque-baixo')
+def relatorio_estoque_baixo(req: Requisicao):
+    return HTTPStatus.OK, RelatorioService.estoque_baixo(req.inteiro('minimo', 10))
+
+@rota('GET', r'/relatorios/periodo')
+def relatorio_periodo(req: Requisicao):
+    return HTTPStatus.OK, RelatorioService.movimentacoes_por_periodo(req.data('inicio'), req.data('fim'))
+
+class ManipuladorAPI(BaseHTTPRequestHandler):
+    """Despacha as requisições para as rotas registradas (conexões keep-alive)"""
+    protocol_version = "HTTP/1.1"
+    server_version = "Almoxarifado"
+    # Cabeçalhos e corpo saem em escritas separadas; sem TCP_NODELAY cada
+    # resposta keep-alive esperaria o ACK atrasado do cliente (~40 ms)
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self._despachar('GET')
+
+    def do_POST(self):
+        self._despachar('POST')
+
+    def do_PUT(self):
+        self._despachar('PUT')
+
+    def do_DELETE(self):
+        self._despachar('DELETE')
+
+    def _despachar(self, metodo: str):
+        url = urlsplit(self.path)
+
+        try:
+            corpo = self._ler_corpo()
+            funcao, parametros = self._localizar(metodo, url.path.rstrip('/') or '/')
+            status, dados = funcao(Requisicao(parametros, parse_qs(url.query), corpo))
+        except ErroRequisicao as e:
+            status, dados = e.status, {'sucesso': False, 'mensagem': str(e)}
+            if e.campos:
+                dados['campos'] = e.campos
+        except Exception as e:
+            logger.error(f"Erro ao atender {metodo} {self.path}: {e}")
+            status, dados = HTTPStatus.INTERNAL_SERVER_ERROR, {'sucesso': False, 'mensagem': "Erro interno"}
+
+        if isinstance(dados, Streaming):
+            self._enviar_streaming(status, dados.registros)
+        else:
+            self._enviar(status, _json(dados))
+
+    def _ler_corpo(self) -> bytes:
+        try:
+            tamanho = int(self.headers.get('Content-Length') or 0)
+        except ValueError:
+            tamanho = -1
+        if tamanho < 0:
+            # Sem saber onde o corpo termina, a conexão não pode ser reaproveitada
+            self.close_connection = True
+            raise ErroRequisicao("Content-Length inválido")
+        return self.rfile.read(tamanho) if tamanho else b''
+
+    def _localizar(self, metodo: str, caminho: str):
+        caminho_existe = False
+        for metodo_rota, padrao, funcao in ROTAS:
+            encontrado = padrao.match(caminho)
+            if encontrado:
+                caminho_existe = True
+                if metodo_rota == metodo:
+                    return funcao, encontrado.groups()
+        if caminho_existe:
+            raise ErroRequisicao("Método não permitido", HTTPStatus.METHOD_NOT_ALLOWED)
+        raise ErroRequisicao("Recurso não encontrado", HTTPStatus.NOT_FOUND)
+
+    def _enviar(self, status: HTTPStatus, corpo: bytes):
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(corpo)))
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def _enviar_streaming(self, status: HTTPStatus, registros: Iterable):
+        """Envia o array JSON com Transfer-Encoding: chunked, sem montar a resposta em memória"""
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        try:
+            for pedaco in _array_em_blocos(registros):
+                self.wfile.write(b'%x\r\n%s\r\n' % (len(pedaco), pedaco))
+            self.wfile.write(b'0\r\n\r\n')
+        except Exception as e:
+            # Os cabeçalhos já foram enviados: sem o ']' e o bloco final de
+            # tamanho zero, o cliente vê a resposta truncada em vez de um
+            # array válido e incompleto
+            logger.error(f"Erro durante streaming de {self.path}: {e}")
+            self.close_connection = True
+
+    def log_message(self, formato, *args):
+        logger.debug("%s - %s", self.address_string(), formato % args)
+
+class ServidorAPI(ThreadingHTTPServer):
+    daemon_threads = True
+
+def criar_servidor(host: str = "127.0.0.1", porta: int = 8080) -> ServidorAPI:
+    """Cria o servidor já ligado ao endereço (porta 0 escolhe uma livre)"""
+    return ServidorAPI((host, porta), ManipuladorAPI)
+
+def iniciar_servidor(host: str = "127.0.0.1", porta: int = 8080):
+    """Atende requisições até Ctrl+C, mantendo pool de conexões e cache aquecidos"""
+    servidor = criar_servidor(host, porta)
+    logger.info(f"API do almoxarifado em http://{servidor.server_address[0]}:{servidor.server_address[1]}")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.server_close()
+        escritor.parar()
+        db_manager.fechar_conexoes()
@@ -1,6 +1,7 @@
 from src.services.item_service import ItemService
+from src.services.importacao_service import ImportacaoService
 from src.models.item import Item
-from src.utils.helpers import input_int, input_float
+from src.utils.helpers import input_int, input_float, navegar_paginas, executar_importacao
 from datetime import datetime
 from typing import Optional
 
@@ -16,7 +17,8 @@ class MenuItens:
             print("3. Buscar item por nome")
             print("4. Editar item")
             print("5. Excluir item")
-            print("6. Voltar ao menu principal")
+            print("6. Importar itens (CSV/JSONL)")
+            print("7. Voltar ao menu principal")
 
             opcao = input("\nOpção: ").strip()
 
@@ -31,6 +33,8 @@ class MenuItens:
             elif opcao == "5":
                 self.excluir_item()
             elif opcao == "6":
+                self.importar_itens()
+            elif opcao == "7":
                 break
             else:
                 print("Opção inválida! Tente novamente.")
@@ -62,20 +66,28 @@ class MenuItens:
         print(f"\n{mensagem}")
 
     def listar_itens(self, itens: Optional[list] = None):
-        itens = itens or self.service.listar_todos()
-
         print("\n📦 LISTA DE ITENS")
+        if itens is None:
+            # Sem lista pronta, navega pelo cadastro buscando uma página por vez
+            if not navegar_paginas(self.service.listar_pagina, self._exibir_pagina,
+                                   chave=lambda item: (item.nome, item.id)):
+                print("Nenhum item cadastrado.")
+            return
+
         if not itens:
             print("Nenhum item cadastrado.")
             return
 
+        self._exibir_pagina(itens)
+        print(f"Total de itens: {len(itens)}")
+
+    def _exibir_pagina(self, itens: list):
         print("-" * 60)
         for item in itens:
             print(f"ID: {item.id} | Nome: {item.nome}")
             print(f"Tipo: {item.tipo} | Quantidade: {item.quantidade} {item.unidade or ''}")
             print(f"Preço: R$ {item.preco:.2f} | Validade: {self._formatar_data(item.data_validade)}")
             print("-" * 60)
-        print(f"Total de itens: {len(itens)}")
 
     def buscar_item(self):
         print("\n🔍 BUSCAR ITEM")
@@ -132,6 +144,12 @@ class MenuItens:
         else:
             print("Operação cancelada.")
 
+    def importar_itens(self):
+        print("\n📥 IMPORTAR ITENS")
+        executar_importacao(
+            ImportacaoService.importar_itens,
+            "nome, marca, quantidade, unidade, preco, tipo, descricao, data_validade")
+
     # Métodos auxiliares
     def _obter_nome(self, valor_atual: str = "") -> str:
         while True:
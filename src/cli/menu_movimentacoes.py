@@ -1,7 +1,13 @@
 from typing import List, Optional
 from src.services.movimentacao_service import MovimentacaoService
+from src.services.importacao_service import ImportacaoService
+from src.services.exportacao_service import ExportacaoService
 from src.services.item_service import ItemService
-from src.utils.helpers import input_int, validar_data, converter_data_para_exibir
+from src.models.movimentacao import Movimentacao
+from src.utils.helpers import input_int, validar_data, converter_data_para_exibir, navegar_paginas, \
+    executar_importacao, executar_exportacao
+from src.core import config
+from functools import partial
 from datetime import datetime
 
 class MenuMovimentacoes:
@@ -16,7 +22,9 @@ class MenuMovimentacoes:
             print("2. Registrar Saída")
             print("3. Histórico Completo")
             print("4. Histórico por Item")
-            print("5. Voltar")
+            print("5. Registrar Recebimento (várias entradas)")
+            print("6. Importar Movimentações (CSV/JSONL)")
+            print("7. Voltar")
 
             opcao = input("\nOpção: ").strip()
 
@@ -29,6 +37,10 @@ class MenuMovimentacoes:
             elif opcao == "4":
                 self.exibir_historico_item()
             elif opcao == "5":
+                self.registrar_recebimento()
+            elif opcao == "6":
+                self.importar_movimentacoes()
+            elif opcao == "7":
                 break
             else:
                 print("Opção inválida!")
@@ -85,20 +97,75 @@ class MenuMovimentacoes:
         except ValueError as e:
             print(f"\nErro: {e}")
 
+    def registrar_recebimento(self):
+        print("\n🚚 REGISTRAR RECEBIMENTO")
+        self._listar_itens_simplificado()
+
+        responsavel = input("Responsável: ").strip()
+        motivo = input("Motivo (opcional): ").strip() or None
+
+        print("\nInforme uma entrada por linha no formato 'ID QUANTIDADE'.")
+        print("Deixe a linha em branco para finalizar.")
+        entradas = []
+        while True:
+            linha = input(f"{len(entradas) + 1:>3}> ").strip()
+            if not linha:
+                break
+            try:
+                item_id, quantidade = (int(valor) for valor in linha.split())
+            except ValueError:
+                print("Linha inválida! Use 'ID QUANTIDADE', ex: 12 30")
+                continue
+            entradas.append(Movimentacao(
+                item_id=item_id,
+                tipo='entrada',
+                quantidade=quantidade,
+                responsavel=responsavel,
+                motivo=motivo
+            ))
+
+        if not entradas:
+            print("Nenhuma entrada informada.")
+            return
+
+        resultados = self.mov_service.registrar_movimentacoes(entradas)
+
+        print("\n📋 RESULTADO DO RECEBIMENTO")
+        print("-" * 60)
+        for mov, (sucesso, mensagem) in zip(entradas, resultados):
+            status = "✅" if sucesso else "❌"
+            print(f"{status} Item #{mov.item_id:<5} | +{mov.quantidade:<6} | {mensagem}")
+        print("-" * 60)
+        if all(sucesso for sucesso, _ in resultados):
+            print(f"{len(entradas)} entradas registradas com sucesso.")
+        else:
+            print("Nenhuma entrada foi registrada. Corrija as linhas com erro e tente novamente.")
+
+    def importar_movimentacoes(self):
+        print("\n📥 IMPORTAR MOVIMENTAÇÕES")
+        executar_importacao(
+            ImportacaoService.importar_movimentacoes,
+            "item_id, tipo (entrada/saída), quantidade, data, responsavel, motivo")
+
     def exibir_historico_completo(self):
         print("\n🕰️ HISTÓRICO COMPLETO DE MOVIMENTAÇÕES")
 
         # Solicita período se desejar filtrar
         data_inicio, data_fim = self._solicitar_periodo()
 
-        movimentacoes = self.mov_service.listar_todas(data_inicio, data_fim)
+        print(f"\n📊 MOVIMENTAÇÕES {self._formatar_periodo_msg(data_inicio, data_fim)}")
+        paginas = navegar_paginas(
+            lambda **pagina: self.mov_service.listar_pagina(
+                data_inicio=data_inicio, data_fim=data_fim, **pagina),
+            self._exibir_pagina_movimentacoes,
+            chave=lambda mov: (mov.data, mov.id)
+        )
 
-        if not movimentacoes:
+        if not paginas:
             periodo_msg = self._formatar_periodo_msg(data_inicio, data_fim)
             print(f"Nenhuma movimentação encontrada {periodo_msg}")
-            return
 
-        print(f"\n📊 MOVIMENTAÇÕES {self._formatar_periodo_msg(data_inicio, data_fim)}")
+    def _exibir_pagina_movimentacoes(self, movimentacoes: list):
         print("-" * 80)
         for mov in movimentacoes:
             print(f"📅 {converter_data_para_exibir(mov.data)} | #{mov.item_id} | {mov.tipo.upper():<6} | Qtd: {mov.quantidade:>4}")
@@ -111,14 +178,11 @@ class MenuMovimentacoes:
 
         item_id = input_int("\nID do item: ")
         item = self.item_service.buscar_por_id(item_id)
-
         if not item:
             print("Item não encontrado!")
             return
 
         data_inicio, data_fim = self._solicitar_periodo()
-
-        # Agora recebe 3 valores de retorno
         movimentacoes, saldo_inicial, saldo_final = self.mov_service.historico_por_item(
             item_id=item_id,
             data_inicio=data_inicio,
@@ -175,6 +239,10 @@ class MenuMovimentacoes:
             else:
                 saldo_inicial -= mov.quantidade
 
+        executar_exportacao(
+            partial(ExportacaoService.exportar_historico_item, item_id, data_inicio, data_fim),
+            f"historico_item_{item_id}", config.EXPORTACAO_DIR)
+
     def _solicitar_periodo(self) -> tuple:
         """Solicita período ao usuário e retorna datas formatadas"""
         print("\nFiltrar por período? (Deixe em branco para listar tudo)")
@@ -209,15 +277,14 @@ class MenuMovimentacoes:
         return f"({msg})"
 
     def _listar_itens_simplificado(self):
-        """Lista resumida de itens para seleção"""
-        itens = self.item_service.listar_todos()
-
-        if not itens:
+        """Lista resumida de itens para seleção, uma página por vez"""
+        print("\n📝 ITENS DISPONÍVEIS:")
+        if not navegar_paginas(self.item_service.listar_pagina, self._exibir_pagina_itens,
+                               chave=lambda item: (item.nome, item.id)):
             print("Nenhum item cadastrado.")
-            return
 
-        print("\n📝 ITENS DISPONÍVEIS:")
+    def _exibir_pagina_itens(self, itens: list):
         print("-" * 60)
         for item in itens:
             print(f"ID: {item.id:<3} | {item.nome:<20} | Estoque: {item.quantidade:>4} {item.unidade or ''}")
-        print("-" * 60)
\ No newline at end of file
+        print("-" * 60)
@@ -1,15 +1,19 @@
-from src.services import ItemService, MovimentacaoService
+from src.services import ItemService, MovimentacaoService, RelatorioService, ExportacaoService
 from src.cli.menu_itens import MenuItens
 from src.cli.menu_movimentacoes import MenuMovimentacoes
-from src.utils.helpers import limpar_tela, input_int, validar_data, converter_data_para_banco, \
-    converter_data_para_exibir
+from src.utils.helpers import (limpar_tela, input_int, validar_data, converter_data_para_exibir,
+                               executar_exportacao)
+from src.core import config
 from src.core.auth import Autenticador
+from src.core.instrumentacao import coletor
 from datetime import datetime
+from functools import partial
 
 class MenuPrincipal:
     def __init__(self):
         self.item_service = ItemService()
         self.mov_service = MovimentacaoService()
+        self.relatorio_service = RelatorioService()
         self.menu_itens = MenuItens(self.item_service)
         self.menu_mov = MenuMovimentacoes(self.mov_service, self.item_service)
 
@@ -37,6 +41,8 @@ class MenuPrincipal:
             elif opcao == "4":
                 print("\nSaindo do sistema...")
                 break
+            elif opcao == "99":  # Opção oculta de diagnóstico
+                self.exibir_estatisticas_sql()
             else:
                 print("\nOpção inválida! Tente novamente.")
                 input("Pressione Enter para continuar...")
@@ -49,7 +55,9 @@ class MenuPrincipal:
             print("1. Itens próximos da validade")
             print("2. Itens com estoque baixo")
             print("3. Movimentações por período")
-            print("4. Voltar")
+            print("4. Previsão de consumo e reposição")
+            print("5. Curva ABC (valor em estoque ou consumo)")
+            print("6. Voltar")
 
             opcao = input("\nOpção: ").strip()
 
@@ -60,6 +68,10 @@ class MenuPrincipal:
             elif opcao == "3":
                 self.relatorio_movimentacoes_periodo()
             elif opcao == "4":
+                self.relatorio_previsao_consumo()
+            elif opcao == "5":
+                self.relatorio_curva_abc()
+            elif opcao == "6":
                 break
             else:
                 print("Opção inválida!")
@@ -68,7 +80,7 @@ class MenuPrincipal:
     def relatorio_prox_validade(self):
         """Relatório de itens próximos da validade"""
         dias = input_int("\nInforme os dias para expiração (padrão 30): ", 30)
-        itens = self.item_service.itens_prox_validade(dias)
+        itens = self.relatorio_service.itens_prox_validade(dias)
 
         print(f"\n⏳ ITENS QUE EXPIREM EM {dias} DIAS:")
         if not itens:
@@ -77,13 +89,15 @@ class MenuPrincipal:
             for item in itens:
                 dias_restantes = (datetime.strptime(item.data_validade, "%Y-%m-%d") - datetime.now()).days
                 print(f"- {item.nome} (Vence em {dias_restantes} dias | Estoque: {item.quantidade})")
+            executar_exportacao(partial(ExportacaoService.exportar_prox_validade, dias),
+                                "validade", config.EXPORTACAO_DIR)
 
         input("\nPressione Enter para voltar...")
 
     def relatorio_estoque_baixo(self):
         """Relatório de itens com estoque abaixo do mínimo"""
         minimo = input_int("\nInforme o estoque mínimo (padrão 5): ", 5)
-        itens = [item for item in self.item_service.listar_todos() if item.quantidade < minimo]
+        itens = self.relatorio_service.estoque_baixo(minimo)
 
         print(f"\n⚠️ ITENS COM ESTOQUE ABAIXO DE {minimo}:")
         if not itens:
@@ -91,6 +105,8 @@ class MenuPrincipal:
         else:
             for item in itens:
                 print(f"- {item.nome} (Estoque: {item.quantidade})")
+            executar_exportacao(partial(ExportacaoService.exportar_estoque_baixo, minimo),
+                                "estoque_baixo", config.EXPORTACAO_DIR)
 
         input("\nPressione Enter para voltar...")
 
@@ -106,60 +122,166 @@ class MenuPrincipal:
             if not validar_data(data_inicio) or not validar_data(data_fim):
                 print("Datas inválidas! Use o formato DD/MM/AAAA")
                 continue
-
-            # Conversão para formato do banco
-            data_inicio_db = converter_data_para_banco(data_inicio)
-            data_fim_db = converter_data_para_banco(data_fim)
             break
 
-        # Obtém as movimentações
-        movimentacoes = self.mov_service.listar_todas(data_inicio_db, data_fim_db)
+        # Totais por item calculados no banco em uma única consulta
+        resumo = self.relatorio_service.movimentacoes_por_periodo(data_inicio, data_fim)
 
         print(f"\n📊 MOVIMENTAÇÕES DE {data_inicio} A {data_fim}")
         print("=" * 80)
 
-        if not movimentacoes:
+        if not resumo:
             print("Nenhuma movimentação encontrada no período")
             input("\nPressione Enter para voltar...")
             return
 
-        # Agrupa por item para relatório mais organizado
-        itens = {}
-        for mov in movimentacoes:
-            if mov.item_id not in itens:
-                item = self.item_service.buscar_por_id(mov.item_id)
-                itens[mov.item_id] = {
-                    'nome': item.nome if item else "Item não encontrado",
-                    'movimentacoes': []
-                }
-            itens[mov.item_id]['movimentacoes'].append(mov)
-
-        # Exibe o relatório
-        for item_id, dados in itens.items():
-            print(f"\n📦 ITEM: {dados['nome']} (ID: {item_id})")
-            print("-" * 60)
+        print(f"{'ID':>5} | {'ITEM':<30} | {'ENTRADAS':>9} | {'SAÍDAS':>9} | {'SALDO':>9}")
+        print("-" * 80)
+        for linha in resumo:
+            print(f"{linha['item_id']:>5} | {linha['nome'][:30]:<30} | "
+                  f"{'+' + str(linha['entradas']):>9} | {'-' + str(linha['saidas']):>9} | {linha['saldo']:>9}")
+        print("=" * 80)
+        print(f"TOTAL ENTRADAS: +{sum(linha['entradas'] for linha in resumo)}")
+        print(f"TOTAL SAÍDAS: -{sum(linha['saidas'] for linha in resumo)}")
+        print(f"SALDO DO PERÍODO: {sum(linha['saldo'] for linha in resumo)}")
 
-            total_entradas = 0
-            total_saidas = 0
+        if input("\nExibir movimentações detalhadas? (s/n): ").strip().lower() == 's':
+            self._exibir_movimentacoes_detalhadas(data_inicio, data_fim)
 
-            for mov in dados['movimentacoes']:
-                sinal = "+" if mov.tipo == 'entrada' else "-"
-                print(f"{converter_data_para_exibir(mov.data)} | {mov.tipo.upper()} ({sinal}{mov.quantidade})")
-                print(f"Responsável: {mov.responsavel} | Motivo: {mov.motivo or 'N/A'}")
-                print("-" * 60)
+        executar_exportacao(
+            partial(ExportacaoService.exportar_movimentacoes_periodo, data_inicio, data_fim),
+            "movimentacoes_resumo", config.EXPORTACAO_DIR, "Exportar resumo por item?")
+        executar_exportacao(
+            partial(ExportacaoService.exportar_movimentacoes_periodo, data_inicio, data_fim, detalhado=True),
+            "movimentacoes", config.EXPORTACAO_DIR, "Exportar todas as movimentações do período?")
+
+        input("\nPressione Enter para voltar...")
+
+    def relatorio_previsao_consumo(self):
+        """Itens com ruptura prevista ou no ponto de reposição, pelo consumo recente"""
+        print("\n📈 PREVISÃO DE CONSUMO E REPOSIÇÃO")
+        janela = input_int(f"Dias de histórico (sugerido {config.PREVISAO_JANELA_DIAS}): ", 1)
+        prazo = input_int(f"Prazo de reposição do fornecedor em dias "
+                          f"(sugerido {config.PREVISAO_PRAZO_REPOSICAO_DIAS:g}): ", 1)
+
+        sucesso, mensagem, linhas = self.relatorio_service.previsao_consumo(
+            janela=janela, janela_recente=min(config.PREVISAO_JANELA_RECENTE_DIAS, janela),
+            prazo_reposicao=prazo)
+        print(f"\n{mensagem}")
+        if not sucesso or not linhas:
+            input("\nPressione Enter para voltar...")
+            return
+
+        repor = [linha for linha in linhas if linha['repor']]
+        limite = input_int(f"Quantos dos {len(repor)} itens a repor exibir? ", 0)
+        print("=" * 100)
+        print(f"{'ID':>5} | {'ITEM':<30} | {'ESTOQUE':>8} | {'CONSUMO/DIA':>11} | "
+              f"{'COBERTURA':>9} | {'RUPTURA':>10} | {'PONTO REP.':>10}")
+        print("-" * 100)
+        for linha in repor[:limite]:
+            ruptura = datetime.strptime(linha['data_ruptura'], "%Y-%m-%d").strftime("%d/%m/%Y") \
+                if linha['data_ruptura'] else "-"
+            print(f"{linha['item_id']:>5} | {linha['nome'][:30]:<30} | {linha['estoque']:>8} | "
+                  f"{max(linha['consumo_medio'], linha['consumo_recente']):>11.2f} | "
+                  f"{linha['dias_cobertura']:>8.1f}d | {ruptura:>10} | {linha['ponto_reposicao']:>10}")
+        print("=" * 100)
+
+        executar_exportacao(partial(ExportacaoService.exportar_previsao_consumo, linhas),
+                            "previsao_consumo", config.EXPORTACAO_DIR,
+                            "Exportar a previsão de todos os itens com consumo?")
+
+        input("\nPressione Enter para voltar...")
+
+    def relatorio_curva_abc(self):
+        """Classificação ABC pelo valor em estoque ou pelo valor consumido no período"""
+        print("\n🔠 CURVA ABC")
+        print("1. Por valor em estoque")
+        print("2. Por valor consumido (saídas) em um período")
+        criterio = 'consumo' if input("Critério (padrão 1): ").strip() == "2" else 'estoque'
+
+        data_inicio = data_fim = None
+        if criterio == 'consumo':
+            while True:
+                data_inicio = input("Data inicial (DD/MM/AAAA): ").strip()
+                data_fim = input("Data final (DD/MM/AAAA): ").strip()
+                if validar_data(data_inicio) and validar_data(data_fim):
+                    break
+                print("Datas inválidas! Use o formato DD/MM/AAAA")
 
-                if mov.tipo == 'entrada':
-                    total_entradas += mov.quantidade
-                else:
-                    total_saidas += mov.quantidade
+        limite = input_int("Quantos itens de maior valor exibir? ", 0)
+        resumo, itens = self.relatorio_service.curva_abc(criterio, data_inicio, data_fim, limite)
 
-            print(f"TOTAL ENTRADAS: +{total_entradas}")
-            print(f"TOTAL SAÍDAS: -{total_saidas}")
-            print(f"SALDO DO PERÍODO: {total_entradas - total_saidas}")
-            print("=" * 60)
+        titulo = "VALOR EM ESTOQUE" if criterio == 'estoque' else f"VALOR CONSUMIDO DE {data_inicio} A {data_fim}"
+        print(f"\n📊 CURVA ABC - {titulo}")
+        print("=" * 80)
+        if not resumo:
+            print("Nenhum item com valor no critério escolhido")
+            input("\nPressione Enter para voltar...")
+            return
+
+        total = sum(linha['valor'] for linha in resumo)
+        print(f"{'CLASSE':<8} | {'ITENS':>8} | {'VALOR (R$)':>16} | {'% VALOR':>8}")
+        print("-" * 80)
+        for classe in "ABC":
+            linhas = [linha for linha in resumo if linha['classe'] == classe]
+            valor = sum(linha['valor'] for linha in linhas)
+            print(f"{classe:<8} | {sum(linha['itens'] for linha in linhas):>8} | {valor:>16,.2f} | "
+                  f"{100 * valor / total:>7.1f}%")
+
+        print(f"\n{'TIPO':<20} | {'A':>6} | {'B':>6} | {'C':>6} | {'VALOR (R$)':>16} | {'% VALOR':>8}")
+        print("-" * 80)
+        for tipo in sorted({linha['tipo'] for linha in resumo}):
+            linhas = {linha['classe']: linha for linha in resumo if linha['tipo'] == tipo}
+            valor = sum(linha['valor'] for linha in linhas.values())
+            contagens = " | ".join(f"{linhas[c]['itens'] if c in linhas else 0:>6}" for c in "ABC")
+            print(f"{tipo[:20]:<20} | {contagens} | {valor:>16,.2f} | {100 * valor / total:>7.1f}%")
+
+        if itens:
+            print(f"\n{'#':>5} | {'ITEM':<30} | {'TIPO':<12} | {'VALOR (R$)':>14} | {'% ACUM.':>7} | CLASSE")
+            print("-" * 80)
+            for item in itens:
+                print(f"{item['posicao']:>5} | {item['nome'][:30]:<30} | {item['tipo'][:12]:<12} | "
+                      f"{item['valor']:>14,.2f} | {item['percentual_acumulado']:>6.1f}% | {item['classe']}")
+        print("=" * 80)
+
+        executar_exportacao(partial(ExportacaoService.exportar_curva_abc, criterio, data_inicio, data_fim),
+                            f"curva_abc_{criterio}", config.EXPORTACAO_DIR,
+                            "Exportar a curva ABC de todos os itens?")
 
         input("\nPressione Enter para voltar...")
 
+    def _exibir_movimentacoes_detalhadas(self, data_inicio: str, data_fim: str):
+        """Lista as movimentações do período agrupadas por item"""
+        item_atual = None
+        for mov in self.relatorio_service.movimentacoes_detalhadas(data_inicio, data_fim):
+            if mov['item_id'] != item_atual:
+                item_atual = mov['item_id']
+                print(f"\n📦 ITEM: {mov['nome']} (ID: {item_atual})")
+                print("-" * 60)
+
+            sinal = "+" if mov['tipo'] == 'entrada' else "-"
+            print(f"{converter_data_para_exibir(mov['data'])} | {mov['tipo'].upper()} ({sinal}{mov['quantidade']})")
+            print(f"Responsável: {mov['responsavel']} | Motivo: {mov['motivo'] or 'N/A'}")
+            print("-" * 60)
+
+    def exibir_estatisticas_sql(self):
+        """Estatísticas da instrumentação SQL (ALMOX_SQL_INSTRUMENTACAO=1)"""
+        limpar_tela()
+        print("\n=== ESTATÍSTICAS SQL ===")
+        if not config.SQL_INSTRUMENTACAO:
+            print("Instrumentação desligada. Inicie com ALMOX_SQL_INSTRUMENTACAO=1 para coletar.")
+            input("\nPressione Enter para voltar...")
+            return
+
+        print(coletor.formatar())
+        opcao = input("\n[G]ravar em JSON, [Z]erar ou Enter para voltar: ").strip().lower()
+        if opcao == "g":
+            destino = coletor.despejar()
+            print(f"✅ Gravado em {destino}" if destino else "Nenhuma instrução registrada.")
+            input("Pressione Enter para continuar...")
+        elif opcao == "z":
+            coletor.zerar()
+
     @classmethod
     def iniciar_sistema(cls):
         """Método principal para iniciar o sistema"""
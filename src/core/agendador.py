@@ -0,0 +1,200 @@
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+
+from src.core import config
+from src.core.database import db_manager
+
+# Recebe a marca d'água da última execução bem-sucedida (ou None) e retorna
+# (mensagem, nova marca); a marca só é gravada se a tarefa não lançar exceção
+FuncaoTarefa = Callable[[Optional[str]], Tuple[str, Optional[str]]]
+
+_CONCESSAO = "agendador"
+
+@dataclass
+class Tarefa:
+    nome: str
+    intervalo: timedelta
+    funcao: FuncaoTarefa
+    descricao: str = ""
+
+class Agendador:
+    """Registro de tarefas periódicas executadas por uma única instância
+
+    A exclusividade vem de uma concessão gravada no próprio banco: quem a
+    obtém executa as tarefas vencidas e a renova enquanto estiver ativo; se o
+    processo morrer, ela expira em 'duracao_concessao' segundos e outra
+    instância assume. A última execução e a marca d'água de cada tarefa
+    também ficam no banco, então processos diferentes (daemon, menu, API)
+    não repetem o que já foi feito.
+    """
+
+    def __init__(self, duracao_concessao: float = config.AGENDADOR_CONCESSAO_S):
+        self.duracao_concessao = duracao_concessao
+        self.dono = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._tarefas: Dict[str, Tarefa] = {}
+        self._parar = threading.Event()
+
+    def registrar(self, nome: str, intervalo: timedelta, funcao: FuncaoTarefa, descricao: str = ""):
+        self._tarefas[nome] = Tarefa(nome, intervalo, funcao, descricao)
+
+    @property
+    def tarefas(self) -> List[Tarefa]:
+        return list(self._tarefas.values())
+
+    # Concessão
+
+    def obter_concessao(self) -> bool:
+        """Obtém ou renova a concessão; falha se outra instância tiver uma válida"""
+        agora = time.time()
+        with db_manager.transacao() as conn:
+            conn.execute(
+                """INSERT INTO concessoes (nome, dono, expira_em) VALUES (?, ?, ?)
+                ON CONFLICT(nome) DO UPDATE SET dono = excluded.dono, expira_em = excluded.expira_em
+                WHERE concessoes.dono = excluded.dono OR concessoes.expira_em < ?""",
+                (_CONCESSAO, self.dono, agora + self.duracao_concessao, agora))
+            dono = conn.execute("SELECT dono FROM concessoes WHERE nome = ?", (_CONCESSAO,)).fetchone()[0]
+        return dono == self.dono
+
+    @contextmanager
+    def renovando_concessao(self):
+        """Renova a concessão a cada terço da duração enquanto o bloco executa
+
+        Assim uma tarefa mais longa que 'duracao_concessao' (um backup grande,
+        por exemplo) não deixa a concessão expirar e outra instância assumir
+        no meio dela.
+        """
+        fim = threading.Event()
+
+        def renovar():
+            while not fim.wait(self.duracao_concessao / 3):
+                try:
+                    if not self.obter_concessao():
+                        logging.warning("Concessão do agendador perdida durante a execução de uma tarefa")
+                except Exception as e:
+                    logging.error(f"Erro ao renovar a concessão do agendador: {e}")
+
+        renovacao = threading.Thread(target=renovar, name="agendador-concessao", daemon=True)
+        renovacao.start()
+        try:
+            yield
+        finally:
+            fim.set()
+            renovacao.join()
+
+    def liberar_concessao(self):
+        with db_manager.transacao() as conn:
+            conn.execute("DELETE FROM concessoes WHERE nome = ? AND dono = ?", (_CONCESSAO, self.dono))
+
+    # Estado das tarefas
+
+    @staticmethod
+    def estado() -> Dict[str, dict]:
+        """Última execução, marca e resultado de cada tarefa já executada"""
+        with db_manager.conexao() as conn:
+            linhas = conn.execute(
+                "SELECT nome, ultima_execucao, marca, sucesso, mensagem, duracao_ms FROM tarefas_agendadas"
+            ).fetchall()
+        return {nome: {'ultima_execucao': ultima, 'marca': marca, 'sucesso': bool(sucesso),
+                       'mensagem': mensagem, 'duracao_ms': duracao}
+                for nome, ultima, marca, sucesso, mensagem, duracao in linhas}
+
+    @staticmethod
+    def _gravar_estado(nome: str, momento: datetime, marca: Optional[str], sucesso: bool,
+                       mensagem: str, duracao_ms: float):
+        with db_manager.transacao() as conn:
+            conn.execute(
+                """INSERT INTO tarefas_agendadas (nome, ultima_execucao, marca, sucesso, mensagem, duracao_ms)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(nome) DO UPDATE SET ultima_execucao = excluded.ultima_execucao,
+                    marca = excluded.marca, sucesso = excluded.sucesso,
+                    mensagem = excluded.mensagem, duracao_ms = excluded.duracao_ms""",
+                (nome, momento.strftime("%Y-%m-%d %H:%M:%S"), marca, int(sucesso), mensagem, duracao_ms))
+
+    # Execução
+
+    def executar_tarefa(self, tarefa: Tarefa, marca: Optional[str] = None) -> bool:
+        """Executa a tarefa e grava o resultado; falhas mantêm a marca anterior"""
+        momento = datetime.now()
+        inicio = time.perf_counter()
+        try:
+            mensagem, nova_marca = tarefa.funcao(marca)
+            sucesso = True
+        except Exception as e:
+            mensagem, nova_marca, sucesso = f"Erro: {e}", marca, False
+            logging.error(f"Tarefa '{tarefa.nome}' falhou: {e}")
+        duracao_ms = (time.perf_counter() - inicio) * 1000
+        self._gravar_estado(tarefa.nome, momento, nova_marca, sucesso, mensagem, duracao_ms)
+        logging.info(f"Tarefa '{tarefa.nome}' ({duracao_ms:.0f} ms): {mensagem}")
+        return sucesso
+
+    def executar_pendentes(self, agora: Optional[datetime] = None) -> List[str]:
+        """Executa, em ordem de registro, as tarefas cujo intervalo já passou
+
+        Supõe a concessão obtida; ela é renovada antes de cada tarefa e,
+        enquanto a tarefa roda, por renovando_concessao. Retorna os nomes
+        das tarefas executadas.
+        """
+        agora = agora or datetime.now()
+        estado = self.estado()
+        executadas = []
+        for tarefa in self.tarefas:
+            anterior = estado.get(tarefa.nome)
+            if anterior and datetime.strptime(anterior['ultima_execucao'], "%Y-%m-%d %H:%M:%S") \
+                    + tarefa.intervalo > agora:
+                continue
+            if self._parar.is_set() or not self.obter_concessao():
+                break
+            with self.renovando_concessao():
+                self.executar_tarefa(tarefa, anterior['marca'] if anterior else None)
+            executadas.append(tarefa.nome)
+        return executadas
+
+    def executar_uma_vez(self) -> Optional[List[str]]:
+        """Executa as tarefas vencidas se nenhuma outra instância estiver ativa
+
+        Usado na partida do menu e da API. Retorna None quando a concessão
+        pertence a outro processo (por exemplo, o daemon).
+        """
+        if not self.obter_concessao():
+            logging.info("Tarefas agendadas a cargo de outra instância")
+            return None
+        try:
+            return self.executar_pendentes()
+        finally:
+            self.liberar_concessao()
+
+    def executar_continuamente(self, tick: float = config.AGENDADOR_TICK_S):
+        """Laço do daemon: a cada 'tick' segundos renova a concessão e executa o que venceu
+
+        Sem a concessão, fica de reserva e tenta de novo no tick seguinte.
+        """
+        reserva = False
+        logging.info(f"Agendador iniciado ({self.dono}), {len(self._tarefas)} tarefas, tick de {tick:g}s")
+        try:
+            while not self._parar.is_set():
+                try:
+                    if self.obter_concessao():
+                        if reserva:
+                            logging.info("Concessão obtida; agendador ativo")
+                            reserva = False
+                        self.executar_pendentes()
+                    elif not reserva:
+                        logging.info("Outra instância detém a concessão; aguardando como reserva")
+                        reserva = True
+                except Exception as e:
+                    logging.error(f"Erro no agendador: {e}")
+                self._parar.wait(tick)
+        finally:
+            self.liberar_concessao()
+            logging.info("Agendador encerrado")
+
+    def parar(self):
+        self._parar.set()
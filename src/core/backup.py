@@ -0,0 +1,172 @@
+import gzip
+import hashlib
+import logging
+import re
+import shutil
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, List, Optional
+
+try:
+    import zstandard
+except ImportError:  # zstd é opcional; gzip vem da biblioteca padrão
+    zstandard = None
+
+COMPRESSOES = ('gzip', 'zstd')
+_EXTENSOES = {'gzip': '.gz', 'zstd': '.zst'}
+# Microssegundos no nome evitam que dois backups no mesmo segundo colidam;
+# nomes antigos, só com segundos, continuam reconhecidos
+_NOME_BACKUP = re.compile(r"^backup_(\d{8}_\d{6})(?:_(\d{6}))?\.db(\.gz|\.zst)?$")
+
+def nome_backup(momento: datetime, compressao: Optional[str] = None) -> str:
+    nome = f"backup_{momento.strftime('%Y%m%d_%H%M%S_%f')}.db"
+    return nome + _EXTENSOES[compressao] if compressao else nome
+
+def conferir_compressao(compressao: Optional[str]):
+    """Falha antes da cópia se a compressão pedida não existe ou não está instalada"""
+    if compressao is None:
+        return
+    if compressao not in COMPRESSOES:
+        raise ValueError(f"Compressão inválida (use {', '.join(COMPRESSOES)})")
+    if compressao == 'zstd' and zstandard is None:
+        raise RuntimeError("Compressão zstd requer o pacote zstandard (pip install zstandard)")
+
+def copiar_online(origem: sqlite3.Connection, destino: Path, paginas: int, pausa: float,
+                  progresso: Optional[Callable[[int, int, int], None]] = None):
+    """Cópia incremental pela API de backup do SQLite
+
+    Copia 'paginas' páginas por passo e dorme 'pausa' segundos entre os
+    passos. A origem mantém uma transação de leitura aberta durante toda a
+    cópia: em WAL os escritores seguem trabalhando e, como todos os passos
+    leem o mesmo snapshot, a cópia não é reiniciada a cada commit alheio.
+    """
+    dst = sqlite3.connect(destino)
+    try:
+        origem.execute("BEGIN")
+        origem.execute("SELECT 1 FROM sqlite_master LIMIT 1").fetchall()
+        try:
+            origem.backup(dst, pages=paginas, progress=progresso, sleep=pausa)
+        finally:
+            origem.rollback()
+        # A cópia herda o modo WAL da origem; um arquivo avulso não precisa de -wal/-shm
+        dst.execute("PRAGMA journal_mode = DELETE")
+    finally:
+        dst.close()
+
+def copiar_vacuum(origem: sqlite3.Connection, destino: Path):
+    """Snapshot compactado (sem páginas livres) com VACUUM INTO, numa única leitura consistente"""
+    origem.execute("VACUUM INTO ?", (str(destino),))
+
+def verificar_integridade(caminho: Path) -> bool:
+    """Roda PRAGMA integrity_check na cópia, aberta somente para leitura"""
+    conn = sqlite3.connect(f"{caminho.resolve().as_uri()}?mode=ro", uri=True)
+    try:
+        return conn.execute("PRAGMA integrity_check").fetchone()[0] == "ok"
+    finally:
+        conn.close()
+
+def _abrir_escrita(caminho: Path, compressao: Optional[str]):
+    if compressao == 'gzip':
+        return gzip.open(caminho, 'wb', compresslevel=6)
+    if compressao == 'zstd':
+        return zstandard.ZstdCompressor(level=3).stream_writer(open(caminho, 'wb'), closefd=True)
+    return open(caminho, 'wb')
+
+def _compressao_de(caminho: Path) -> Optional[str]:
+    for compressao, extensao in _EXTENSOES.items():
+        if caminho.suffix == extensao:
+            return compressao
+    return None
+
+def _abrir_leitura(caminho: Path, compressao: Optional[str]):
+    if compressao == 'gzip':
+        return gzip.open(caminho, 'rb')
+    if compressao == 'zstd':
+        if zstandard is None:
+            raise RuntimeError("Leitura de backup .zst requer o pacote zstandard")
+        return zstandard.ZstdDecompressor().stream_reader(open(caminho, 'rb'), closefd=True)
+    return open(caminho, 'rb')
+
+def sha256(caminho: Path, descomprimir: bool = False, compressao: Optional[str] = None) -> str:
+    """Hash do arquivo (ou do conteúdo descomprimido) lido em blocos
+
+    A compressão é deduzida da extensão, a menos que seja informada.
+    """
+    hasher = hashlib.sha256()
+    if descomprimir:
+        f = _abrir_leitura(caminho, compressao or _compressao_de(caminho))
+    else:
+        f = open(caminho, 'rb')
+    with f:
+        for bloco in iter(lambda: f.read(1024 * 1024), b''):
+            hasher.update(bloco)
+    return hasher.hexdigest()
+
+def comprimir(origem: Path, destino: Path, compressao: str):
+    """Comprime 'origem' em 'destino' e confere, descomprimindo, que o conteúdo é idêntico
+
+    'destino' costuma ser um arquivo '.parcial'; em caso de falha ele é removido.
+    """
+    conferir_compressao(compressao)
+    try:
+        with open(origem, 'rb') as entrada, _abrir_escrita(destino, compressao) as saida:
+            shutil.copyfileobj(entrada, saida, 1024 * 1024)
+        if sha256(destino, descomprimir=True, compressao=compressao) != sha256(origem):
+            raise RuntimeError(f"Conteúdo comprimido difere do backup original ({origem.name})")
+    except BaseException:
+        destino.unlink(missing_ok=True)
+        raise
+
+def gravar_checksum(caminho: Path, nome: Optional[str] = None) -> Path:
+    """Grava '<nome>.sha256' no formato do sha256sum, com o hash de 'caminho'
+
+    'nome' é o nome final do backup quando 'caminho' ainda é o arquivo parcial.
+    """
+    nome = nome or caminho.name
+    arquivo = caminho.with_name(nome + '.sha256')
+    arquivo.write_text(f"{sha256(caminho)}  {nome}\n", encoding='utf-8')
+    return arquivo
+
+def conferir_checksum(caminho: Path) -> bool:
+    """Confere o backup contra o '.sha256' gravado junto dele"""
+    arquivo = caminho.with_name(caminho.name + '.sha256')
+    if not arquivo.exists():
+        return False
+    esperado = arquivo.read_text(encoding='utf-8').split()[0]
+    return sha256(caminho) == esperado
+
+def listar_backups(diretorio: Path) -> List[tuple]:
+    """Backups do diretório como (momento, caminho), do mais recente ao mais antigo"""
+    backups = []
+    for caminho in diretorio.glob("backup_*"):
+        encontrado = _NOME_BACKUP.match(caminho.name)
+        if encontrado:
+            momento = datetime.strptime(encontrado.group(1), "%Y%m%d_%H%M%S")
+            backups.append((momento.replace(microsecond=int(encontrado.group(2) or 0)), caminho))
+    return sorted(backups, reverse=True)
+
+def aplicar_retencao(diretorio: Path, diarios: int, mensais: int) -> List[Path]:
+    """Mantém o backup mais recente de cada um dos últimos 'diarios' dias e 'mensais' meses
+
+    Os demais (e seus '.sha256') são removidos. Retorna os arquivos removidos.
+    """
+    manter, dias, meses = set(), set(), set()
+    for momento, caminho in listar_backups(diretorio):
+        dia, mes = momento.date(), (momento.year, momento.month)
+        if dia not in dias and len(dias) < diarios:
+            dias.add(dia)
+            manter.add(caminho)
+        if mes not in meses and len(meses) < mensais:
+            meses.add(mes)
+            manter.add(caminho)
+
+    removidos = []
+    for _, caminho in listar_backups(diretorio):
+        if caminho in manter:
+            continue
+        caminho.unlink(missing_ok=True)
+        caminho.with_name(caminho.name + '.sha256').unlink(missing_ok=True)
+        removidos.append(caminho)
+        logging.info(f"Backup removido pela retenção: {caminho.name}")
+    return removidos
@@ -0,0 +1,73 @@
+import os
+from pathlib import Path
+
+# Caminhos do banco de dados
+DB_PATH = Path(os.getenv("ALMOX_DB_PATH", "database/almoxarifado.db"))
+BACKUP_DIR = Path(os.getenv("ALMOX_BACKUP_DIR", "database/backups"))
+
+# Pool de conexões
+POOL_TAMANHO = int(os.getenv("ALMOX_POOL_TAMANHO", "5"))
+BUSY_TIMEOUT_MS = int(os.getenv("ALMOX_BUSY_TIMEOUT_MS", "5000"))
+
+# Leitura de relatórios e exportações: 'instantaneo' (conexões somente
+# leitura no próprio banco, cada relatório num snapshot consistente) ou
+# 'replica' (as mesmas conexões, mas numa cópia local do banco atualizada
+# pela API de backup a cada LEITURA_REPLICA_INTERVALO_MIN)
+LEITURA_MODO = os.getenv("ALMOX_LEITURA_MODO", "instantaneo")
+LEITURA_REPLICA_PATH = Path(os.getenv("ALMOX_LEITURA_REPLICA_PATH",
+                                      str(DB_PATH.with_name(f"{DB_PATH.stem}_replica.db"))))
+LEITURA_REPLICA_INTERVALO_MIN = float(os.getenv("ALMOX_LEITURA_REPLICA_INTERVALO_MIN", "15"))
+
+# Cache de itens (identity map) em memória
+CACHE_ITENS_CAPACIDADE = int(os.getenv("ALMOX_CACHE_ITENS_CAPACIDADE", "1024"))
+
+# Escritor dedicado com commit em grupo (desligado por padrão)
+ESCRITOR_DEDICADO = os.getenv("ALMOX_ESCRITOR_DEDICADO", "0") == "1"
+ESCRITOR_LOTE_MAX = int(os.getenv("ALMOX_ESCRITOR_LOTE_MAX", "256"))
+ESCRITOR_LATENCIA_MS = float(os.getenv("ALMOX_ESCRITOR_LATENCIA_MS", "5"))
+
+# Fachada assíncrona: threads de leitura, cada uma com sua conexão
+ASYNC_LEITORES = int(os.getenv("ALMOX_ASYNC_LEITORES", "4"))
+
+# Importação em lote: linhas confirmadas por transação
+IMPORTACAO_LOTE = int(os.getenv("ALMOX_IMPORTACAO_LOTE", "1000"))
+
+# Exportação de relatórios
+EXPORTACAO_DIR = Path(os.getenv("ALMOX_EXPORTACAO_DIR", "exportacoes"))
+
+# Backup: modo 'online' (API de backup em passos) ou 'vacuum' (VACUUM INTO),
+# compressão opcional 'gzip' ou 'zstd' e retenção de diários/mensais
+BACKUP_MODO = os.getenv("ALMOX_BACKUP_MODO", "online")
+BACKUP_COMPRESSAO = os.getenv("ALMOX_BACKUP_COMPRESSAO", "gzip") or None
+BACKUP_PAGINAS = int(os.getenv("ALMOX_BACKUP_PAGINAS", "1024"))
+BACKUP_PAUSA = float(os.getenv("ALMOX_BACKUP_PAUSA", "0.01"))
+BACKUP_INTERVALO_HORAS = float(os.getenv("ALMOX_BACKUP_INTERVALO_HORAS", "24"))
+BACKUP_DIARIOS = int(os.getenv("ALMOX_BACKUP_DIARIOS", "7"))
+BACKUP_MENSAIS = int(os.getenv("ALMOX_BACKUP_MENSAIS", "12"))
+
+# Instrumentação SQL (desligada por padrão): estatísticas por instrução,
+# log de instruções lentas com EXPLAIN QUERY PLAN e despejo em JSON ao sair
+SQL_INSTRUMENTACAO = os.getenv("ALMOX_SQL_INSTRUMENTACAO", "0") == "1"
+SQL_LENTA_MS = float(os.getenv("ALMOX_SQL_LENTA_MS", "100"))
+SQL_ESTATISTICAS_DIR = Path(os.getenv("ALMOX_SQL_ESTATISTICAS_DIR", "logs"))
+
+# Agendador (main.py --daemon): intervalo entre verificações, validade da
+# concessão que garante uma única instância e periodicidade de cada tarefa
+AGENDADOR_TICK_S = float(os.getenv("ALMOX_AGENDADOR_TICK_S", "60"))
+AGENDADOR_CONCESSAO_S = float(os.getenv("ALMOX_AGENDADOR_CONCESSAO_S", "300"))
+VENCIMENTOS_INTERVALO_MIN = float(os.getenv("ALMOX_VENCIMENTOS_INTERVALO_MIN", "60"))
+VENCIMENTOS_VARREDURA_DIAS = float(os.getenv("ALMOX_VENCIMENTOS_VARREDURA_DIAS", "7"))
+CHECKPOINTS_INTERVALO_HORAS = float(os.getenv("ALMOX_CHECKPOINTS_INTERVALO_HORAS", "24"))
+OTIMIZAR_INTERVALO_HORAS = float(os.getenv("ALMOX_OTIMIZAR_INTERVALO_HORAS", "24"))
+
+# Previsão de consumo (requer numpy): janela de histórico de saídas, janela
+# do consumo recente, prazo de reposição do fornecedor e nível de serviço
+# usado no estoque de segurança
+PREVISAO_JANELA_DIAS = int(os.getenv("ALMOX_PREVISAO_JANELA_DIAS", "180"))
+PREVISAO_JANELA_RECENTE_DIAS = int(os.getenv("ALMOX_PREVISAO_JANELA_RECENTE_DIAS", "30"))
+PREVISAO_PRAZO_REPOSICAO_DIAS = float(os.getenv("ALMOX_PREVISAO_PRAZO_REPOSICAO_DIAS", "15"))
+PREVISAO_NIVEL_SERVICO = float(os.getenv("ALMOX_PREVISAO_NIVEL_SERVICO", "0.95"))
+
+# Curva ABC: participação acumulada no valor até onde vão as classes A e B
+ABC_LIMITE_A = float(os.getenv("ALMOX_ABC_LIMITE_A", "0.80"))
+ABC_LIMITE_B = float(os.getenv("ALMOX_ABC_LIMITE_B", "0.95"))
@@ -1,8 +1,16 @@
 import sqlite3
-from pathlib import Path
-from datetime import datetime
+import queue
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta
 import logging
-from typing import Optional
+from pathlib import Path
+from typing import Callable, Iterator, List, Optional
+
+from src.core import backup, config
+from src.core.instrumentacao import ConexaoInstrumentada
+from src.core.migrations import VERSAO_ATUAL, aplicar_migracoes, versao_banco
+from src.utils.helpers import normalizar_texto
 
 class DatabaseManager:
     _instance = None
@@ -10,74 +18,409 @@ class DatabaseManager:
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super().__new__(cls)
-            cls._instance.__init__()
+            cls._instance._inicializado = False
         return cls._instance
 
     def __init__(self):
-        self.db_path = Path("database/almoxarifado.db")
-        self.backup_dir = Path("database/backups")
-        self.backup_dir.mkdir(exist_ok=True, parents=True)
-        self.__inicializar_banco()
+        if self._inicializado:
+            return
+        self._inicializado = True
+        # Nada de E/S aqui: diretório, conexão e esquema ficam para o primeiro uso
+        self.db_path = config.DB_PATH
+        self.backup_dir = config.BACKUP_DIR
+        self._pool = queue.LifoQueue(maxsize=config.POOL_TAMANHO)
+        # Conexões somente leitura dos relatórios, com a geração da réplica em que foram abertas
+        self._pool_leitura = queue.LifoQueue(maxsize=config.POOL_TAMANHO)
+        self.replica_path = config.LEITURA_REPLICA_PATH
+        self._geracao_replica = 0
+        self._lock_replica = threading.Lock()
+        self._conexao_versao = None
+        self._lock_versao = threading.Lock()
+        self._ouvintes_escrita: List[Callable[[int, int], None]] = []
+        self._local = threading.local()
+        self._pronto = False
+        self._lock_preparo = threading.Lock()
+        # Com a instrumentação ligada, todas as conexões medem suas instruções
+        self._fabrica = ConexaoInstrumentada if config.SQL_INSTRUMENTACAO else sqlite3.Connection
 
-    def __inicializar_banco(self):
+    def _preparar(self):
+        """Cria o diretório e o esquema do banco na primeira conexão pedida
+
+        Se PRAGMA user_version já está na versão atual o esquema é dado como
+        pronto e nenhum DDL é executado. A conexão usada fica no pool.
+        """
+        if self._pronto:
+            return
+        with self._lock_preparo:
+            if self._pronto:
+                return
+            self.db_path.parent.mkdir(exist_ok=True, parents=True)
+            conn = self._abrir()
+            try:
+                if versao_banco(conn) < VERSAO_ATUAL:
+                    self.__inicializar_banco(conn)
+            except BaseException:
+                conn.close()
+                raise
+            self._pronto = True
+            self._devolver(conn)
+
+    def __inicializar_banco(self, conn: sqlite3.Connection):
         """Cria estrutura inicial do banco"""
-        with self.criar_conexao() as conn:
-            cursor = conn.cursor()
-
-            # Tabela Itens
-            cursor.execute("""
-            CREATE TABLE IF NOT EXISTS itens (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                nome TEXT NOT NULL,
-                marca TEXT,
-                quantidade INTEGER NOT NULL CHECK(quantidade >= 0),
-                saldo_inicial INTEGER NOT NULL DEFAULT 0,
-                unidade TEXT,
-                preco REAL NOT NULL CHECK(preco >= 0),
-                tipo TEXT NOT NULL,
-                descricao TEXT,
-                data_validade TEXT,
-                criado_em TEXT DEFAULT CURRENT_TIMESTAMP
-            )""")
-
-            # Tabela Movimentações
-            cursor.execute("""
-            CREATE TABLE IF NOT EXISTS movimentacoes (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                item_id INTEGER NOT NULL,
-                tipo TEXT NOT NULL CHECK(tipo IN ('entrada', 'saída')),
-                quantidade INTEGER NOT NULL CHECK(quantidade > 0),
-                data TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
-                responsavel TEXT NOT NULL,
-                motivo TEXT,
-                FOREIGN KEY(item_id) REFERENCES itens(id) ON DELETE CASCADE
-            )""")
-
-            conn.commit()
+        cursor = conn.cursor()
+
+        # Tabela Itens
+        cursor.execute("""
+        CREATE TABLE IF NOT EXISTS itens (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            nome TEXT NOT NULL,
+            marca TEXT,
+            quantidade INTEGER NOT NULL CHECK(quantidade >= 0),
+            saldo_inicial INTEGER NOT NULL DEFAULT 0,
+            unidade TEXT,
+            preco REAL NOT NULL CHECK(preco >= 0),
+            tipo TEXT NOT NULL,
+            descricao TEXT,
+            data_validade TEXT,
+            criado_em TEXT DEFAULT CURRENT_TIMESTAMP
+        )""")
+
+        # Tabela Movimentações
+        cursor.execute("""
+        CREATE TABLE IF NOT EXISTS movimentacoes (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            item_id INTEGER NOT NULL,
+            tipo TEXT NOT NULL CHECK(tipo IN ('entrada', 'saída')),
+            quantidade INTEGER NOT NULL CHECK(quantidade > 0),
+            data TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            responsavel TEXT NOT NULL,
+            motivo TEXT,
+            FOREIGN KEY(item_id) REFERENCES itens(id) ON DELETE CASCADE
+        )""")
+
+        conn.commit()
+
+        # Atualiza bancos existentes para a versão de esquema atual
+        aplicar_migracoes(conn)
 
     def criar_conexao(self) -> sqlite3.Connection:
-        """Cria conexão segura com o banco"""
+        """Cria conexão configurada com o banco (fechamento fica a cargo do chamador)"""
+        self._preparar()
+        return self._abrir()
+
+    def _abrir(self) -> sqlite3.Connection:
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = sqlite3.connect(self.db_path, check_same_thread=False, factory=self._fabrica)
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = NORMAL")
+            conn.execute(f"PRAGMA busy_timeout = {int(config.BUSY_TIMEOUT_MS)}")
             conn.execute("PRAGMA foreign_keys = ON")
+            # Usada só pela migração 4 em bancos antigos; os gatilhos atuais não dependem dela
+            conn.create_function("normalizar", 1, normalizar_texto, deterministic=True)
             return conn
         except sqlite3.Error as e:
             logging.error(f"Erro ao conectar ao banco: {e}")
             raise
 
-    def fazer_backup(self) -> bool:
-        """Realiza backup completo do banco"""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        backup_path = self.backup_dir / f"backup_{timestamp}.db"
+    @contextmanager
+    def conexao(self) -> Iterator[sqlite3.Connection]:
+        """Empresta uma conexão do pool, confirmando ou desfazendo a transação ao final.
+
+        A conexão nunca é compartilhada entre threads enquanto emprestada. Se o
+        pool estiver vazio uma conexão extra é criada; ao devolver, conexões
+        que excedem a capacidade do pool são fechadas.
+        """
+        local = self._local
+        fixada = getattr(local, "conexao", None) is not None and not local.em_uso
+        if fixada:
+            conn = local.conexao
+            local.em_uso = True
+        else:
+            try:
+                conn = self._pool.get_nowait()
+            except queue.Empty:
+                conn = self.criar_conexao()
+
+        # O instantâneo de leitura() mantém sua transação até o fim do bloco
+        instantaneo = fixada and conn is getattr(local, "instantaneo", None)
+        try:
+            yield conn
+            if not instantaneo:
+                conn.commit()
+        except BaseException:
+            if not instantaneo:
+                conn.rollback()
+            raise
+        finally:
+            if fixada:
+                local.em_uso = False
+            else:
+                self._devolver(conn)
+
+    def fixar_conexao(self):
+        """Reserva uma conexão própria para a thread atual
+
+        Usado como inicializador de executores: cada thread de trabalho passa
+        a usar sempre a mesma conexão em conexao(), sem disputar o pool. Usos
+        aninhados na mesma thread continuam recorrendo ao pool.
+        """
+        if getattr(self._local, "conexao", None) is None:
+            self._local.conexao = self.criar_conexao()
+            self._local.em_uso = False
+
+    @contextmanager
+    def transacao(self) -> Iterator[sqlite3.Connection]:
+        """Empresta uma conexão já com uma transação de escrita aberta (BEGIN IMMEDIATE)
+
+        O lock de escrita é obtido no início, então leituras e escritas do
+        bloco formam uma unidade atômica sem risco de atualização perdida.
+        """
+        with self.conexao() as conn:
+            self.iniciar_escrita(conn)
+            yield conn
+
+    @staticmethod
+    def _contador_itens(conn: sqlite3.Connection) -> int:
+        return conn.execute("SELECT valor FROM versao_itens WHERE id = 1").fetchone()[0]
+
+    def iniciar_escrita(self, conn: sqlite3.Connection):
+        """BEGIN IMMEDIATE guardando o contador de escritas em itens do início da transação"""
+        conn.execute("BEGIN IMMEDIATE")
+        escritas = getattr(self._local, "escritas", None)
+        if escritas is None:
+            escritas = self._local.escritas = {}
+        escritas[id(conn)] = self._contador_itens(conn)
+
+    def confirmar(self, conn: sqlite3.Connection, apos_commit: Optional[Callable[[], None]] = None):
+        """Confirma a transação aberta por iniciar_escrita e avisa quais escritas em itens foram dela
+
+        O lock de escrita do BEGIN IMMEDIATE vale até o commit, então todo
+        avanço do contador entre o início e o fim da transação veio desta
+        conexão. 'apos_commit' roda antes do aviso, para que o cache já tenha
+        descartado as entradas alteradas quando aceitar a faixa como local.
+        Transações confirmadas só com commit() não são avisadas e contam
+        como escritas de outra conexão.
+        """
+        inicio = getattr(self._local, "escritas", {}).pop(id(conn), None)
+        fim = self._contador_itens(conn) if inicio is not None and conn.in_transaction else None
+        conn.commit()
+        if apos_commit is not None:
+            apos_commit()
+        if fim is not None and fim > inicio:
+            for ouvinte in self._ouvintes_escrita:
+                ouvinte(inicio, fim)
+
+    def ao_confirmar_escrita(self, ouvinte: Callable[[int, int], None]):
+        """Registra quem deve ser avisado das faixas (inicio, fim] do contador geradas localmente"""
+        self._ouvintes_escrita.append(ouvinte)
+
+    @contextmanager
+    def leitura(self) -> Iterator[sqlite3.Connection]:
+        """Instantâneo somente leitura para relatórios e exportações
+
+        Dentro do bloco, conexao() nesta thread entrega uma conexão aberta
+        com mode=ro e query_only e com uma transação de leitura já iniciada:
+        todas as consultas do relatório veem o banco no mesmo instante,
+        mesmo que movimentações sejam registradas no meio dele. Em WAL essa
+        leitura não bloqueia os escritores nem espera por eles; com
+        ALMOX_LEITURA_MODO=replica ela nem toca o arquivo principal. Blocos
+        aninhados reaproveitam o mesmo instantâneo.
+        """
+        local = self._local
+        if getattr(local, "instantaneo", None) is not None:
+            yield local.instantaneo
+            return
+
+        conn, geracao = self._obter_leitura()
+        anterior = (getattr(local, "conexao", None), getattr(local, "em_uso", False))
+        try:
+            # A transação de leitura começa na primeira leitura, não no BEGIN
+            conn.execute("BEGIN")
+            conn.execute("SELECT 1 FROM sqlite_master LIMIT 1").fetchall()
+            local.instantaneo = local.conexao = conn
+            local.em_uso = False
+            yield conn
+        finally:
+            local.instantaneo = None
+            local.conexao, local.em_uso = anterior
+            conn.rollback()
+            self._devolver_leitura(conn, geracao)
+
+    def _abrir_leitura(self) -> sqlite3.Connection:
+        """Conexão somente leitura no banco principal ou, no modo 'replica', na réplica"""
+        self._preparar()
+        caminho = self.db_path
+        if config.LEITURA_MODO == "replica":
+            if not self.replica_path.exists():
+                self.atualizar_replica()
+            caminho = self.replica_path
+        try:
+            conn = sqlite3.connect(f"{caminho.resolve().as_uri()}?mode=ro", uri=True,
+                                   check_same_thread=False, factory=self._fabrica)
+            conn.execute(f"PRAGMA busy_timeout = {int(config.BUSY_TIMEOUT_MS)}")
+            conn.execute("PRAGMA query_only = ON")
+            return conn
+        except sqlite3.Error as e:
+            logging.error(f"Erro ao abrir conexão de leitura: {e}")
+            raise
+
+    def _obter_leitura(self):
+        while True:
+            try:
+                conn, geracao = self._pool_leitura.get_nowait()
+            except queue.Empty:
+                geracao = self._geracao_replica
+                return self._abrir_leitura(), geracao
+            if geracao == self._geracao_replica:
+                return conn, geracao
+            conn.close()  # Aberta numa réplica que já foi substituída
+
+    def _devolver_leitura(self, conn: sqlite3.Connection, geracao: int):
+        if geracao != self._geracao_replica:
+            conn.close()
+            return
+        try:
+            self._pool_leitura.put_nowait((conn, geracao))
+        except queue.Full:
+            conn.close()
+
+    def atualizar_replica(self) -> Path:
+        """Recria a réplica de leitura pela API de backup e a troca de forma atômica
+
+        Relatórios em andamento seguem lendo a cópia anterior, que continua
+        aberta; conexões abertas nela são descartadas ao voltar ao pool.
+        """
+        with self._lock_replica:
+            self.replica_path.parent.mkdir(exist_ok=True, parents=True)
+            parcial = self.replica_path.with_name(self.replica_path.name + ".parcial")
+            parcial.unlink(missing_ok=True)
+            origem = self.criar_conexao()
+            try:
+                backup.copiar_online(origem, parcial, config.BACKUP_PAGINAS, config.BACKUP_PAUSA)
+            except BaseException:
+                parcial.unlink(missing_ok=True)
+                raise
+            finally:
+                origem.close()
+            parcial.replace(self.replica_path)
+            self._geracao_replica += 1
+        logging.info(f"Réplica de leitura atualizada em {self.replica_path}")
+        return self.replica_path
+
+    def _devolver(self, conn: sqlite3.Connection):
+        """Devolve a conexão ao pool ou a fecha se o pool estiver cheio"""
+        if conn.in_transaction:
+            conn.close()
+            return
+        try:
+            self._pool.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    def versao_dados(self) -> int:
+        """PRAGMA data_version de uma conexão dedicada
+
+        O valor muda sempre que outra conexão (do pool ou de outro processo)
+        confirma uma escrita, o que permite invalidar caches em memória.
+        """
+        with self._lock_versao:
+            if self._conexao_versao is None:
+                self._conexao_versao = self.criar_conexao()
+            return self._conexao_versao.execute("PRAGMA data_version").fetchone()[0]
+
+    def escritas_itens(self) -> int:
+        """Contador de linhas gravadas em itens (versao_itens), lido na conexão dedicada"""
+        with self._lock_versao:
+            if self._conexao_versao is None:
+                self._conexao_versao = self.criar_conexao()
+            return self._contador_itens(self._conexao_versao)
+
+    def fechar_conexoes(self):
+        """Fecha todas as conexões ociosas do pool"""
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                break
+        while True:
+            try:
+                self._pool_leitura.get_nowait()[0].close()
+            except queue.Empty:
+                break
+        with self._lock_versao:
+            if self._conexao_versao is not None:
+                self._conexao_versao.close()
+                self._conexao_versao = None
+
+    def fazer_backup(self, modo: str = config.BACKUP_MODO,
+                     compressao: Optional[str] = config.BACKUP_COMPRESSAO,
+                     paginas: int = config.BACKUP_PAGINAS,
+                     pausa: float = config.BACKUP_PAUSA) -> Optional[Path]:
+        """Realiza backup completo do banco sem bloquear os escritores
+
+        modo 'online' copia em passos de 'paginas' páginas pela API de backup;
+        'vacuum' gera um snapshot compactado com VACUUM INTO. A cópia passa
+        por integrity_check, é comprimida se pedido (gzip ou zstd) e recebe
+        um '.sha256'. Tudo isso acontece em arquivos '.parcial': o nome final
+        só aparece, já com o checksum ao lado, quando o backup está completo.
+        Retorna o caminho do backup, ou None em caso de falha.
+        """
+        try:
+            backup.conferir_compressao(compressao)
+        except Exception as e:
+            logging.error(f"Falha no backup: {e}")
+            return None
+
+        self.backup_dir.mkdir(exist_ok=True, parents=True)
+        agora = datetime.now()
+        destino = self.backup_dir / backup.nome_backup(agora, compressao)
+        copia = self.backup_dir / (backup.nome_backup(agora) + ".parcial")
+        comprimido = destino.with_name(destino.name + ".parcial")
+        checksum = destino.with_name(destino.name + ".sha256")
+
+        def progresso(status, restantes, total):
+            logging.debug(f"Backup: {total - restantes}/{total} páginas copiadas")
 
         try:
-            with self.criar_conexao() as src, sqlite3.connect(backup_path) as dst:
-                src.backup(dst)
-            logging.info(f"Backup criado em {backup_path}")
-            return True
+            origem = self.criar_conexao()
+            try:
+                if modo == "vacuum":
+                    backup.copiar_vacuum(origem, copia)
+                elif modo == "online":
+                    backup.copiar_online(origem, copia, paginas, pausa, progresso)
+                else:
+                    raise ValueError(f"Modo de backup inválido: {modo}")
+            finally:
+                origem.close()
+
+            if not backup.verificar_integridade(copia):
+                raise RuntimeError("Cópia reprovada no integrity_check")
+
+            final = copia
+            if compressao:
+                backup.comprimir(copia, comprimido, compressao)
+                final = comprimido
+            backup.gravar_checksum(final, destino.name)
+            final.replace(destino)
+
+            logging.info(f"Backup criado em {destino}")
+            return destino
         except Exception as e:
+            checksum.unlink(missing_ok=True)
             logging.error(f"Falha no backup: {e}")
-            return False
+            return None
+        finally:
+            copia.unlink(missing_ok=True)
+            comprimido.unlink(missing_ok=True)
+
+    def backup_agendado(self) -> Optional[Path]:
+        """Faz o backup se o último tiver mais de BACKUP_INTERVALO_HORAS e aplica a retenção"""
+        backups = backup.listar_backups(self.backup_dir)
+        novo = None
+        if not backups or datetime.now() - backups[0][0] >= timedelta(hours=config.BACKUP_INTERVALO_HORAS):
+            novo = self.fazer_backup()
+        backup.aplicar_retencao(self.backup_dir, config.BACKUP_DIARIOS, config.BACKUP_MENSAIS)
+        return novo
 
 # Singleton global
-db_manager = DatabaseManager()
\ No newline at end of file
+db_manager = DatabaseManager()
@@ -0,0 +1,185 @@
+import atexit
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, List, Optional, Tuple
+
+from src.core import config
+from src.core.database import db_manager
+
+# Operação de escrita: recebe a conexão do escritor e retorna (sucesso, mensagem)
+Operacao = Callable[..., Tuple[bool, str]]
+
+_PARAR = object()
+
+class _Pedido:
+    __slots__ = ("operacao", "apos_commit", "futuro")
+
+    def __init__(self, operacao: Operacao, apos_commit: Optional[Callable[[], None]]):
+        self.operacao = operacao
+        self.apos_commit = apos_commit
+        self.futuro = Future()
+
+class EscritorDedicado:
+    """Thread única dona da conexão de escrita, com commit em grupo
+
+    Os pedidos entram numa fila; a thread agrupa até 'lote_max' pedidos ou o
+    que chegar em 'latencia_max' segundos após o primeiro, executa cada um em
+    seu próprio SAVEPOINT e confirma o grupo com um único COMMIT. Cada pedido
+    recebe um Future resolvido com o (sucesso, mensagem) da sua operação.
+    """
+
+    def __init__(self, lote_max: int = config.ESCRITOR_LOTE_MAX,
+                 latencia_max: float = config.ESCRITOR_LATENCIA_MS / 1000):
+        self.lote_max = lote_max
+        self.latencia_max = latencia_max
+        self._habilitado = config.ESCRITOR_DEDICADO
+        self._fila = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+        self._atexit_registrado = False
+        self._erro: Optional[BaseException] = None
+
+    @property
+    def ativo(self) -> bool:
+        """Indica se as escritas do serviço síncrono devem passar pelo escritor
+
+        Só por ALMOX_ESCRITOR_DEDICADO=1 ou habilitar(); usar submeter() (como
+        a fachada assíncrona faz) inicia a thread mas não muda esta escolha.
+        """
+        return self._habilitado
+
+    def habilitar(self):
+        """Passa as escritas do serviço síncrono pelo escritor e inicia a thread"""
+        self._habilitado = True
+        self.iniciar()
+
+    def iniciar(self):
+        """Inicia a thread, se ainda não estiver rodando; também a recupera após uma falha"""
+        with self._lock:
+            self._erro = None
+            self._iniciar()
+
+    def _iniciar(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._executar, name="escritor-dedicado", daemon=True)
+            self._thread.start()
+            if not self._atexit_registrado:
+                atexit.register(self.parar)
+                self._atexit_registrado = True
+
+    def parar(self, timeout: Optional[float] = None):
+        """Processa os pedidos pendentes e encerra a thread"""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None and thread.is_alive():
+            self._fila.put(_PARAR)
+            thread.join(timeout)
+
+    def submeter(self, operacao: Operacao, apos_commit: Optional[Callable[[], None]] = None) -> Future:
+        """Enfileira uma operação de escrita e retorna o Future do seu resultado
+
+        'apos_commit' é chamado pela thread do escritor somente se a operação
+        tiver sucesso e o grupo for confirmado. Se a thread tiver morrido por
+        um erro, o Future já volta com esse erro (até iniciar() ser chamado).
+        """
+        pedido = _Pedido(operacao, apos_commit)
+        with self._lock:
+            if self._erro is not None:
+                pedido.futuro.set_exception(
+                    RuntimeError(f"Escritor dedicado interrompido: {self._erro}"))
+                return pedido.futuro
+            self._iniciar()
+            self._fila.put(pedido)
+        return pedido.futuro
+
+    def _executar(self):
+        lote: List[_Pedido] = []
+        conn = None
+        try:
+            conn = db_manager.criar_conexao()
+            parar = False
+            while not parar:
+                primeiro = self._fila.get()
+                if primeiro is _PARAR:
+                    break
+
+                lote = [primeiro]
+                prazo = time.monotonic() + self.latencia_max
+                while len(lote) < self.lote_max:
+                    restante = prazo - time.monotonic()
+                    try:
+                        pedido = self._fila.get(timeout=restante) if restante > 0 else self._fila.get_nowait()
+                    except queue.Empty:
+                        break
+                    if pedido is _PARAR:
+                        parar = True
+                        break
+                    lote.append(pedido)
+
+                self._processar(conn, lote)
+                lote = []
+        except BaseException as e:
+            logging.error(f"Escritor dedicado interrompido: {e}")
+            self._falhar(e, lote)
+        finally:
+            if conn is not None:
+                conn.close()
+
+    def _falhar(self, erro: BaseException, lote: List[_Pedido]):
+        """Recusa novos pedidos e resolve com o erro os que estavam no lote ou na fila"""
+        with self._lock:
+            self._erro = erro
+            pendentes = list(lote)
+            while True:
+                try:
+                    pedido = self._fila.get_nowait()
+                except queue.Empty:
+                    break
+                if pedido is not _PARAR:
+                    pendentes.append(pedido)
+        falha = RuntimeError(f"Escritor dedicado interrompido: {erro}")
+        for pedido in pendentes:
+            if not pedido.futuro.done():
+                pedido.futuro.set_exception(falha)
+
+    def _processar(self, conn, lote: List[_Pedido]):
+        resultados = []
+        try:
+            db_manager.iniciar_escrita(conn)
+            for pedido in lote:
+                conn.execute("SAVEPOINT pedido")
+                try:
+                    resultado = pedido.operacao(conn)
+                except Exception as e:
+                    logging.error(f"Erro em operação do escritor: {e}")
+                    resultado = (False, f"Erro ao processar escrita: {e}")
+                if not resultado[0]:
+                    conn.execute("ROLLBACK TO pedido")
+                conn.execute("RELEASE pedido")
+                resultados.append(resultado)
+            # Os avisos de apos_commit (ex.: invalidar o cache) rodam antes de
+            # o db_manager anunciar as escritas do grupo como locais
+            db_manager.confirmar(conn, lambda: self._apos_commit(lote, resultados))
+        except Exception as e:
+            logging.error(f"Erro ao confirmar grupo de escritas: {e}")
+            if conn.in_transaction:
+                conn.rollback()
+            resultados = [(False, f"Erro ao gravar: {e}")] * len(lote)
+
+        for pedido, resultado in zip(lote, resultados):
+            pedido.futuro.set_result(resultado)
+
+    @staticmethod
+    def _apos_commit(lote: List[_Pedido], resultados: List[Tuple[bool, str]]):
+        for pedido, resultado in zip(lote, resultados):
+            if resultado[0] and pedido.apos_commit is not None:
+                try:
+                    pedido.apos_commit()
+                except Exception as e:
+                    logging.error(f"Erro após confirmar escrita: {e}")
+
+# Escritor global
+escritor = EscritorDedicado()
@@ -0,0 +1,251 @@
+import atexit
+import json
+import logging
+import re
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import sqlite3
+
+from src.core import config
+
+# Latências guardadas por modelo de instrução para calcular os percentis
+_AMOSTRAS_POR_MODELO = 10_000
+_TAMANHO_MAX_MODELO = 300
+
+_LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_ESPACOS = re.compile(r"\s+")
+_EXPLICAVEL = re.compile(r"^\s*(SELECT|WITH|INSERT|UPDATE|DELETE|REPLACE)\b", re.IGNORECASE)
+
+def modelo_instrucao(sql: str) -> str:
+    """Forma canônica da instrução: espaços colapsados e literais trocados por '?'"""
+    modelo = _ESPACOS.sub(" ", _LITERAL.sub("?", sql)).strip()
+    return modelo if len(modelo) <= _TAMANHO_MAX_MODELO else modelo[:_TAMANHO_MAX_MODELO] + "…"
+
+def _percentil(ordenados: List[float], fracao: float) -> float:
+    if not ordenados:
+        return 0.0
+    return ordenados[min(len(ordenados) - 1, int(len(ordenados) * fracao))]
+
+class _EstatisticaModelo:
+    __slots__ = ("execucoes", "tempo_total", "linhas", "lentas", "latencias")
+
+    def __init__(self):
+        self.execucoes = 0
+        self.tempo_total = 0.0
+        self.linhas = 0
+        self.lentas = 0
+        self.latencias = deque(maxlen=_AMOSTRAS_POR_MODELO)
+
+class ColetorSQL:
+    """Agrega, por modelo de instrução, execuções, latência e linhas retornadas
+
+    Alimentado pelos cursores instrumentados de todas as conexões; seguro
+    para uso entre threads.
+    """
+
+    def __init__(self, limite_lenta_ms: float = config.SQL_LENTA_MS):
+        self.limite_lenta = limite_lenta_ms / 1000
+        self._estatisticas: Dict[str, _EstatisticaModelo] = {}
+        # Reentrante: um cursor pode ser finalizado pela coleta de lixo dentro de registrar()
+        self._lock = threading.RLock()
+        self.desde = datetime.now()
+
+    def registrar(self, conn: sqlite3.Connection, sql: str, parametros, segundos: float, linhas: int):
+        modelo = modelo_instrucao(sql)
+        lenta = segundos >= self.limite_lenta
+        with self._lock:
+            estatistica = self._estatisticas.get(modelo)
+            if estatistica is None:
+                estatistica = self._estatisticas[modelo] = _EstatisticaModelo()
+            estatistica.execucoes += 1
+            estatistica.tempo_total += segundos
+            estatistica.linhas += linhas
+            estatistica.latencias.append(segundos)
+            if lenta:
+                estatistica.lentas += 1
+        if lenta:
+            self._registrar_lenta(conn, sql, parametros, segundos, linhas)
+
+    @staticmethod
+    def _registrar_lenta(conn: sqlite3.Connection, sql: str, parametros, segundos: float, linhas: int):
+        plano = ""
+        if parametros is not None and _EXPLICAVEL.match(sql):
+            try:
+                # Cursor comum: o EXPLAIN não deve ser contado nas estatísticas
+                detalhes = sqlite3.Cursor(conn).execute(f"EXPLAIN QUERY PLAN {sql}", parametros).fetchall()
+                plano = "\n".join(f"    {linha[-1]}" for linha in detalhes)
+            except sqlite3.Error as e:
+                plano = f"    (plano indisponível: {e})"
+        logging.warning(f"SQL lenta ({segundos * 1000:.1f} ms, {linhas} linhas): "
+                        f"{modelo_instrucao(sql)}" + (f"\n{plano}" if plano else ""))
+
+    def relatorio(self) -> List[dict]:
+        """Estatísticas por modelo, do maior tempo total para o menor"""
+        with self._lock:
+            copia = [(modelo, e.execucoes, e.tempo_total, e.linhas, e.lentas, sorted(e.latencias))
+                     for modelo, e in self._estatisticas.items()]
+        linhas = []
+        for modelo, execucoes, tempo_total, total_linhas, lentas, latencias in copia:
+            linhas.append({
+                "modelo": modelo,
+                "execucoes": execucoes,
+                "total_ms": round(tempo_total * 1000, 3),
+                "p50_ms": round(_percentil(latencias, 0.50) * 1000, 3),
+                "p95_ms": round(_percentil(latencias, 0.95) * 1000, 3),
+                "p99_ms": round(_percentil(latencias, 0.99) * 1000, 3),
+                "linhas": total_linhas,
+                "lentas": lentas,
+            })
+        return sorted(linhas, key=lambda linha: linha["total_ms"], reverse=True)
+
+    def formatar(self, limite: int = 20) -> str:
+        """Tabela de texto com os modelos que mais consumiram tempo"""
+        linhas = self.relatorio()
+        saida = [f"Estatísticas SQL desde {self.desde:%d/%m/%Y %H:%M:%S} ({len(linhas)} modelos)",
+                 f"{'EXEC':>8} | {'TOTAL ms':>10} | {'P50':>7} | {'P95':>7} | {'P99':>7} | "
+                 f"{'LINHAS':>9} | {'LENTAS':>6} | INSTRUÇÃO",
+                 "-" * 120]
+        for linha in linhas[:limite]:
+            saida.append(f"{linha['execucoes']:>8} | {linha['total_ms']:>10.1f} | {linha['p50_ms']:>7.2f} | "
+                         f"{linha['p95_ms']:>7.2f} | {linha['p99_ms']:>7.2f} | {linha['linhas']:>9} | "
+                         f"{linha['lentas']:>6} | {linha['modelo'][:80]}")
+        return "\n".join(saida)
+
+    def despejar(self, diretorio: Path = config.SQL_ESTATISTICAS_DIR) -> Optional[Path]:
+        """Grava as estatísticas em JSON no diretório informado"""
+        linhas = self.relatorio()
+        if not linhas:
+            return None
+        diretorio.mkdir(parents=True, exist_ok=True)
+        destino = diretorio / f"sql_{datetime.now():%Y%m%d_%H%M%S}.json"
+        destino.write_text(json.dumps({"desde": self.desde.isoformat(timespec="seconds"),
+                                       "limite_lenta_ms": self.limite_lenta * 1000,
+                                       "modelos": linhas}, indent=2, ensure_ascii=False),
+                           encoding="utf-8")
+        return destino
+
+    def zerar(self):
+        with self._lock:
+            self._estatisticas.clear()
+            self.desde = datetime.now()
+
+coletor = ColetorSQL()
+
+class CursorInstrumentado(sqlite3.Cursor):
+    """Cursor que mede cada instrução, da execução até a última linha lida
+
+    A latência de um SELECT inclui o tempo gasto nos fetch, já que o SQLite
+    produz as linhas sob demanda. A medição é fechada quando o resultado se
+    esgota, quando o cursor executa outra instrução, é fechado ou descartado.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._pendente = None
+
+    def _finalizar(self):
+        pendente, self._pendente = self._pendente, None
+        if pendente is not None:
+            sql, parametros, segundos, linhas = pendente
+            coletor.registrar(self.connection, sql, parametros, segundos, linhas)
+
+    def _medir(self, inicio: float, linhas: int, esgotado: bool):
+        if self._pendente is not None:
+            sql, parametros, segundos, total = self._pendente
+            self._pendente = (sql, parametros, segundos + time.perf_counter() - inicio, total + linhas)
+            if esgotado:
+                self._finalizar()
+
+    def _iniciar(self, sql: str, parametros, inicio: float, executar):
+        self._finalizar()
+        try:
+            resultado = executar()
+        finally:
+            self._pendente = (sql, parametros, time.perf_counter() - inicio, 0)
+            # Sem colunas não há linhas a ler: a instrução já terminou
+            if self.description is None:
+                self._pendente = self._pendente[:3] + (max(self.rowcount, 0),)
+                self._finalizar()
+        return resultado
+
+    def execute(self, sql, parameters=()):
+        inicio = time.perf_counter()
+        return self._iniciar(sql, parameters, inicio, lambda: super(CursorInstrumentado, self).execute(sql, parameters))
+
+    def executemany(self, sql, seq_of_parameters):
+        inicio = time.perf_counter()
+        return self._iniciar(sql, None, inicio,
+                             lambda: super(CursorInstrumentado, self).executemany(sql, seq_of_parameters))
+
+    def executescript(self, sql_script):
+        inicio = time.perf_counter()
+        return self._iniciar(sql_script, None, inicio,
+                             lambda: super(CursorInstrumentado, self).executescript(sql_script))
+
+    def fetchone(self):
+        inicio = time.perf_counter()
+        linha = super().fetchone()
+        self._medir(inicio, linha is not None, linha is None)
+        return linha
+
+    def fetchmany(self, size=None):
+        inicio = time.perf_counter()
+        tamanho = self.arraysize if size is None else size
+        linhas = super().fetchmany(tamanho)
+        self._medir(inicio, len(linhas), len(linhas) < tamanho)
+        return linhas
+
+    def fetchall(self):
+        inicio = time.perf_counter()
+        linhas = super().fetchall()
+        self._medir(inicio, len(linhas), True)
+        return linhas
+
+    def __next__(self):
+        inicio = time.perf_counter()
+        try:
+            linha = super().__next__()
+        except StopIteration:
+            self._medir(inicio, 0, True)
+            raise
+        self._medir(inicio, 1, False)
+        return linha
+
+    def close(self):
+        self._finalizar()
+        super().close()
+
+    def __del__(self):
+        # Resultado abandonado sem ser lido até o fim (ex.: conn.execute(...) sem fetch);
+        # sem parâmetros para não rodar EXPLAIN durante a coleta de lixo
+        if self._pendente is not None:
+            self._pendente = (self._pendente[0], None) + self._pendente[2:]
+            self._finalizar()
+
+class ConexaoInstrumentada(sqlite3.Connection):
+    """Conexão cujos cursores (inclusive os de execute*) são instrumentados"""
+
+    def cursor(self, factory=CursorInstrumentado):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def executescript(self, sql_script):
+        return self.cursor().executescript(sql_script)
+
+def _despejar_ao_sair():
+    destino = coletor.despejar()
+    if destino:
+        logging.info(f"Estatísticas SQL gravadas em {destino}\n{coletor.formatar()}")
+
+if config.SQL_INSTRUMENTACAO:
+    atexit.register(_despejar_ao_sair)
@@ -0,0 +1,295 @@
+import sqlite3
+import logging
+from typing import Callable, List, Tuple, Union
+
+from src.utils.helpers import normalizar_texto
+
+# Cada migração é (versão, descrição, passos). Um passo é um comando SQL ou
+# uma função que recebe a conexão. A versão aplicada fica em PRAGMA user_version.
+Passo = Union[str, Callable[[sqlite3.Connection], None]]
+
+def _preencher_nome_normalizado(conn: sqlite3.Connection):
+    """Preenche itens.nome_normalizado; nomes repetidos recebem o id como sufixo"""
+    vistos = set()
+    atualizacoes = []
+    for item_id, nome in conn.execute("SELECT id, nome FROM itens ORDER BY id"):
+        normalizado = normalizar_texto(nome)
+        if normalizado in vistos:
+            logging.warning(f"Item {item_id} ('{nome}') tem nome duplicado; revise o cadastro")
+            normalizado = f"{normalizado}#{item_id}"
+        vistos.add(normalizado)
+        atualizacoes.append((normalizado, item_id))
+    conn.executemany("UPDATE itens SET nome_normalizado = ? WHERE id = ?", atualizacoes)
+
+def _preencher_busca_normalizada(conn: sqlite3.Connection):
+    """Preenche marca, tipo e descrição normalizados, lidos pelos gatilhos da busca textual"""
+    conn.executemany(
+        "UPDATE itens SET marca_normalizada = ?, tipo_normalizado = ?, descricao_normalizada = ? WHERE id = ?",
+        ((normalizar_texto(marca), normalizar_texto(tipo), normalizar_texto(descricao), item_id)
+         for item_id, marca, tipo, descricao in
+         conn.execute("SELECT id, marca, tipo, descricao FROM itens").fetchall()))
+
+_DATA_CANONICA = "strftime('%Y-%m-%d %H:%M:%S', {0})"
+
+def _normalizar_datas_movimentacoes(conn: sqlite3.Connection):
+    """Reescreve movimentacoes.data no formato canônico (ex.: '2025-03-31T10:00:00.123' e '2025-03-31')"""
+    canonica = _DATA_CANONICA.format("data")
+    cursor = conn.execute(
+        f"UPDATE movimentacoes SET data = {canonica} WHERE {canonica} IS NOT NULL AND data <> {canonica}")
+    if cursor.rowcount:
+        logging.info(f"{cursor.rowcount} datas de movimentações normalizadas")
+    invalidas = conn.execute(f"SELECT COUNT(*) FROM movimentacoes WHERE {canonica} IS NULL").fetchone()[0]
+    if invalidas:
+        logging.warning(f"{invalidas} movimentações com data não reconhecida ficarão fora dos filtros por período")
+
+def _texto_busca(novo: str, antigo: str = None) -> str:
+    """Expressões das colunas de itens_fts a partir de 'novo' (ex.: 'NEW')
+
+    Usa o texto normalizado gravado pela aplicação. Sem ele, ou quando só a
+    coluna original mudou (gravação por outro cliente SQLite, passando 'antigo'
+    = 'OLD'), indexa a coluna original em minúsculas. O '#id' que desambigua
+    nomes repetidos antigos em nome_normalizado não entra na busca.
+    """
+    sufixo = f"'#' || {novo}.id"
+    expressoes = []
+    for original, normalizada in (('nome', 'nome_normalizado'), ('marca', 'marca_normalizada'),
+                                  ('tipo', 'tipo_normalizado'), ('descricao', 'descricao_normalizada')):
+        valor = f"{novo}.{normalizada}"
+        if normalizada == 'nome_normalizado':
+            valor = (f"CASE WHEN substr({valor}, -length({sufixo})) = {sufixo} "
+                     f"THEN substr({valor}, 1, length({valor}) - length({sufixo})) ELSE {valor} END")
+        expressao = f"COALESCE({valor}, lower({novo}.{original}))"
+        if antigo:
+            expressao = (f"CASE WHEN {novo}.{original} IS NOT {antigo}.{original} "
+                         f"AND {novo}.{normalizada} IS {antigo}.{normalizada} "
+                         f"THEN lower({novo}.{original}) ELSE {expressao} END")
+        expressoes.append(expressao)
+    return ",\n                ".join(expressoes)
+
+MIGRACOES: List[Tuple[int, str, List[Passo]]] = [
+    (1, "Índices para consultas por item, período, validade e nome", [
+        "CREATE INDEX IF NOT EXISTS idx_movimentacoes_item_data ON movimentacoes(item_id, data)",
+        "CREATE INDEX IF NOT EXISTS idx_movimentacoes_data ON movimentacoes(data)",
+        "CREATE INDEX IF NOT EXISTS idx_itens_data_validade ON itens(data_validade)",
+        "CREATE INDEX IF NOT EXISTS idx_itens_nome ON itens(nome)",
+        "CREATE INDEX IF NOT EXISTS idx_itens_nome_nocase ON itens(nome COLLATE NOCASE)",
+    ]),
+    (2, "Estatísticas para o planejador de consultas", [
+        "ANALYZE",
+    ]),
+    (3, "Checkpoints de saldo por item e índice de cobertura para agregados", [
+        """CREATE TABLE IF NOT EXISTS saldos_checkpoint (
+            item_id INTEGER NOT NULL,
+            data TEXT NOT NULL,
+            saldo INTEGER NOT NULL,
+            PRIMARY KEY (item_id, data),
+            FOREIGN KEY(item_id) REFERENCES itens(id) ON DELETE CASCADE
+        ) WITHOUT ROWID""",
+        # Substitui idx_movimentacoes_item_data: mesmo prefixo, mas cobre o SUM por tipo
+        """CREATE INDEX IF NOT EXISTS idx_movimentacoes_item_data_qtd
+            ON movimentacoes(item_id, data, tipo, quantidade)""",
+        "DROP INDEX IF EXISTS idx_movimentacoes_item_data",
+        # Movimentações retroativas invalidam os checkpoints posteriores a elas
+        """CREATE TRIGGER IF NOT EXISTS trg_movimentacoes_checkpoint_ins
+            AFTER INSERT ON movimentacoes
+        BEGIN
+            DELETE FROM saldos_checkpoint WHERE item_id = NEW.item_id AND data > NEW.data;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS trg_movimentacoes_checkpoint_upd
+            AFTER UPDATE OF item_id, tipo, quantidade, data ON movimentacoes
+        BEGIN
+            DELETE FROM saldos_checkpoint WHERE item_id = OLD.item_id AND data > OLD.data;
+            DELETE FROM saldos_checkpoint WHERE item_id = NEW.item_id AND data > NEW.data;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS trg_movimentacoes_checkpoint_del
+            AFTER DELETE ON movimentacoes
+        BEGIN
+            DELETE FROM saldos_checkpoint WHERE item_id = OLD.item_id AND data > OLD.data;
+        END""",
+    ]),
+    (4, "Busca textual FTS5 (trigramas) e nome normalizado único", [
+        "ALTER TABLE itens ADD COLUMN nome_normalizado TEXT",
+        _preencher_nome_normalizado,
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_itens_nome_normalizado ON itens(nome_normalizado)",
+        "DROP INDEX IF EXISTS idx_itens_nome_nocase",
+        # Guarda o texto já normalizado (sem acentos, minúsculo); rowid = itens.id
+        """CREATE VIRTUAL TABLE IF NOT EXISTS itens_fts USING fts5(
+            nome, marca, tipo, descricao, tokenize = 'trigram'
+        )""",
+        """INSERT INTO itens_fts (rowid, nome, marca, tipo, descricao)
+            SELECT id, normalizar(nome), normalizar(marca), normalizar(tipo), normalizar(descricao)
+            FROM itens""",
+        """CREATE TRIGGER IF NOT EXISTS trg_itens_fts_ins AFTER INSERT ON itens
+        BEGIN
+            INSERT INTO itens_fts (rowid, nome, marca, tipo, descricao)
+            VALUES (NEW.id, normalizar(NEW.nome), normalizar(NEW.marca),
+                    normalizar(NEW.tipo), normalizar(NEW.descricao));
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS trg_itens_fts_upd
+            AFTER UPDATE OF nome, marca, tipo, descricao ON itens
+        BEGIN
+            UPDATE itens_fts SET
+                nome = normalizar(NEW.nome), marca = normalizar(NEW.marca),
+                tipo = normalizar(NEW.tipo), descricao = normalizar(NEW.descricao)
+            WHERE rowid = NEW.id;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS trg_itens_fts_del AFTER DELETE ON itens
+        BEGIN
+            DELETE FROM itens_fts WHERE rowid = OLD.id;
+        END""",
+    ]),
+    (5, "Progresso das importações em lote (retomada)", [
+        # Uma linha por arquivo (hash do conteúdo) e tipo de importação
+        """CREATE TABLE IF NOT EXISTS importacoes (
+            assinatura TEXT NOT NULL,
+            tipo TEXT NOT NULL CHECK(tipo IN ('itens', 'movimentacoes')),
+            arquivo TEXT NOT NULL,
+            linhas_confirmadas INTEGER NOT NULL DEFAULT 0,
+            gravadas INTEGER NOT NULL DEFAULT 0,
+            erros INTEGER NOT NULL DEFAULT 0,
+            concluida INTEGER NOT NULL DEFAULT 0,
+            atualizado_em TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (assinatura, tipo)
+        ) WITHOUT ROWID""",
+    ]),
+    (6, "Estado das tarefas agendadas e concessão do agendador", [
+        # Última execução e marca d'água (ex.: validade já processada) de cada tarefa
+        """CREATE TABLE IF NOT EXISTS tarefas_agendadas (
+            nome TEXT PRIMARY KEY,
+            ultima_execucao TEXT NOT NULL,
+            marca TEXT,
+            sucesso INTEGER NOT NULL,
+            mensagem TEXT,
+            duracao_ms REAL
+        ) WITHOUT ROWID""",
+        # Só o dono de uma concessão válida executa as tarefas
+        """CREATE TABLE IF NOT EXISTS concessoes (
+            nome TEXT PRIMARY KEY,
+            dono TEXT NOT NULL,
+            expira_em REAL NOT NULL
+        ) WITHOUT ROWID""",
+    ]),
+    (7, "Data canônica das movimentações e carimbo inteiro (data_ts) com índices de cobertura", [
+        _normalizar_datas_movimentacoes,
+        # Segundos desde 1970 da data gravada (sem fuso), sempre coerente com 'data'
+        """ALTER TABLE movimentacoes ADD COLUMN data_ts INTEGER
+            GENERATED ALWAYS AS (CAST(strftime('%s', data) AS INTEGER)) VIRTUAL""",
+        # Período: faixa em data_ts já com item, tipo e quantidade para os agregados
+        """CREATE INDEX IF NOT EXISTS idx_movimentacoes_ts
+            ON movimentacoes(data_ts, item_id, tipo, quantidade)""",
+        # Histórico e saldos por item
+        """CREATE INDEX IF NOT EXISTS idx_movimentacoes_item_ts
+            ON movimentacoes(item_id, data_ts, tipo, quantidade)""",
+        "DROP INDEX IF EXISTS idx_movimentacoes_data",
+        "DROP INDEX IF EXISTS idx_movimentacoes_item_data_qtd",
+        # Escritas fora do formato canônico são corrigidas; datas irreconhecíveis, recusadas
+        """CREATE TRIGGER IF NOT EXISTS trg_movimentacoes_data_valida
+            BEFORE INSERT ON movimentacoes
+            WHEN strftime('%s', NEW.data) IS NULL
+        BEGIN
+            SELECT RAISE(ABORT, 'data da movimentação inválida');
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS trg_movimentacoes_data_canonica
+            AFTER INSERT ON movimentacoes
+            WHEN NEW.data <> strftime('%Y-%m-%d %H:%M:%S', NEW.data)
+        BEGIN
+            UPDATE movimentacoes SET data = strftime('%Y-%m-%d %H:%M:%S', NEW.data) WHERE id = NEW.id;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS trg_movimentacoes_data_canonica_upd
+            AFTER UPDATE OF data ON movimentacoes
+            WHEN NEW.data <> strftime('%Y-%m-%d %H:%M:%S', NEW.data)
+        BEGIN
+            UPDATE movimentacoes SET data = strftime('%Y-%m-%d %H:%M:%S', NEW.data) WHERE id = NEW.id;
+        END""",
+        "ANALYZE movimentacoes",
+    ]),
+    (8, "Busca textual sem função da aplicação nos gatilhos", [
+        # O texto normalizado é gravado pela aplicação, como nome_normalizado;
+        # os gatilhos só o copiam, então qualquer cliente SQLite pode gravar em itens
+        "ALTER TABLE itens ADD COLUMN marca_normalizada TEXT",
+        "ALTER TABLE itens ADD COLUMN tipo_normalizado TEXT",
+        "ALTER TABLE itens ADD COLUMN descricao_normalizada TEXT",
+        _preencher_busca_normalizada,
+        "DROP TRIGGER IF EXISTS trg_itens_fts_ins",
+        "DROP TRIGGER IF EXISTS trg_itens_fts_upd",
+        "DROP TRIGGER IF EXISTS trg_itens_fts_del",
+        "DELETE FROM itens_fts",
+        f"""INSERT INTO itens_fts (rowid, nome, marca, tipo, descricao)
+            SELECT id, {_texto_busca('itens')} FROM itens""",
+        f"""CREATE TRIGGER IF NOT EXISTS trg_itens_fts_ins AFTER INSERT ON itens
+        BEGIN
+            INSERT INTO itens_fts (rowid, nome, marca, tipo, descricao)
+            VALUES (NEW.id, {_texto_busca('NEW')});
+        END""",
+        f"""CREATE TRIGGER IF NOT EXISTS trg_itens_fts_upd
+            AFTER UPDATE OF nome, marca, tipo, descricao, nome_normalizado,
+                marca_normalizada, tipo_normalizado, descricao_normalizada ON itens
+        BEGIN
+            DELETE FROM itens_fts WHERE rowid = OLD.id;
+            INSERT INTO itens_fts (rowid, nome, marca, tipo, descricao)
+            VALUES (NEW.id, {_texto_busca('NEW', 'OLD')});
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS trg_itens_fts_del AFTER DELETE ON itens
+        BEGIN
+            DELETE FROM itens_fts WHERE rowid = OLD.id;
+        END""",
+    ]),
+    (9, "Contador de escritas em itens para o cache de itens", [
+        # Cada linha gravada em itens, por qualquer conexão ou cliente, avança o
+        # contador; o cache compara o avanço com as faixas geradas pelo próprio
+        # processo para saber se outra conexão alterou itens
+        """CREATE TABLE IF NOT EXISTS versao_itens (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            valor INTEGER NOT NULL
+        )""",
+        "INSERT OR IGNORE INTO versao_itens (id, valor) VALUES (1, 0)",
+        """CREATE TRIGGER IF NOT EXISTS trg_itens_versao_ins AFTER INSERT ON itens
+        BEGIN
+            UPDATE versao_itens SET valor = valor + 1 WHERE id = 1;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS trg_itens_versao_upd AFTER UPDATE ON itens
+        BEGIN
+            UPDATE versao_itens SET valor = valor + 1 WHERE id = 1;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS trg_itens_versao_del AFTER DELETE ON itens
+        BEGIN
+            UPDATE versao_itens SET valor = valor + 1 WHERE id = 1;
+        END""",
+    ]),
+]
+
+VERSAO_ATUAL = MIGRACOES[-1][0]
+
+def versao_banco(conn: sqlite3.Connection) -> int:
+    """Retorna a versão de esquema registrada no banco"""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+def aplicar_migracoes(conn: sqlite3.Connection) -> int:
+    """Aplica, em ordem e cada uma em sua transação, as migrações pendentes"""
+    versao = versao_banco(conn)
+
+    for numero, descricao, passos in MIGRACOES:
+        if numero <= versao:
+            continue
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            # Outro processo pode ter migrado enquanto aguardávamos o lock
+            if versao_banco(conn) >= numero:
+                conn.rollback()
+                versao = versao_banco(conn)
+                continue
+            for passo in passos:
+                if callable(passo):
+                    passo(conn)
+                else:
+                    conn.execute(passo)
+            conn.execute(f"PRAGMA user_version = {int(numero)}")
+            conn.commit()
+        except sqlite3.Error as e:
+            conn.rollback()
+            logging.error(f"Erro na migração {numero} ({descricao}): {e}")
+            raise
+        logging.info(f"Migração {numero} aplicada: {descricao}")
+        versao = numero
+
+    return versao
@@ -1,8 +1,9 @@
-from dataclasses import dataclass
+from collections import namedtuple
+from dataclasses import dataclass, fields
 from datetime import datetime
 from typing import Optional
 
-@dataclass
+@dataclass(slots=True)
 class Item:
     id: Optional[int] = None
     nome: str = ""
@@ -27,4 +28,7 @@ class Item:
             try:
                 datetime.strptime(self.data_validade, "%Y-%m-%d")
             except ValueError:
-                raise ValueError("Data deve estar no formato AAAA-MM-DD")
\ No newline at end of file
+                raise ValueError("Data deve estar no formato AAAA-MM-DD")
+
+# Versão somente leitura baseada em tupla, para leituras em massa sem criar dataclasses
+ItemView = namedtuple("ItemView", [campo.name for campo in fields(Item)])
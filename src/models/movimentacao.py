@@ -1,8 +1,9 @@
-from dataclasses import dataclass
+from collections import namedtuple
+from dataclasses import dataclass, fields
 from datetime import datetime
 from typing import Optional
 
-@dataclass
+@dataclass(slots=True)
 class Movimentacao:
     id: Optional[int] = None
     item_id: int = 0
@@ -23,4 +24,7 @@ class Movimentacao:
         try:
             datetime.strptime(self.data, "%Y-%m-%d %H:%M:%S")
         except ValueError:
-            raise ValueError("Data em formato inválido")
\ No newline at end of file
+            raise ValueError("Data em formato inválido")
+
+# Versão somente leitura baseada em tupla, para leituras em massa sem criar dataclasses
+MovimentacaoView = namedtuple("MovimentacaoView", [campo.name for campo in fields(Movimentacao)])
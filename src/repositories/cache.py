@@ -0,0 +1,115 @@
+import copy
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Optional
+
+from src.core import config
+from src.core.database import db_manager
+
+class CacheIdentidade:
+    """Identity map LRU com capacidade limitada e contadores de acerto/falha
+
+    Escritas do próprio processo descartam só as entradas que alteraram e
+    avisam, pelo db_manager, a faixa do contador de escritas que geraram.
+    A cada consulta o cache compara a versão dos dados do banco (PRAGMA
+    data_version) com a última vista; se mudou, confere o contador: avanços
+    fora das faixas locais vieram de outra conexão (outro processo, um
+    cliente SQLite, uma escrita sem aviso) e o cache inteiro é descartado.
+    As cópias devolvidas evitam que alterações feitas pelo chamador vazem
+    para o cache.
+    """
+
+    def __init__(self, capacidade: int, versao_dados: Callable[[], int], contador_escritas: Callable[[], int]):
+        self.capacidade = capacidade
+        self._versao_dados = versao_dados
+        self._contador_escritas = contador_escritas
+        self._versao = None
+        self._contador = None
+        # Faixas (inicio, fim] do contador geradas por escritas locais, por início
+        self._locais: Dict[int, int] = {}
+        # Muda a cada descarte; guardar() ignora leituras anteriores a ele
+        self._geracao = 0
+        self._entradas = OrderedDict()
+        self._lock = threading.Lock()
+        self.acertos = 0
+        self.falhas = 0
+
+    def _validar_versao(self):
+        versao = self._versao_dados()
+        if versao == self._versao:
+            return
+        self._versao = versao
+        contador = self._contador_escritas()
+        while self._contador is not None and self._contador < contador and self._contador in self._locais:
+            self._contador = self._locais.pop(self._contador)
+        if self._contador != contador:
+            self._entradas.clear()
+            self._geracao += 1
+            self._contador = contador
+            self._locais = {inicio: fim for inicio, fim in self._locais.items() if inicio >= contador}
+
+    def marca(self) -> int:
+        """Marca a ser tomada antes de ler do banco um valor que será guardado"""
+        with self._lock:
+            return self._geracao
+
+    def obter(self, chave: Hashable) -> Optional[object]:
+        """Retorna uma cópia do objeto em cache ou None"""
+        with self._lock:
+            self._validar_versao()
+            valor = self._entradas.get(chave)
+            if valor is None:
+                self.falhas += 1
+                return None
+            self._entradas.move_to_end(chave)
+            self.acertos += 1
+            return copy.copy(valor)
+
+    def guardar(self, chave: Hashable, valor: object, marca: Optional[int] = None):
+        """Guarda uma cópia do objeto, descartando o menos usado se necessário
+
+        Com 'marca', o valor só é guardado se nada foi descartado desde que
+        ela foi tomada: uma escrita confirmada no meio da leitura o deixaria
+        desatualizado.
+        """
+        with self._lock:
+            if marca is not None and marca != self._geracao:
+                return
+            self._entradas[chave] = copy.copy(valor)
+            self._entradas.move_to_end(chave)
+            while len(self._entradas) > self.capacidade:
+                self._entradas.popitem(last=False)
+
+    def invalidar(self, *chaves: Hashable):
+        """Remove as entradas informadas (ou todas, se nenhuma chave for informada)"""
+        with self._lock:
+            self._geracao += 1
+            if not chaves:
+                self._entradas.clear()
+            for chave in chaves:
+                self._entradas.pop(chave, None)
+
+    def escritas_locais(self, inicio: int, fim: int):
+        """Registra a faixa (inicio, fim] do contador gerada por uma escrita deste processo"""
+        with self._lock:
+            self._locais[inicio] = fim
+
+    def confirmar(self, conn, *chaves: Hashable):
+        """Confirma a transação de 'conn' (aberta por db_manager.transacao) e descarta as chaves alteradas"""
+        db_manager.confirmar(conn, lambda: self.invalidar(*chaves) if chaves else None)
+
+    def estatisticas(self) -> dict:
+        """Tamanho atual, acertos, falhas e taxa de acerto"""
+        with self._lock:
+            total = self.acertos + self.falhas
+            return {
+                'tamanho': len(self._entradas),
+                'capacidade': self.capacidade,
+                'acertos': self.acertos,
+                'falhas': self.falhas,
+                'taxa_acerto': self.acertos / total if total else 0.0
+            }
+
+# Cache global de itens por id
+cache_itens = CacheIdentidade(config.CACHE_ITENS_CAPACIDADE, db_manager.versao_dados, db_manager.escritas_itens)
+db_manager.ao_confirmar_escrita(cache_itens.escritas_locais)
@@ -0,0 +1,118 @@
+from src.core.database import db_manager
+from src.models.item import Item
+from src.models.movimentacao import Movimentacao
+from src.repositories.cache import cache_itens
+from src.repositories.item_repository import ItemRepository
+from src.repositories.movimentacao_repository import MovimentacaoRepository
+from src.utils.helpers import normalizar_texto
+from typing import List, Optional, Tuple
+
+# Linha do arquivo de origem acompanhando cada registro do bloco
+LinhaItem = Tuple[int, Item]
+LinhaMovimentacao = Tuple[int, Movimentacao]
+
+class ImportacaoRepository:
+
+    @staticmethod
+    def progresso(assinatura: str, tipo: str) -> Optional[dict]:
+        """Progresso registrado de uma importação, ou None se nunca iniciada"""
+        with db_manager.conexao() as conn:
+            row = conn.execute(
+                """SELECT linhas_confirmadas, gravadas, erros, concluida
+                FROM importacoes WHERE assinatura = ? AND tipo = ?""",
+                (assinatura, tipo)).fetchone()
+        if row is None:
+            return None
+        return {
+            'linhas_confirmadas': row[0],
+            'gravadas': row[1],
+            'erros': row[2],
+            'concluida': bool(row[3])
+        }
+
+    @staticmethod
+    def descartar_progresso(assinatura: str, tipo: str):
+        """Esquece o progresso para que o arquivo seja importado do início"""
+        with db_manager.conexao() as conn:
+            conn.execute("DELETE FROM importacoes WHERE assinatura = ? AND tipo = ?", (assinatura, tipo))
+
+    @staticmethod
+    def _registrar_progresso(cursor, assinatura: str, tipo: str, arquivo: str,
+                             ultima_linha: int, gravadas: int, erros: int, concluida: bool):
+        cursor.execute(
+            """INSERT INTO importacoes
+                (assinatura, tipo, arquivo, linhas_confirmadas, gravadas, erros, concluida, atualizado_em)
+            VALUES (?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+            ON CONFLICT (assinatura, tipo) DO UPDATE SET
+                arquivo = excluded.arquivo,
+                linhas_confirmadas = excluded.linhas_confirmadas,
+                gravadas = gravadas + excluded.gravadas,
+                erros = erros + excluded.erros,
+                concluida = excluded.concluida,
+                atualizado_em = excluded.atualizado_em""",
+            (assinatura, tipo, arquivo, ultima_linha, gravadas, erros, int(concluida)))
+
+    @staticmethod
+    def gravar_itens(itens: List[LinhaItem], assinatura: str, arquivo: str, ultima_linha: int,
+                     erros_validacao: int, concluida: bool = False) -> List[Tuple[int, str]]:
+        """Insere um bloco de itens e o progresso da importação na mesma transação
+
+        Itens cujo nome (normalizado) já existe no banco ou se repete no bloco
+        são recusados. Retorna os erros como (linha, mensagem).
+        """
+        erros = []
+        with db_manager.transacao() as conn:
+            cursor = conn.cursor()
+
+            nomes = [(linha, item, normalizar_texto(item.nome)) for linha, item in itens]
+            existentes = set()
+            distintos = sorted({nome for _, _, nome in nomes})
+            for i in range(0, len(distintos), 500):
+                bloco = distintos[i:i + 500]
+                cursor.execute(
+                    f"SELECT nome_normalizado FROM itens WHERE nome_normalizado IN ({','.join('?' * len(bloco))})",
+                    bloco)
+                existentes.update(row[0] for row in cursor.fetchall())
+
+            validos = []
+            for linha, item, nome in nomes:
+                if nome in existentes:
+                    erros.append((linha, "Item já cadastrado com este nome"))
+                    continue
+                existentes.add(nome)
+                validos.append((linha, item, nome))
+
+            ItemRepository._inserir(cursor, [item for _, item, _ in validos])
+
+            ImportacaoRepository._registrar_progresso(
+                cursor, assinatura, 'itens', arquivo, ultima_linha,
+                len(validos), erros_validacao + len(erros), concluida)
+            cache_itens.confirmar(conn)
+
+        return erros
+
+    @staticmethod
+    def gravar_movimentacoes(movimentacoes: List[LinhaMovimentacao], assinatura: str, arquivo: str,
+                             ultima_linha: int, erros_validacao: int,
+                             concluida: bool = False) -> List[Tuple[int, str]]:
+        """Aplica um bloco de movimentações e o progresso da importação na mesma transação
+
+        As linhas são simuladas na ordem do arquivo: movimentações de itens
+        inexistentes ou que deixariam o estoque negativo são recusadas e não
+        afetam as seguintes. Retorna os erros como (linha, mensagem).
+        """
+        with db_manager.transacao() as conn:
+            cursor = conn.cursor()
+
+            linhas = [linha for linha, _ in movimentacoes]
+            falhas, deltas = MovimentacaoRepository._simular_lote(cursor, [mov for _, mov in movimentacoes])
+            erros = [(linha, erro) for linha, erro in zip(linhas, falhas) if erro]
+            validas = [mov for (_, mov), erro in zip(movimentacoes, falhas) if not erro]
+            MovimentacaoRepository._gravar_lote(cursor, validas, deltas)
+
+            ImportacaoRepository._registrar_progresso(
+                cursor, assinatura, 'movimentacoes', arquivo, ultima_linha,
+                len(validas), erros_validacao + len(erros), concluida)
+            cache_itens.confirmar(conn, *deltas)
+
+        return erros
@@ -1,139 +1,240 @@
-from typing import List, Tuple, Optional
+from typing import Iterator, List, Tuple, Optional, Union
 from src.core.database import db_manager
-from src.models.item import Item
+from src.models.item import Item, ItemView
+from src.utils.helpers import normalizar_texto
+from src.repositories.mapeamento import colunas, cursor_para, em_blocos
+from src.repositories.cache import cache_itens
+from src.core.escritor import escritor
+from concurrent.futures import Future
+import sqlite3
 import logging
 
+COLUNAS = colunas(Item)
+
 class ItemRepository:
 
     # ... (outros métodos existentes)
+    @staticmethod
+    def _normalizados(item: Item) -> tuple:
+        """Nome, marca, tipo e descrição normalizados, indexados pela busca textual"""
+        return (normalizar_texto(item.nome), normalizar_texto(item.marca),
+                normalizar_texto(item.tipo), normalizar_texto(item.descricao))
+
+    @staticmethod
+    def _inserir(cursor, itens: List[Item]):
+        """INSERT dos itens novos (saldo inicial = quantidade) com os textos normalizados
+
+        Usado pelo cadastro e pela importação; roda na transação do chamador.
+        """
+        cursor.executemany(
+            """
+            INSERT INTO itens (
+                nome, marca, quantidade, saldo_inicial, unidade,
+                preco, tipo, descricao, data_validade, nome_normalizado,
+                marca_normalizada, tipo_normalizado, descricao_normalizada
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            [(item.nome, item.marca, item.quantidade, item.quantidade,
+              item.unidade, item.preco, item.tipo, item.descricao,
+              item.data_validade) + ItemRepository._normalizados(item)
+             for item in itens])
+
+    @staticmethod
+    def _gravar(cursor, item: Item) -> Optional[int]:
+        """Executa o INSERT ou UPDATE do item; retorna o id gerado em inserções"""
+        if item.id is None:  # Novo item
+            ItemRepository._inserir(cursor, [item])
+            return cursor.execute("SELECT last_insert_rowid()").fetchone()[0]
+
+        # Atualização
+        sql = """
+        UPDATE itens SET
+            nome=?, marca=?, quantidade=?, unidade=?,
+            preco=?, tipo=?, descricao=?, data_validade=?,
+            nome_normalizado=?, marca_normalizada=?, tipo_normalizado=?,
+            descricao_normalizada=?
+        WHERE id=?
+        """
+        params = (
+            item.nome, item.marca, item.quantidade,
+            item.unidade, item.preco, item.tipo,
+            item.descricao, item.data_validade
+        ) + ItemRepository._normalizados(item) + (item.id,)
+        cursor.execute(sql, params)
+        return None
+
+    @staticmethod
+    def _erro_ao_salvar(e: Exception) -> Tuple[bool, str]:
+        """Traduz a exceção de gravação na mensagem devolvida ao chamador"""
+        if isinstance(e, sqlite3.IntegrityError) and "nome_normalizado" in str(e):
+            return False, "Item já cadastrado com este nome"
+        logging.error(f"Erro ao salvar item: {e}")
+        return False, f"Erro ao salvar item: {e}"
+
     @staticmethod
     def salvar(item: Item) -> Tuple[bool, str]:
         """Salva ou atualiza um item no banco de dados"""
         try:
-            with db_manager.criar_conexao() as conn:
-                cursor = conn.cursor()
-
-                if item.id is None:  # Novo item
-                    sql = """
-                    INSERT INTO itens (
-                        nome, marca, quantidade, saldo_inicial, unidade, 
-                        preco, tipo, descricao, data_validade
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """
-                    params = (
-                        item.nome, item.marca, item.quantidade, item.quantidade,
-                        item.unidade, item.preco, item.tipo, item.descricao,
-                        item.data_validade
-                    )
-                    cursor.execute(sql, params)
-                    item.id = cursor.lastrowid
-                else:  # Atualização
-                    sql = """
-                    UPDATE itens SET
-                        nome=?, marca=?, quantidade=?, unidade=?,
-                        preco=?, tipo=?, descricao=?, data_validade=?
-                    WHERE id=?
-                    """
-                    params = (
-                        item.nome, item.marca, item.quantidade,
-                        item.unidade, item.preco, item.tipo,
-                        item.descricao, item.data_validade, item.id
-                    )
-                    cursor.execute(sql, params)
-
-                conn.commit()
+            with db_manager.transacao() as conn:
+                novo_id = ItemRepository._gravar(conn.cursor(), item)
+                cache_itens.confirmar(conn, item.id if novo_id is None else novo_id)
+                if novo_id is not None:
+                    item.id = novo_id
                 return True, "Item salvo com sucesso"
 
         except Exception as e:
-            logging.error(f"Erro ao salvar item: {e}")
-            return False, f"Erro ao salvar item: {e}"
+            return ItemRepository._erro_ao_salvar(e)
+
+    @staticmethod
+    def submeter_salvar(item: Item) -> Future:
+        """Enfileira o salvamento no escritor dedicado; o Future resolve com (sucesso, mensagem)"""
+        gerado = {}
+
+        def operacao(conn) -> Tuple[bool, str]:
+            try:
+                gerado['id'] = ItemRepository._gravar(conn.cursor(), item)
+                return True, "Item salvo com sucesso"
+            except Exception as e:
+                return ItemRepository._erro_ao_salvar(e)
+
+        def apos_commit():
+            if gerado.get('id') is not None:
+                item.id = gerado['id']
+            cache_itens.invalidar(item.id)
+
+        return escritor.submeter(operacao, apos_commit)
 
     @staticmethod
     def buscar_por_id(item_id: int) -> Optional[Item]:
-        """Busca um item pelo ID"""
-        sql = "SELECT * FROM itens WHERE id = ?"
+        """Busca um item pelo ID, consultando antes o cache de itens"""
+        sql = f"SELECT {COLUNAS} FROM itens WHERE id = ?"
         try:
-            with db_manager.criar_conexao() as conn:
-                cursor = conn.cursor()
+            item = cache_itens.obter(item_id)
+            if item is not None:
+                return item
+
+            marca = cache_itens.marca()
+            with db_manager.conexao() as conn:
+                cursor = cursor_para(conn, Item)
                 cursor.execute(sql, (item_id,))
-                row = cursor.fetchone()
-                if row:
-                    return Item(
-                        id=row[0], nome=row[1], marca=row[2],
-                        quantidade=row[3], saldo_inicial=row[4],
-                        unidade=row[5], preco=row[6], tipo=row[7],
-                        descricao=row[8], data_validade=row[9]
-                    )
-                return None
+                item = cursor.fetchone()
+                if item is not None:
+                    cache_itens.guardar(item_id, item, marca)
+                return item
         except Exception as e:
             logging.error(f"Erro ao buscar item: {e}")
             return None
 
+    @staticmethod
+    def estatisticas_cache() -> dict:
+        """Acertos, falhas e ocupação do cache de itens por id"""
+        return cache_itens.estatisticas()
+
     @staticmethod
     def buscar_por_nome(nome: str) -> List[Item]:
-        """Busca itens onde o nome contém a string fornecida (case-insensitive)"""
-        sql = "SELECT * FROM itens WHERE LOWER(nome) LIKE LOWER(?) ORDER BY nome"
+        """Busca itens pelo texto no nome, marca, tipo ou descrição, ignorando acentos
+
+        Termos com 3 ou mais caracteres usam o índice FTS5 de trigramas e o
+        resultado é ordenado por relevância (o nome pesa mais). Termos curtos
+        caem para uma busca por substring no nome normalizado.
+        """
+        termo = normalizar_texto(nome)
+        if len(termo) >= 3:
+            sql = f"""
+            SELECT {colunas(Item, 'i')} FROM itens_fts f
+            JOIN itens i ON i.id = f.rowid
+            WHERE itens_fts MATCH ?
+            ORDER BY bm25(itens_fts, 10.0, 2.0, 2.0, 1.0), i.nome
+            """
+            params = ('"' + termo.replace('"', '""') + '"',)
+        else:
+            sql = f"SELECT {COLUNAS} FROM itens WHERE nome_normalizado LIKE ? ESCAPE '\\' ORDER BY nome"
+            escapado = termo.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+            params = (f"%{escapado}%",)
         try:
-            with db_manager.criar_conexao() as conn:
-                cursor = conn.cursor()
-                cursor.execute(sql, (f"%{nome}%",))
-                return [ItemRepository._row_to_item(row) for row in cursor.fetchall()]
+            with db_manager.conexao() as conn:
+                cursor = cursor_para(conn, Item)
+                cursor.execute(sql, params)
+                return cursor.fetchall()
         except Exception as e:
             logging.error(f"Erro ao buscar itens: {e}")
             return []
 
+    @staticmethod
+    def existe_nome(nome: str) -> bool:
+        """Verifica se já existe item com o mesmo nome normalizado (sem acentos/maiúsculas)"""
+        sql = "SELECT 1 FROM itens WHERE nome_normalizado = ? LIMIT 1"
+        try:
+            with db_manager.conexao() as conn:
+                cursor = conn.cursor()
+                cursor.execute(sql, (normalizar_texto(nome),))
+                return cursor.fetchone() is not None
+        except Exception as e:
+            logging.error(f"Erro ao verificar nome do item: {e}")
+            return False
+
     @staticmethod
     def remover(item_id: int) -> Tuple[bool, str]:
         """Remove um item pelo ID"""
         sql = "DELETE FROM itens WHERE id = ?"
         try:
-            with db_manager.criar_conexao() as conn:
+            with db_manager.transacao() as conn:
                 cursor = conn.cursor()
                 cursor.execute(sql, (item_id,))
-                conn.commit()
+                cache_itens.confirmar(conn, item_id)
                 return (True, "Item removido com sucesso") if cursor.rowcount > 0 else (False, "Item não encontrado")
         except Exception as e:
             logging.error(f"Erro ao remover item: {e}")
             return False, f"Erro ao remover item: {e}"
 
     @staticmethod
-    def _row_to_item(row) -> Item:
-        """Converte uma linha do banco para objeto Item"""
-        return Item(
-            id=row[0],
-            nome=row[1],
-            marca=row[2],
-            quantidade=row[3],
-            saldo_inicial=row[4],
-            unidade=row[5],
-            preco=row[6],
-            tipo=row[7],
-            descricao=row[8],
-            data_validade=row[9]
-        )
+    def iter_todos(tamanho_lote: int = 500, visao: bool = False) -> Iterator[Union[Item, ItemView]]:
+        """Percorre todos os itens ordenados por nome sem carregar todos em memória
+
+        Com visao=True entrega ItemView (tuplas nomeadas) em vez de Item.
+        Erros são propagados para que quem consome em fluxo saiba que a
+        leitura ficou incompleta.
+        """
+        sql = f"SELECT {COLUNAS} FROM itens ORDER BY nome, id"
+        with db_manager.conexao() as conn:
+            cursor = cursor_para(conn, Item, visao)
+            cursor.execute(sql)
+            yield from em_blocos(cursor, tamanho_lote, Item, visao)
 
     @staticmethod
     def listar_todos() -> List[Item]:
         """Lista todos os itens cadastrados ordenados por nome"""
-        sql = "SELECT * FROM itens ORDER BY nome"
         try:
-            with db_manager.criar_conexao() as conn:
-                cursor = conn.cursor()
-                cursor.execute(sql)
-                return [
-                    Item(
-                        id=row[0],
-                        nome=row[1],
-                        marca=row[2],
-                        quantidade=row[3],
-                        saldo_inicial=row[4],
-                        unidade=row[5],
-                        preco=float(row[6]),  # Garante conversão para float
-                        tipo=row[7],
-                        descricao=row[8],
-                        data_validade=row[9]
-                    ) for row in cursor.fetchall()
-                ]
+            return list(ItemRepository.iter_todos())
+        except Exception as e:
+            logging.error(f"Erro ao listar itens: {e}")
+            return []
+
+    @staticmethod
+    def listar_pagina(limite: int = 20, apos: Optional[Tuple[str, int]] = None,
+                      antes: Optional[Tuple[str, int]] = None) -> List[Item]:
+        """Retorna uma página de itens ordenados por nome usando paginação por chave
+
+        'apos' e 'antes' são a chave (nome, id) do último/primeiro item da
+        página atual, de modo que só as linhas da página são lidas.
+        """
+        if apos is not None:
+            sql = f"SELECT {COLUNAS} FROM itens WHERE (nome, id) > (?, ?) ORDER BY nome, id LIMIT ?"
+            params = (*apos, limite)
+        elif antes is not None:
+            sql = f"SELECT {COLUNAS} FROM itens WHERE (nome, id) < (?, ?) ORDER BY nome DESC, id DESC LIMIT ?"
+            params = (*antes, limite)
+        else:
+            sql = f"SELECT {COLUNAS} FROM itens ORDER BY nome, id LIMIT ?"
+            params = (limite,)
+        try:
+            with db_manager.conexao() as conn:
+                cursor = cursor_para(conn, Item)
+                cursor.execute(sql, params)
+                pagina = cursor.fetchall()
+                if antes is not None:
+                    pagina.reverse()
+                return pagina
         except Exception as e:
             logging.error(f"Erro ao listar itens: {e}")
             return []
@@ -141,29 +242,42 @@ class ItemRepository:
     @staticmethod
     def itens_prox_validade(dias: int) -> List[Item]:
         """Busca itens que expiram dentro de 'dias' dias"""
-        sql = """
-        SELECT * FROM itens 
+        sql = f"""
+        SELECT {COLUNAS} FROM itens 
         WHERE data_validade BETWEEN date('now') AND date('now', ? || ' days')
         ORDER BY data_validade
         """
         try:
-            with db_manager.criar_conexao() as conn:
-                cursor = conn.cursor()
+            with db_manager.conexao() as conn:
+                cursor = cursor_para(conn, Item)
                 cursor.execute(sql, (str(dias),))
-                return [ItemRepository._row_to_item(row) for row in cursor.fetchall()]
+                return cursor.fetchall()
         except Exception as e:
             logging.error(f"Erro ao buscar itens próximos da validade: {e}")
             return []
 
+    @staticmethod
+    def itens_estoque_baixo(minimo: int) -> List[Item]:
+        """Busca itens com quantidade abaixo do mínimo informado"""
+        sql = f"SELECT {COLUNAS} FROM itens WHERE quantidade < ? ORDER BY quantidade, nome"
+        try:
+            with db_manager.conexao() as conn:
+                cursor = cursor_para(conn, Item)
+                cursor.execute(sql, (minimo,))
+                return cursor.fetchall()
+        except Exception as e:
+            logging.error(f"Erro ao buscar itens com estoque baixo: {e}")
+            return []
+
     @staticmethod
     def itens_vencidos() -> List[Item]:
         """Busca itens com data de validade expirada"""
-        sql = "SELECT * FROM itens WHERE data_validade < date('now') AND quantidade > 0"
+        sql = f"SELECT {COLUNAS} FROM itens WHERE data_validade < date('now') AND quantidade > 0"
         try:
-            with db_manager.criar_conexao() as conn:
-                cursor = conn.cursor()
+            with db_manager.conexao() as conn:
+                cursor = cursor_para(conn, Item)
                 cursor.execute(sql)
-                return [ItemRepository._row_to_item(row) for row in cursor.fetchall()]
+                return cursor.fetchall()
         except Exception as e:
             logging.error(f"Erro ao buscar itens vencidos: {e}")
             return []
\ No newline at end of file
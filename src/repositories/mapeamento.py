@@ -0,0 +1,39 @@
+import sqlite3
+from dataclasses import fields
+from typing import Callable, Dict, Iterator, Optional, Tuple
+
+from src.models.item import Item, ItemView
+from src.models.movimentacao import Movimentacao, MovimentacaoView
+
+# Mapeamento registrado por modelo: (fábrica de linha do dataclass, view em tupla).
+# As consultas selecionam as colunas na ordem dos campos, então a linha é
+# repassada posicionalmente, sem indexação nem conversões por coluna.
+_MODELOS: Dict[type, Tuple[Callable, type]] = {
+    Item: (lambda cursor, row: Item(*row), ItemView),
+    Movimentacao: (lambda cursor, row: Movimentacao(*row), MovimentacaoView),
+}
+
+def colunas(modelo: type, alias: Optional[str] = None) -> str:
+    """Lista de colunas do modelo na ordem dos campos, para usar no SELECT"""
+    prefixo = f"{alias}." if alias else ""
+    return ", ".join(f"{prefixo}{campo.name}" for campo in fields(modelo))
+
+def cursor_para(conn: sqlite3.Connection, modelo: type, visao: bool = False) -> sqlite3.Cursor:
+    """Cria um cursor cujas linhas já saem como instâncias do modelo
+
+    No modo visão o cursor entrega as tuplas cruas do sqlite3; use em_blocos
+    para convertê-las em views sem construir dataclasses.
+    """
+    cursor = conn.cursor()
+    if not visao:
+        cursor.row_factory = _MODELOS[modelo][0]
+    return cursor
+
+def em_blocos(cursor: sqlite3.Cursor, tamanho_lote: int, modelo: type, visao: bool = False) -> Iterator:
+    """Lê o cursor com fetchmany, convertendo cada bloco em views quando visao=True"""
+    converter = _MODELOS[modelo][1]._make if visao else None
+    while True:
+        rows = cursor.fetchmany(tamanho_lote)
+        if not rows:
+            break
+        yield from (map(converter, rows) if converter else rows)
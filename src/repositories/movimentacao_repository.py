@@ -1,123 +1,490 @@
 from src.core.database import db_manager
-from src.models.movimentacao import Movimentacao
-from typing import List, Tuple, Optional
+from src.models.movimentacao import Movimentacao, MovimentacaoView
+from src.repositories.mapeamento import colunas, cursor_para, em_blocos
+from src.repositories.cache import cache_itens
+from src.core.escritor import escritor
+from src.utils.helpers import de_timestamp, limites_periodo, para_timestamp
+from concurrent.futures import Future
+from typing import Dict, Iterator, List, Tuple, Optional, Union
+from datetime import datetime
 import logging
 
+COLUNAS = colunas(Movimentacao)
+
 class MovimentacaoRepository:
+    @staticmethod
+    def _aplicar(cursor, movimentacao: Movimentacao) -> Tuple[bool, str]:
+        """Atualiza o estoque e insere a movimentação, sem confirmar a transação
+
+        Saídas usam um único UPDATE condicional (quantidade >= pedido), de modo
+        que a checagem de estoque e a baixa acontecem atomicamente na mesma
+        transação do INSERT. Em caso de falha nada é alterado.
+        """
+        # Atualiza estoque
+        if movimentacao.tipo == 'entrada':
+            cursor.execute(
+                "UPDATE itens SET quantidade = quantidade + ? WHERE id = ?",
+                (movimentacao.quantidade, movimentacao.item_id))
+        else:
+            cursor.execute(
+                "UPDATE itens SET quantidade = quantidade - ? WHERE id = ? AND quantidade >= ?",
+                (movimentacao.quantidade, movimentacao.item_id, movimentacao.quantidade))
+
+        if cursor.rowcount == 0:
+            # Só no caminho de falha é preciso descobrir o motivo
+            cursor.execute("SELECT quantidade FROM itens WHERE id = ?", (movimentacao.item_id,))
+            row = cursor.fetchone()
+            if row is None:
+                return False, "Item não encontrado"
+            return False, f"Estoque insuficiente (disponível: {row[0]})"
+
+        # Insere movimentação
+        cursor.execute(
+            """INSERT INTO movimentacoes 
+            (item_id, tipo, quantidade, data, responsavel, motivo)
+            VALUES (?, ?, ?, ?, ?, ?)""",
+            (movimentacao.item_id, movimentacao.tipo,
+             movimentacao.quantidade, movimentacao.data,
+             movimentacao.responsavel, movimentacao.motivo))
+
+        movimentacao.id = cursor.lastrowid
+        return True, "Movimentação registrada com sucesso"
+
     @staticmethod
     def registrar(movimentacao: Movimentacao) -> Tuple[bool, str]:
-        """Registra uma movimentação e atualiza o estoque"""
+        """Registra uma movimentação e atualiza o estoque em uma transação de escrita"""
+        try:
+            with db_manager.transacao() as conn:
+                sucesso, mensagem = MovimentacaoRepository._aplicar(conn.cursor(), movimentacao)
+                if not sucesso:
+                    conn.rollback()
+                    return sucesso, mensagem
+
+                cache_itens.confirmar(conn, movimentacao.item_id)
+                return sucesso, mensagem
+
+        except Exception as e:
+            logging.error(f"Erro ao registrar movimentação: {e}")
+            return False, f"Erro ao registrar movimentação: {e}"
+
+    @staticmethod
+    def submeter(movimentacao: Movimentacao) -> Future:
+        """Enfileira a movimentação no escritor dedicado (commit em grupo)
+
+        O Future resolve com o mesmo (sucesso, mensagem) de registrar().
+        """
+        def operacao(conn) -> Tuple[bool, str]:
+            try:
+                return MovimentacaoRepository._aplicar(conn.cursor(), movimentacao)
+            except Exception as e:
+                logging.error(f"Erro ao registrar movimentação: {e}")
+                return False, f"Erro ao registrar movimentação: {e}"
+
+        return escritor.submeter(operacao, lambda: cache_itens.invalidar(movimentacao.item_id))
+
+    @staticmethod
+    def _simular_lote(cursor, movimentacoes: List[Movimentacao]) -> Tuple[List[Optional[str]], Dict[int, int]]:
+        """Simula o lote na ordem recebida sobre o estoque atual
+
+        Retorna, por linha, o erro (item inexistente ou saída maior que o
+        estoque) ou None, e os deltas de estoque por item somando só as
+        linhas válidas; uma linha recusada não afeta as seguintes.
+        """
+        # Estoque atual dos itens envolvidos (em blocos por causa do limite de parâmetros)
+        ids = sorted({mov.item_id for mov in movimentacoes})
+        saldos = {}
+        for i in range(0, len(ids), 500):
+            bloco = ids[i:i + 500]
+            cursor.execute(
+                f"SELECT id, quantidade FROM itens WHERE id IN ({','.join('?' * len(bloco))})",
+                bloco)
+            saldos.update(cursor.fetchall())
+
+        erros: List[Optional[str]] = []
+        deltas: Dict[int, int] = {}
+        for mov in movimentacoes:
+            if mov.item_id not in saldos:
+                erros.append("Item não encontrado")
+                continue
+            delta = mov.quantidade if mov.tipo == 'entrada' else -mov.quantidade
+            if saldos[mov.item_id] + delta < 0:
+                erros.append(f"Estoque insuficiente (disponível: {saldos[mov.item_id]})")
+                continue
+            saldos[mov.item_id] += delta
+            deltas[mov.item_id] = deltas.get(mov.item_id, 0) + delta
+            erros.append(None)
+        return erros, deltas
+
+    @staticmethod
+    def _gravar_lote(cursor, movimentacoes: List[Movimentacao], deltas: Dict[int, int]):
+        """Aplica os deltas de estoque e insere as movimentações já validadas
+
+        Deve rodar numa transação de escrita já aberta (o chamador confirma).
+        Os ids gerados são atribuídos às movimentações.
+        """
+        cursor.executemany(
+            "UPDATE itens SET quantidade = quantidade + ? WHERE id = ?",
+            [(delta, item_id) for item_id, delta in deltas.items() if delta])
+
+        cursor.executemany(
+            """INSERT INTO movimentacoes
+            (item_id, tipo, quantidade, data, responsavel, motivo)
+            VALUES (?, ?, ?, ?, ?, ?)""",
+            [(mov.item_id, mov.tipo, mov.quantidade, mov.data,
+              mov.responsavel, mov.motivo) for mov in movimentacoes])
+
+        if movimentacoes:
+            # Com o lock de escrita e AUTOINCREMENT os ids do lote são consecutivos
+            ultimo_id = cursor.execute("SELECT last_insert_rowid()").fetchone()[0]
+            primeiro_id = ultimo_id - len(movimentacoes) + 1
+            for deslocamento, mov in enumerate(movimentacoes):
+                mov.id = primeiro_id + deslocamento
+
+    @staticmethod
+    def registrar_lote(movimentacoes: List[Movimentacao]) -> List[Tuple[bool, str]]:
+        """Registra um lote de movimentações em uma única transação (tudo ou nada)
+
+        Os deltas de estoque são agregados por item e aplicados de uma vez. Se
+        algum item não existir ou alguma saída deixar o estoque negativo, nada
+        é gravado e o resultado indica quais linhas falharam.
+        """
+        if not movimentacoes:
+            return []
+
         try:
-            with db_manager.criar_conexao() as conn:
+            with db_manager.transacao() as conn:
                 cursor = conn.cursor()
+                erros, deltas = MovimentacaoRepository._simular_lote(cursor, movimentacoes)
 
-                # Atualiza estoque
-                if movimentacao.tipo == 'entrada':
-                    cursor.execute(
-                        "UPDATE itens SET quantidade = quantidade + ? WHERE id = ?",
-                        (movimentacao.quantidade, movimentacao.item_id))
-                else:
-                    cursor.execute(
-                        "UPDATE itens SET quantidade = quantidade - ? WHERE id = ?",
-                        (movimentacao.quantidade, movimentacao.item_id))
+                if any(erros):
+                    conn.rollback()
+                    return [
+                        (False, erro) if erro
+                        else (False, "Lote não registrado devido a erros em outras linhas")
+                        for erro in erros
+                    ]
+
+                MovimentacaoRepository._gravar_lote(cursor, movimentacoes, deltas)
+                cache_itens.confirmar(conn, *deltas)
+                return [(True, "Movimentação registrada com sucesso")] * len(movimentacoes)
+
+        except Exception as e:
+            logging.error(f"Erro ao registrar lote de movimentações: {e}")
+            return [(False, f"Erro ao registrar lote de movimentações: {e}")] * len(movimentacoes)
+
+    @staticmethod
+    def baixar_vencidos(data: str, responsavel: str, motivo: str,
+                        desde: Optional[str] = None) -> Tuple[bool, str, List[Tuple[int, str, int]]]:
+        """Zera o estoque de todos os itens vencidos em uma única transação
+
+        Registra uma saída por item com INSERT ... SELECT e zera as quantidades
+        com um único UPDATE sobre o mesmo conjunto. Com 'desde' (AAAA-MM-DD),
+        só considera itens com validade a partir dessa data, numa faixa do
+        índice de validade. Retorna também os itens afetados como
+        (id, nome, quantidade baixada).
+        """
+        hoje = data[:10]
+        condicao = "data_validade < ? AND quantidade > 0"
+        parametros = (hoje,)
+        if desde:
+            condicao = "data_validade >= ? AND " + condicao
+            parametros = (desde, hoje)
+        itens = []
+        try:
+            with db_manager.transacao() as conn:
+                cursor = conn.cursor()
+
+                cursor.execute(f"SELECT id, nome, quantidade FROM itens WHERE {condicao}", parametros)
+                itens = cursor.fetchall()
+                if not itens:
+                    conn.rollback()
+                    return True, "Nenhum item vencido", []
 
-                # Insere movimentação
                 cursor.execute(
-                    """INSERT INTO movimentacoes 
+                    f"""INSERT INTO movimentacoes 
                     (item_id, tipo, quantidade, data, responsavel, motivo)
-                    VALUES (?, ?, ?, ?, ?, ?)""",
-                    (movimentacao.item_id, movimentacao.tipo,
-                     movimentacao.quantidade, movimentacao.data,
-                     movimentacao.responsavel, movimentacao.motivo))
+                    SELECT id, 'saída', quantidade, ?, ?, ?
+                    FROM itens WHERE {condicao}""",
+                    (data, responsavel, motivo) + parametros)
 
-                movimentacao.id = cursor.lastrowid
-                conn.commit()
-                return True, "Movimentação registrada com sucesso"
+                cursor.execute(f"UPDATE itens SET quantidade = 0 WHERE {condicao}", parametros)
+
+                cache_itens.confirmar(conn, *(item_id for item_id, _, _ in itens))
+                return True, "Movimentação registrada com sucesso", itens
 
         except Exception as e:
-            logging.error(f"Erro ao registrar movimentação: {e}")
-            return False, f"Erro ao registrar movimentação: {e}"
+            logging.error(f"Erro ao baixar itens vencidos: {e}")
+            return False, f"Erro ao registrar movimentação: {e}", itens
 
     @staticmethod
-    def listar_todas(data_inicio: Optional[str] = None, data_fim: Optional[str] = None) -> List[Movimentacao]:
-        """Lista todas as movimentações com filtro por período"""
-        sql = """
-        SELECT id, item_id, tipo, quantidade, data, responsavel, motivo
-        FROM movimentacoes
+    def _filtros(item_id: Optional[int] = None, data_inicio: Optional[str] = None,
+                 data_fim: Optional[str] = None) -> Tuple[List[str], list]:
+        """Monta as condições de item e período usadas nas listagens
+
+        O período é o intervalo semiaberto [início, fim) em data_ts, com a
+        data final incluída por inteiro, e vira uma faixa no índice.
         """
+        conditions = []
         params = []
+        if item_id is not None:
+            conditions.append("item_id = ?")
+            params.append(item_id)
+        inicio, fim = limites_periodo(data_inicio, data_fim)
+        if inicio is not None:
+            conditions.append("data_ts >= ?")
+            params.append(inicio)
+        if fim is not None:
+            conditions.append("data_ts < ?")
+            params.append(fim)
+        return conditions, params
 
-        # Adiciona filtro de data se fornecido
-        if data_inicio or data_fim:
-            sql += " WHERE "
-            conditions = []
-            if data_inicio:
-                conditions.append("data >= ?")
-                params.append(data_inicio)
-            if data_fim:
-                conditions.append("data <= ?")
-                params.append(data_fim)
-            sql += " AND ".join(conditions)
+    @staticmethod
+    def _iterar(sql: str, params: list, tamanho_lote: int, visao: bool = False) -> Iterator[Union[Movimentacao, MovimentacaoView]]:
+        """Executa a consulta e entrega as movimentações em blocos de 'tamanho_lote' linhas
 
-        sql += " ORDER BY data DESC"
+        Erros são propagados para que quem consome em fluxo (API, exportação)
+        saiba que o resultado ficou incompleto; as listas usam _listar.
+        """
+        with db_manager.conexao() as conn:
+            cursor = cursor_para(conn, Movimentacao, visao)
+            cursor.execute(sql, params)
+            yield from em_blocos(cursor, tamanho_lote, Movimentacao, visao)
 
+    @staticmethod
+    def _listar(movimentacoes: Iterator[Movimentacao]) -> List[Movimentacao]:
+        """Materializa o iterador; um erro de leitura é registrado e resulta em lista vazia"""
         try:
-            with db_manager.criar_conexao() as conn:
-                cursor = conn.cursor()
-                cursor.execute(sql, params)
-                return [
-                    Movimentacao(
-                        id=row[0],
-                        item_id=row[1],
-                        tipo=row[2],
-                        quantidade=row[3],
-                        data=row[4],
-                        responsavel=row[5],
-                        motivo=row[6]
-                    ) for row in cursor.fetchall()
-                ]
+            return list(movimentacoes)
         except Exception as e:
             logging.error(f"Erro ao listar movimentações: {e}")
             return []
 
+    @staticmethod
+    def iter_todas(data_inicio: Optional[str] = None, data_fim: Optional[str] = None,
+                   tamanho_lote: int = 500, visao: bool = False) -> Iterator[Union[Movimentacao, MovimentacaoView]]:
+        """Percorre as movimentações do período sem carregar todas em memória
+
+        Com visao=True entrega MovimentacaoView (tuplas nomeadas) em vez de Movimentacao.
+        """
+        conditions, params = MovimentacaoRepository._filtros(None, data_inicio, data_fim)
+        sql = f"""
+        SELECT {COLUNAS}
+        FROM movimentacoes
+        """
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY data_ts DESC, id DESC"
+
+        return MovimentacaoRepository._iterar(sql, params, tamanho_lote, visao)
+
+    @staticmethod
+    def iter_por_item(item_id: int, data_inicio: Optional[str] = None, data_fim: Optional[str] = None,
+                      tamanho_lote: int = 500, visao: bool = False) -> Iterator[Union[Movimentacao, MovimentacaoView]]:
+        """Percorre as movimentações de um item sem carregar todas em memória"""
+        conditions, params = MovimentacaoRepository._filtros(item_id, data_inicio, data_fim)
+        sql = f"""
+        SELECT {COLUNAS}
+        FROM movimentacoes
+        WHERE {" AND ".join(conditions)}
+        ORDER BY data_ts DESC, id DESC
+        """
+
+        return MovimentacaoRepository._iterar(sql, params, tamanho_lote, visao)
+
+    @staticmethod
+    def listar_todas(data_inicio: Optional[str] = None, data_fim: Optional[str] = None) -> List[Movimentacao]:
+        """Lista todas as movimentações com filtro por período"""
+        return MovimentacaoRepository._listar(MovimentacaoRepository.iter_todas(data_inicio, data_fim))
+
     @staticmethod
     def listar_por_item(item_id: int, data_inicio: Optional[str] = None, data_fim: Optional[str] = None) -> List[Movimentacao]:
         """Lista movimentações de um item com filtro por período"""
+        return MovimentacaoRepository._listar(MovimentacaoRepository.iter_por_item(item_id, data_inicio, data_fim))
+
+    @staticmethod
+    def listar_pagina(limite: int = 20, apos: Optional[Tuple[str, int]] = None,
+                      antes: Optional[Tuple[str, int]] = None, item_id: Optional[int] = None,
+                      data_inicio: Optional[str] = None, data_fim: Optional[str] = None) -> List[Movimentacao]:
+        """Retorna uma página de movimentações (mais recentes primeiro) por paginação de chave
+
+        'apos' e 'antes' são a chave (data, id) da última/primeira movimentação
+        da página atual; a consulta parte direto dessa posição no índice em vez
+        de usar OFFSET.
+        """
+        conditions, params = MovimentacaoRepository._filtros(item_id, data_inicio, data_fim)
+        ordem = "data_ts DESC, id DESC"
+        if apos is not None:
+            conditions.append("(data_ts, id) < (?, ?)")
+            params.extend((para_timestamp(apos[0]), apos[1]))
+        elif antes is not None:
+            conditions.append("(data_ts, id) > (?, ?)")
+            params.extend((para_timestamp(antes[0]), antes[1]))
+            ordem = "data_ts, id"
+
+        sql = f"""
+        SELECT {COLUNAS}
+        FROM movimentacoes
+        """
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += f" ORDER BY {ordem} LIMIT ?"
+        params.append(limite)
+
+        pagina = MovimentacaoRepository._listar(MovimentacaoRepository._iterar(sql, params, limite))
+        if antes is not None:
+            pagina.reverse()
+        return pagina
+
+    @staticmethod
+    def _saldo_ate(cursor, item_id: int, limite: Optional[int]) -> Optional[int]:
+        """Saldo do item considerando as movimentações antes de 'limite' (data_ts)
+
+        Parte do checkpoint mais próximo anterior ao limite e soma apenas as
+        movimentações posteriores a ele. Sem limite, retorna o saldo atual.
+        """
+        limite_data = de_timestamp(limite) if limite is not None else None
+        cursor.execute(
+            """SELECT i.saldo_inicial, cp.data, cp.saldo
+            FROM itens i
+            LEFT JOIN saldos_checkpoint cp ON cp.item_id = i.id AND cp.data = (
+                SELECT MAX(data) FROM saldos_checkpoint
+                WHERE item_id = i.id AND (? IS NULL OR data <= ?)
+            )
+            WHERE i.id = ?""",
+            (limite_data, limite_data, item_id))
+        row = cursor.fetchone()
+        if not row:
+            return None
+        saldo_inicial, data_checkpoint, saldo_checkpoint = row
+
         sql = """
-        SELECT id, item_id, tipo, quantidade, data, responsavel, motivo
+        SELECT COALESCE(SUM(CASE WHEN tipo = 'entrada' THEN quantidade ELSE -quantidade END), 0)
         FROM movimentacoes
         WHERE item_id = ?
         """
         params = [item_id]
+        if data_checkpoint is not None:
+            sql += " AND data_ts >= ?"
+            params.append(para_timestamp(data_checkpoint))
+        if limite is not None:
+            sql += " AND data_ts < ?"
+            params.append(limite)
+        cursor.execute(sql, params)
+        delta = cursor.fetchone()[0]
 
-        # Adiciona filtro de data se fornecido
-        if data_inicio or data_fim:
-            if data_inicio:
-                sql += " AND data >= ?"
-                params.append(data_inicio)
-            if data_fim:
-                sql += " AND data <= ?"
-                params.append(data_fim)
+        base = saldo_checkpoint if data_checkpoint is not None else saldo_inicial
+        return base + delta
 
-        sql += " ORDER BY data DESC"
+    @staticmethod
+    def saldos_periodo(item_id: int, data_inicio: Optional[str] = None, data_fim: Optional[str] = None) -> Optional[Tuple[int, int]]:
+        """Retorna (saldo inicial, saldo final) do item no período, ou None se o item não existir
 
+        O saldo final inclui todo o dia 'data_fim'.
+        """
+        inicio, fim = limites_periodo(data_inicio, data_fim)
         try:
-            with db_manager.criar_conexao() as conn:
+            with db_manager.conexao() as conn:
                 cursor = conn.cursor()
-                cursor.execute(sql, params)
-                return [
-                    Movimentacao(
-                        id=row[0],
-                        item_id=row[1],
-                        tipo=row[2],
-                        quantidade=row[3],
-                        data=row[4],
-                        responsavel=row[5],
-                        motivo=row[6]
-                    ) for row in cursor.fetchall()
-                ]
+                if inicio is not None:
+                    saldo_inicial = MovimentacaoRepository._saldo_ate(cursor, item_id, inicio)
+                else:
+                    cursor.execute("SELECT saldo_inicial FROM itens WHERE id = ?", (item_id,))
+                    row = cursor.fetchone()
+                    saldo_inicial = row[0] if row else None
+                if saldo_inicial is None:
+                    return None
+
+                saldo_final = MovimentacaoRepository._saldo_ate(cursor, item_id, fim)
+                return saldo_inicial, saldo_final
         except Exception as e:
-            logging.error(f"Erro ao listar movimentações: {e}")
-            return []
+            logging.error(f"Erro ao calcular saldos: {e}")
+            return None
+
+    @staticmethod
+    def atualizar_checkpoints(item_id: Optional[int] = None, ate: Optional[str] = None) -> int:
+        """Grava checkpoints mensais de saldo a partir do último existente
+
+        O checkpoint do dia 'AAAA-MM-01' guarda o saldo antes das movimentações
+        daquele mês e só é criado após meses com movimentação. Cada novo
+        checkpoint é derivado do anterior somando apenas as movimentações do
+        intervalo. Retorna a quantidade de checkpoints gravados.
+        """
+        ate = ate or datetime.now().strftime("%Y-%m-01")
+        ate_ts = para_timestamp(ate)
+        gravados = 0
+        try:
+            with db_manager.conexao() as conn:
+                cursor = conn.cursor()
+                if item_id is None:
+                    # Apenas itens com movimentações desde o seu último checkpoint
+                    cursor.execute(
+                        """SELECT i.id FROM itens i
+                        WHERE EXISTS (
+                            SELECT 1 FROM movimentacoes m
+                            WHERE m.item_id = i.id AND m.data_ts < ? AND m.data_ts >= COALESCE(
+                                (SELECT CAST(strftime('%s', MAX(data)) AS INTEGER)
+                                 FROM saldos_checkpoint WHERE item_id = i.id), -1 << 62)
+                        )""",
+                        (ate_ts,))
+                    item_ids = [row[0] for row in cursor.fetchall()]
+                else:
+                    item_ids = [item_id]
+
+                for atual in item_ids:
+                    # Uma transação curta por item para não segurar o lock de escrita
+                    conn.commit()
+                    cursor.execute("BEGIN IMMEDIATE")
+                    cursor.execute(
+                        """SELECT i.saldo_inicial, cp.data, cp.saldo
+                        FROM itens i
+                        LEFT JOIN saldos_checkpoint cp ON cp.item_id = i.id AND cp.data = (
+                            SELECT MAX(data) FROM saldos_checkpoint WHERE item_id = i.id
+                        )
+                        WHERE i.id = ?""",
+                        (atual,))
+                    row = cursor.fetchone()
+                    if not row:
+                        continue
+                    saldo_inicial, desde, saldo = row
+
+                    if desde is None:
+                        cursor.execute(
+                            "SELECT MIN(data_ts) FROM movimentacoes WHERE item_id = ?", (atual,))
+                        primeira = cursor.fetchone()[0]
+                        if primeira is None:
+                            continue
+                        desde, saldo = f"{de_timestamp(primeira)[:7]}-01", saldo_inicial
+                    if desde >= ate:
+                        continue
+
+                    # Variação líquida por mês entre o último checkpoint e 'ate'
+                    cursor.execute(
+                        """SELECT strftime('%Y-%m', data_ts, 'unixepoch') AS mes,
+                            SUM(CASE WHEN tipo = 'entrada' THEN quantidade ELSE -quantidade END)
+                        FROM movimentacoes
+                        WHERE item_id = ? AND data_ts >= ? AND data_ts < ?
+                        GROUP BY mes""",
+                        (atual, para_timestamp(desde), ate_ts))
+                    variacoes = dict(cursor.fetchall())
+
+                    # Um checkpoint no início do mês seguinte a cada mês com movimentações
+                    novos = []
+                    for mes in sorted(variacoes):
+                        saldo += variacoes[mes]
+                        ano, numero_mes = int(mes[:4]), int(mes[5:7])
+                        proximo = f"{ano + numero_mes // 12:04d}-{numero_mes % 12 + 1:02d}-01"
+                        if proximo <= ate:
+                            novos.append((atual, proximo, saldo))
+
+                    cursor.executemany(
+                        "INSERT OR REPLACE INTO saldos_checkpoint (item_id, data, saldo) VALUES (?, ?, ?)",
+                        novos)
+                    gravados += len(novos)
+
+                conn.commit()
+                return gravados
+        except Exception as e:
+            logging.error(f"Erro ao atualizar checkpoints de saldo: {e}")
+            return gravados
 
     # ... (implementar outros métodos: listar_todas, filtrar_por_data, etc.)
\ No newline at end of file
@@ -0,0 +1,255 @@
+from src.core.database import db_manager
+from src.utils.helpers import limites_periodo
+from typing import Iterator, List, Optional
+import logging
+
+# Colunas das consultas em fluxo usadas na exportação, na ordem do SELECT
+COLUNAS_VALIDADE = ('id', 'nome', 'tipo', 'quantidade', 'unidade', 'data_validade', 'dias_restantes')
+COLUNAS_ESTOQUE_BAIXO = ('id', 'nome', 'tipo', 'quantidade', 'unidade', 'preco')
+COLUNAS_RESUMO = ('item_id', 'nome', 'unidade', 'movimentacoes', 'entradas', 'saidas', 'saldo')
+COLUNAS_DETALHADAS = ('id', 'item_id', 'nome', 'tipo', 'quantidade', 'data', 'responsavel', 'motivo')
+COLUNAS_HISTORICO = ('id', 'data', 'tipo', 'quantidade', 'responsavel', 'motivo')
+COLUNAS_PREVISAO = ('item_id', 'nome', 'unidade', 'estoque', 'consumo_medio', 'consumo_recente',
+                    'consumo_pico', 'desvio_padrao', 'dias_cobertura', 'data_ruptura', 'estoque_seguranca',
+                    'ponto_reposicao', 'repor')
+COLUNAS_ABC = ('posicao', 'id', 'nome', 'tipo', 'quantidade', 'preco', 'valor',
+               'percentual', 'percentual_acumulado', 'classe')
+
+CRITERIOS_ABC = ('estoque', 'consumo')
+
+class RelatorioRepository:
+    @staticmethod
+    def _filtro_periodo(data_inicio: Optional[str], data_fim: Optional[str]):
+        """Monta a cláusula WHERE do período [início, fim) sobre movimentacoes (alias m)
+
+        A data final é incluída por inteiro; o filtro é uma faixa em data_ts.
+        """
+        conditions = []
+        params = []
+        inicio, fim = limites_periodo(data_inicio, data_fim)
+        if inicio is not None:
+            conditions.append("m.data_ts >= ?")
+            params.append(inicio)
+        if fim is not None:
+            conditions.append("m.data_ts < ?")
+            params.append(fim)
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        return where, params
+
+    @staticmethod
+    def resumo_movimentacoes(data_inicio: Optional[str] = None, data_fim: Optional[str] = None) -> List[dict]:
+        """Totais de entradas, saídas e saldo do período agrupados por item"""
+        try:
+            return [dict(zip(COLUNAS_RESUMO, row))
+                    for row in RelatorioRepository.iter_resumo_movimentacoes(data_inicio, data_fim)]
+        except Exception as e:
+            logging.error(f"Erro ao gerar resumo de movimentações: {e}")
+            return []
+
+    @staticmethod
+    def movimentacoes_detalhadas(data_inicio: Optional[str] = None, data_fim: Optional[str] = None) -> List[dict]:
+        """Movimentações do período com o nome do item, ordenadas por item e data"""
+        try:
+            return [dict(zip(COLUNAS_DETALHADAS, row))
+                    for row in RelatorioRepository.iter_movimentacoes_detalhadas(data_inicio, data_fim)]
+        except Exception as e:
+            logging.error(f"Erro ao listar movimentações do período: {e}")
+            return []
+
+    @staticmethod
+    def consumo_diario(data_inicio: str, data_fim: str) -> List[tuple]:
+        """Saídas somadas por item e dia do período (item_id, dia, quantidade)
+
+        'dia' é o índice do dia contado a partir de data_inicio (0, 1, ...);
+        dias sem saída não aparecem. Uma única consulta para o catálogo
+        inteiro, já agregada no banco para reduzir as linhas transferidas.
+        """
+        inicio, fim = limites_periodo(data_inicio, data_fim)
+        sql = """
+        SELECT item_id, (data_ts - ?) / 86400 AS dia, SUM(quantidade)
+        FROM movimentacoes
+        WHERE tipo = 'saída' AND data_ts >= ? AND data_ts < ?
+        GROUP BY item_id, dia
+        """
+        with db_manager.conexao() as conn:
+            return conn.execute(sql, (inicio, inicio, fim)).fetchall()
+
+    @staticmethod
+    def estoques() -> List[tuple]:
+        """(id, nome, unidade, quantidade) de todos os itens, por id"""
+        with db_manager.conexao() as conn:
+            return conn.execute("SELECT id, nome, unidade, quantidade FROM itens ORDER BY id").fetchall()
+
+    @staticmethod
+    def _sql_curva_abc(criterio: str, data_inicio: Optional[str], data_fim: Optional[str],
+                       limite_a: float, limite_b: float):
+        """CTE 'curva' com valor, participação acumulada e classe de cada item
+
+        Critério 'estoque': quantidade em estoque × preço. Critério 'consumo':
+        saídas do período × preço. Itens de valor zero ficam de fora. O
+        acumulado vem de SUM() OVER na ordem decrescente de valor, em uma
+        única ordenação; o item que cruza o limite ainda entra na classe.
+        """
+        if criterio == 'consumo':
+            where, params = RelatorioRepository._filtro_periodo(data_inicio, data_fim)
+            where = f"{where} AND m.tipo = 'saída'" if where else " WHERE m.tipo = 'saída'"
+            origem = f"""
+            SELECT i.id, i.nome, i.tipo, c.quantidade, i.preco, c.quantidade * i.preco AS valor
+            FROM (SELECT m.item_id, SUM(m.quantidade) AS quantidade
+                  FROM movimentacoes m{where} GROUP BY m.item_id) c
+            JOIN itens i ON i.id = c.item_id
+            """
+        else:
+            origem = "SELECT id, nome, tipo, quantidade, preco, quantidade * preco AS valor FROM itens"
+            params = []
+
+        sql = f"""
+        WITH valores AS (
+            SELECT * FROM ({origem}) WHERE valor > 0
+        ),
+        acumulados AS (
+            SELECT valores.*,
+                ROW_NUMBER() OVER ordem AS posicao,
+                SUM(valor) OVER (ordem ROWS UNBOUNDED PRECEDING) AS acumulado,
+                SUM(valor) OVER () AS total
+            FROM valores
+            WINDOW ordem AS (ORDER BY valor DESC, id)
+        ),
+        curva AS (
+            SELECT acumulados.*,
+                CASE WHEN acumulado - valor < ? * total THEN 'A'
+                     WHEN acumulado - valor < ? * total THEN 'B'
+                     ELSE 'C' END AS classe
+            FROM acumulados
+        )
+        """
+        return sql, params + [limite_a, limite_b]
+
+    @staticmethod
+    def iter_curva_abc(criterio: str, data_inicio: Optional[str] = None, data_fim: Optional[str] = None,
+                       limite_a: float = 0.8, limite_b: float = 0.95,
+                       tamanho_lote: int = 1000) -> Iterator[tuple]:
+        """Itens do maior para o menor valor com a classe ABC (colunas em COLUNAS_ABC)"""
+        cte, params = RelatorioRepository._sql_curva_abc(criterio, data_inicio, data_fim, limite_a, limite_b)
+        sql = f"""{cte}
+        SELECT posicao, id, nome, tipo, quantidade, preco, ROUND(valor, 2),
+            ROUND(100.0 * valor / total, 4), ROUND(100.0 * acumulado / total, 4), classe
+        FROM curva
+        ORDER BY posicao
+        """
+        return RelatorioRepository._iterar(sql, params, tamanho_lote)
+
+    @staticmethod
+    def resumo_curva_abc(criterio: str, data_inicio: Optional[str] = None, data_fim: Optional[str] = None,
+                         limite_a: float = 0.8, limite_b: float = 0.95) -> List[dict]:
+        """Itens e valor por tipo e classe ABC, com a participação no valor total"""
+        cte, params = RelatorioRepository._sql_curva_abc(criterio, data_inicio, data_fim, limite_a, limite_b)
+        sql = f"""{cte}
+        SELECT tipo, classe, COUNT(*), SUM(valor), 100.0 * SUM(valor) / MAX(total)
+        FROM curva
+        GROUP BY tipo, classe
+        ORDER BY tipo, classe
+        """
+        try:
+            with db_manager.conexao() as conn:
+                return [
+                    {
+                        'tipo': row[0],
+                        'classe': row[1],
+                        'itens': row[2],
+                        'valor': row[3],
+                        'percentual': row[4]
+                    } for row in conn.execute(sql, params).fetchall()
+                ]
+        except Exception as e:
+            logging.error(f"Erro ao gerar resumo da curva ABC: {e}")
+            return []
+
+    @staticmethod
+    def _iterar(sql: str, params: list, tamanho_lote: int) -> Iterator[tuple]:
+        """Percorre o resultado com fetchmany; o sqlite3 avança o cursor sob demanda
+
+        Erros são propagados para que quem consome (ex.: a exportação) saiba
+        que o resultado ficou incompleto.
+        """
+        with db_manager.conexao() as conn:
+            cursor = conn.cursor()
+            cursor.execute(sql, params)
+            while True:
+                rows = cursor.fetchmany(tamanho_lote)
+                if not rows:
+                    break
+                yield from rows
+
+    @staticmethod
+    def iter_prox_validade(dias: int, tamanho_lote: int = 1000) -> Iterator[tuple]:
+        """Itens que vencem nos próximos 'dias' dias (colunas em COLUNAS_VALIDADE)"""
+        sql = """
+        SELECT id, nome, tipo, quantidade, unidade, data_validade,
+            CAST(julianday(data_validade) - julianday(date('now')) AS INTEGER)
+        FROM itens
+        WHERE data_validade BETWEEN date('now') AND date('now', ? || ' days')
+        ORDER BY data_validade, nome
+        """
+        return RelatorioRepository._iterar(sql, [str(dias)], tamanho_lote)
+
+    @staticmethod
+    def iter_estoque_baixo(minimo: int, tamanho_lote: int = 1000) -> Iterator[tuple]:
+        """Itens com quantidade abaixo do mínimo (colunas em COLUNAS_ESTOQUE_BAIXO)"""
+        sql = """
+        SELECT id, nome, tipo, quantidade, unidade, preco
+        FROM itens WHERE quantidade < ?
+        ORDER BY quantidade, nome
+        """
+        return RelatorioRepository._iterar(sql, [minimo], tamanho_lote)
+
+    @staticmethod
+    def iter_resumo_movimentacoes(data_inicio: Optional[str] = None, data_fim: Optional[str] = None,
+                                  tamanho_lote: int = 1000) -> Iterator[tuple]:
+        """Totais do período por item (colunas em COLUNAS_RESUMO)"""
+        where, params = RelatorioRepository._filtro_periodo(data_inicio, data_fim)
+        sql = f"""
+        SELECT m.item_id,
+            COALESCE(i.nome, 'Item não encontrado') AS nome,
+            i.unidade,
+            COUNT(*),
+            SUM(CASE WHEN m.tipo = 'entrada' THEN m.quantidade ELSE 0 END),
+            SUM(CASE WHEN m.tipo = 'saída' THEN m.quantidade ELSE 0 END),
+            SUM(CASE WHEN m.tipo = 'entrada' THEN m.quantidade ELSE -m.quantidade END)
+        FROM movimentacoes m
+        LEFT JOIN itens i ON i.id = m.item_id
+        {where}
+        GROUP BY m.item_id
+        ORDER BY nome, m.item_id
+        """
+        return RelatorioRepository._iterar(sql, params, tamanho_lote)
+
+    @staticmethod
+    def iter_movimentacoes_detalhadas(data_inicio: Optional[str] = None, data_fim: Optional[str] = None,
+                                      tamanho_lote: int = 1000) -> Iterator[tuple]:
+        """Movimentações do período com o nome do item (colunas em COLUNAS_DETALHADAS)"""
+        where, params = RelatorioRepository._filtro_periodo(data_inicio, data_fim)
+        sql = f"""
+        SELECT m.id, m.item_id,
+            COALESCE(i.nome, 'Item não encontrado') AS nome,
+            m.tipo, m.quantidade, m.data, m.responsavel, m.motivo
+        FROM movimentacoes m
+        LEFT JOIN itens i ON i.id = m.item_id
+        {where}
+        ORDER BY nome, m.item_id, m.data_ts
+        """
+        return RelatorioRepository._iterar(sql, params, tamanho_lote)
+
+    @staticmethod
+    def iter_historico_item(item_id: int, data_inicio: Optional[str] = None, data_fim: Optional[str] = None,
+                            tamanho_lote: int = 1000) -> Iterator[tuple]:
+        """Movimentações de um item em ordem cronológica (colunas em COLUNAS_HISTORICO)"""
+        where, params = RelatorioRepository._filtro_periodo(data_inicio, data_fim)
+        where = f"{where} AND m.item_id = ?" if where else " WHERE m.item_id = ?"
+        sql = f"""
+        SELECT m.id, m.data, m.tipo, m.quantidade, m.responsavel, m.motivo
+        FROM movimentacoes m
+        {where}
+        ORDER BY m.data_ts, m.id
+        """
+        return RelatorioRepository._iterar(sql, params + [item_id], tamanho_lote)
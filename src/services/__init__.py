@@ -1,4 +1,15 @@
 from .item_service import ItemService
 from .movimentacao_service import MovimentacaoService
+from .relatorio_service import RelatorioService
+from .importacao_service import ImportacaoService
+from .exportacao_service import ExportacaoService
 
-__all__ = ['ItemService', 'MovimentacaoService']
\ No newline at end of file
+__all__ = ['ItemService', 'MovimentacaoService', 'RelatorioService', 'ImportacaoService',
+           'ExportacaoService', 'AsyncItemService', 'AsyncMovimentacaoService']
+
+def __getattr__(nome):
+    # As fachadas assíncronas importam asyncio (~10 ms); carregadas só quando usadas
+    if nome in ('AsyncItemService', 'AsyncMovimentacaoService'):
+        from . import async_service
+        return getattr(async_service, nome)
+    raise AttributeError(f"module {__name__!r} has no attribute {nome!r}")
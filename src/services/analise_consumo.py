@@ -0,0 +1,146 @@
+from datetime import date
+from statistics import NormalDist
+from typing import Dict, List, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # A previsão de consumo é opcional
+    np = None
+
+# Coberturas acima disso não viram data de ruptura (não há o que projetar)
+_HORIZONTE_DIAS = 3650
+# Itens por bloco da matriz item × dia das médias móveis (limita a memória)
+_ITENS_POR_BLOCO = 10_000
+
+def disponivel() -> bool:
+    return np is not None
+
+def medias_moveis(posicao: "np.ndarray", dia: "np.ndarray", quantidade: "np.ndarray",
+                  quantidade_itens: int, janela: int, largura: int) -> Tuple["np.ndarray", "np.ndarray"]:
+    """Última e maior média móvel de 'largura' dias do consumo de cada item
+
+    Para cada bloco de itens monta a matriz de consumo item × dia com um
+    bincount, acumula os dias (cumsum) e obtém a soma de cada janela de
+    'largura' dias pela diferença de dois acumulados. As janelas terminam
+    em cada dia de 'largura' - 1 até 'janela' - 1.
+    """
+    ultima = np.zeros(quantidade_itens)
+    pico = np.zeros(quantidade_itens)
+    ordem = np.argsort(posicao, kind='stable')
+    posicao, dia, quantidade = posicao[ordem], dia[ordem], quantidade[ordem]
+    for inicio in range(0, quantidade_itens, _ITENS_POR_BLOCO):
+        fim = min(inicio + _ITENS_POR_BLOCO, quantidade_itens)
+        de, ate = np.searchsorted(posicao, [inicio, fim])
+        if de == ate:
+            continue
+        linhas = fim - inicio
+        diario = np.bincount((posicao[de:ate] - inicio) * janela + dia[de:ate], weights=quantidade[de:ate],
+                             minlength=linhas * janela).reshape(linhas, janela)
+        acumulado = np.zeros((linhas, janela + 1))
+        np.cumsum(diario, axis=1, out=acumulado[:, 1:])
+        somas = acumulado[:, largura:] - acumulado[:, :-largura]
+        ultima[inicio:fim] = somas[:, -1] / largura
+        pico[inicio:fim] = somas.max(axis=1) / largura
+    return ultima, pico
+
+def prever(itens: Sequence[tuple], consumo: Sequence[tuple], referencia: date, janela: int,
+           janela_recente: int, prazo_reposicao: float, nivel_servico: float) -> Dict[str, "np.ndarray"]:
+    """Consumo, cobertura e ponto de reposição de todos os itens de uma vez
+
+    'itens' são (id, nome, unidade, quantidade) em ordem de id e 'consumo'
+    são (item_id, dia, quantidade) com as saídas somadas por dia, 'dia'
+    contado de 0 a janela - 1 até a data de referência. Tudo é calculado
+    por item com operações vetorizadas (bincount, cumsum), sem laço por item:
+
+    - consumo médio e desvio padrão diários na janela, contando os dias sem saída;
+    - médias móveis de 'janela_recente' dias (medias_moveis): a recente, que
+      termina na data de referência, e o pico, a maior delas na janela;
+    - dias de cobertura pelo maior entre o consumo médio e o recente (o
+      recente pega a aceleração, o médio evita que uma pausa esconda a ruptura);
+    - estoque de segurança z·σ·√prazo e ponto de reposição consumo·prazo + segurança,
+      com z do nível de serviço na distribuição normal.
+
+    Retorna um dicionário de colunas (arrays alinhados com 'itens').
+    """
+    quantidade_itens = len(itens)
+    ids = np.fromiter((linha[0] for linha in itens), dtype=np.int64, count=quantidade_itens)
+    estoque = np.fromiter((linha[3] for linha in itens), dtype=np.float64, count=quantidade_itens)
+
+    saidas = np.array(consumo, dtype=np.int64).reshape(-1, 3)
+    posicao = np.searchsorted(ids, saidas[:, 0])
+    # Descarta movimentações de itens que não existem mais
+    validas = posicao < quantidade_itens
+    validas[validas] = ids[posicao[validas]] == saidas[validas, 0]
+    posicao, dia, quantidade = posicao[validas], saidas[validas, 1], saidas[validas, 2].astype(np.float64)
+
+    total = np.bincount(posicao, weights=quantidade, minlength=quantidade_itens)
+    quadrados = np.bincount(posicao, weights=quantidade ** 2, minlength=quantidade_itens)
+    dias_com_saida = np.bincount(posicao, minlength=quantidade_itens)
+
+    consumo_medio = total / janela
+    desvio = np.sqrt(np.maximum(quadrados / janela - consumo_medio ** 2, 0.0))
+    consumo_recente, consumo_pico = medias_moveis(posicao, dia, quantidade, quantidade_itens,
+                                                  janela, janela_recente)
+    taxa = np.maximum(consumo_medio, consumo_recente)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cobertura = np.where(taxa > 0, np.maximum(estoque, 0) / taxa, np.inf)
+    dias_ruptura = np.where(cobertura <= _HORIZONTE_DIAS, np.floor(cobertura), -1).astype(np.int64)
+    data_ruptura = np.datetime64(referencia, 'D') + dias_ruptura
+
+    z = NormalDist().inv_cdf(nivel_servico)
+    seguranca = z * desvio * np.sqrt(prazo_reposicao)
+    ponto_reposicao = np.ceil(consumo_medio * prazo_reposicao + seguranca)
+
+    return {
+        'id': ids,
+        'estoque': estoque,
+        'dias_com_saida': dias_com_saida,
+        'consumo_medio': consumo_medio,
+        'consumo_recente': consumo_recente,
+        'consumo_pico': consumo_pico,
+        'desvio_padrao': desvio,
+        'dias_cobertura': cobertura,
+        'data_ruptura': np.where(dias_ruptura >= 0, data_ruptura, np.datetime64('NaT')),
+        'estoque_seguranca': seguranca,
+        'ponto_reposicao': ponto_reposicao,
+        'repor': (taxa > 0) & (estoque <= ponto_reposicao),
+    }
+
+def linhas_previsao(itens: Sequence[tuple], colunas: Dict[str, "np.ndarray"]) -> List[dict]:
+    """Itens com saída na janela, do menor para o maior número de dias de cobertura"""
+    ordem = np.flatnonzero(colunas['dias_com_saida'] > 0)
+    ordem = ordem[np.argsort(colunas['dias_cobertura'][ordem], kind='stable')]
+
+    # tolist() de cada coluna de uma vez; arredondamento também vetorizado
+    datas = [None if d == 'NaT' else d for d in np.datetime_as_string(colunas['data_ruptura'][ordem]).tolist()]
+    valores = zip(
+        ordem.tolist(),
+        colunas['estoque'][ordem].astype(np.int64).tolist(),
+        np.round(colunas['consumo_medio'][ordem], 3).tolist(),
+        np.round(colunas['consumo_recente'][ordem], 3).tolist(),
+        np.round(colunas['consumo_pico'][ordem], 3).tolist(),
+        np.round(colunas['desvio_padrao'][ordem], 3).tolist(),
+        np.round(colunas['dias_cobertura'][ordem], 1).tolist(),
+        datas,
+        np.ceil(colunas['estoque_seguranca'][ordem]).astype(np.int64).tolist(),
+        colunas['ponto_reposicao'][ordem].astype(np.int64).tolist(),
+        colunas['repor'][ordem].tolist(),
+    )
+    return [
+        {
+            'item_id': itens[i][0],
+            'nome': itens[i][1],
+            'unidade': itens[i][2],
+            'estoque': estoque,
+            'consumo_medio': medio,
+            'consumo_recente': recente,
+            'consumo_pico': pico,
+            'desvio_padrao': desvio,
+            'dias_cobertura': cobertura,
+            'data_ruptura': data,
+            'estoque_seguranca': seguranca,
+            'ponto_reposicao': ponto,
+            'repor': repor,
+        } for i, estoque, medio, recente, pico, desvio, cobertura, data, seguranca, ponto, repor in valores
+    ]
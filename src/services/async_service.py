@@ -0,0 +1,152 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import List, Optional, Tuple
+
+from src.core import config
+from src.core.database import db_manager
+from src.models.item import Item
+from src.models.movimentacao import Movimentacao
+from src.repositories.item_repository import ItemRepository
+from src.repositories.movimentacao_repository import MovimentacaoRepository
+from src.services.item_service import ItemService
+from src.services.movimentacao_service import MovimentacaoService
+from src.utils.helpers import data_hora_banco
+from src.utils.logger import logger
+
+_executor: Optional[ThreadPoolExecutor] = None
+_lock_executor = threading.Lock()
+
+def _leitores() -> ThreadPoolExecutor:
+    """Executor compartilhado de leituras; cada thread fixa sua própria conexão"""
+    global _executor
+    with _lock_executor:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=config.ASYNC_LEITORES,
+                thread_name_prefix="leitor-async",
+                initializer=db_manager.fixar_conexao)
+        return _executor
+
+def encerrar():
+    """Encerra as threads de leitura (as conexões fixadas são fechadas com elas)"""
+    global _executor
+    with _lock_executor:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=True)
+
+async def _em_thread(funcao, *args, **kwargs):
+    """Executa uma chamada bloqueante no executor de leituras"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_leitores(), partial(funcao, *args, **kwargs))
+
+class AsyncItemService:
+    """Fachada asyncio do ItemService
+
+    Leituras rodam no executor limitado de leitores e podem ser combinadas com
+    asyncio.gather; escritas são sempre enviadas ao escritor dedicado, que as
+    serializa numa única conexão.
+    """
+
+    def __init__(self):
+        self._service = ItemService()
+
+    async def buscar_por_id(self, item_id: int) -> Optional[Item]:
+        return await _em_thread(self._service.buscar_por_id, item_id)
+
+    async def buscar_por_nome(self, nome: str) -> List[Item]:
+        return await _em_thread(self._service.buscar_por_nome, nome)
+
+    async def listar_todos(self) -> List[Item]:
+        return await _em_thread(self._service.listar_todos)
+
+    async def listar_pagina(self, limite: int = 20, apos: Optional[Tuple[str, int]] = None,
+                            antes: Optional[Tuple[str, int]] = None) -> List[Item]:
+        return await _em_thread(self._service.listar_pagina, limite, apos, antes)
+
+    async def itens_prox_validade(self, dias: int) -> List[Item]:
+        return await _em_thread(self._service.itens_prox_validade, dias)
+
+    async def cadastrar(self, item: Item) -> Tuple[bool, str]:
+        """Cadastra um novo item com as mesmas validações do serviço síncrono"""
+        try:
+            item.validar()
+        except ValueError as e:
+            return False, str(e)
+
+        if await _em_thread(self._service._item_existe, item.nome):
+            return False, "Item já cadastrado com este nome"
+
+        return await asyncio.wrap_future(ItemRepository.submeter_salvar(item))
+
+    async def atualizar(self, item: Item) -> Tuple[bool, str]:
+        """Atualiza um item existente"""
+        try:
+            item.validar()
+        except ValueError as e:
+            return False, str(e)
+
+        if not await self.buscar_por_id(item.id):
+            return False, "Item não encontrado"
+
+        return await asyncio.wrap_future(ItemRepository.submeter_salvar(item))
+
+class AsyncMovimentacaoService:
+    """Fachada asyncio do MovimentacaoService (mesmo modelo de leituras e escritas)"""
+
+    async def registrar_movimentacao(
+            self,
+            item_id: int,
+            tipo: str,
+            quantidade: int,
+            responsavel: str,
+            motivo: str = None,
+            data: Optional[str] = None
+    ) -> Tuple[bool, str]:
+        """Registra uma nova movimentação pelo escritor dedicado ('data' padrão: agora)"""
+        mov = Movimentacao(
+            item_id=item_id,
+            tipo=tipo,
+            quantidade=quantidade,
+            data=data or data_hora_banco(),
+            responsavel=responsavel.strip(),
+            motivo=motivo
+        )
+
+        try:
+            mov.validar()
+        except ValueError as e:
+            return False, str(e)
+
+        return await asyncio.wrap_future(MovimentacaoRepository.submeter(mov))
+
+    async def listar_pagina(self, limite: int = 20, apos: Optional[Tuple[str, int]] = None,
+                            antes: Optional[Tuple[str, int]] = None, item_id: Optional[int] = None,
+                            data_inicio: Optional[str] = None, data_fim: Optional[str] = None) -> List[Movimentacao]:
+        return await _em_thread(
+            MovimentacaoService.listar_pagina, limite, apos, antes, item_id, data_inicio, data_fim)
+
+    async def historico_por_item(self, item_id: int, data_inicio: Optional[str] = None,
+                                 data_fim: Optional[str] = None) -> Tuple[List[Movimentacao], int, int]:
+        """Retorna histórico, saldo inicial e saldo final
+
+        Saldos e listagem são lidos numa única chamada no executor, dentro do
+        mesmo instantâneo de leitura; os checkpoints ficam a cargo da tarefa
+        agendada.
+        """
+        return await _em_thread(MovimentacaoService.historico_por_item, item_id, data_inicio, data_fim)
+
+    async def item_com_historico(self, item_id: int, data_inicio: Optional[str] = None,
+                                 data_fim: Optional[str] = None) -> Tuple[Optional[Item], List[Movimentacao], int, int]:
+        """Busca o item e seu histórico do período ao mesmo tempo"""
+        try:
+            item, (movimentacoes, saldo_inicial, saldo_final) = await asyncio.gather(
+                AsyncItemService().buscar_por_id(item_id),
+                self.historico_por_item(item_id, data_inicio, data_fim))
+        except Exception as e:
+            logger.error(f"Erro ao consultar histórico do item: {e}")
+            return None, [], 0, 0
+
+        return item, movimentacoes, saldo_inicial, saldo_final
@@ -0,0 +1,208 @@
+import csv
+import json
+import os
+import time
+from dataclasses import dataclass
+from itertools import islice
+from pathlib import Path
+from typing import Callable, Iterable, List, Optional, Sequence, Union
+
+from src.core import config
+from src.core.database import db_manager
+from src.repositories.movimentacao_repository import MovimentacaoRepository
+from src.repositories.relatorio_repository import (
+    RelatorioRepository, COLUNAS_VALIDADE, COLUNAS_ESTOQUE_BAIXO, COLUNAS_RESUMO,
+    COLUNAS_DETALHADAS, COLUNAS_HISTORICO, COLUNAS_PREVISAO, COLUNAS_ABC
+)
+from src.utils.helpers import converter_data_para_banco
+from src.utils.logger import logger
+
+try:
+    from openpyxl import Workbook
+except ImportError:  # XLSX é opcional
+    Workbook = None
+
+FORMATOS = ('csv', 'jsonl', 'xlsx')
+
+# Linhas escritas por bloco e limite de linhas por planilha do Excel
+_LINHAS_POR_BLOCO = 1000
+_LIMITE_LINHAS_XLSX = 1_048_576
+
+Progresso = Callable[[int, float], None]
+
+@dataclass
+class ResultadoExportacao:
+    sucesso: bool
+    mensagem: str
+    caminho: Optional[Path] = None
+    linhas: int = 0
+    segundos: float = 0.0
+
+    @property
+    def linhas_por_segundo(self) -> float:
+        return self.linhas / self.segundos if self.segundos else 0.0
+
+def _blocos(linhas: Iterable[tuple]):
+    iterador = iter(linhas)
+    while True:
+        bloco = list(islice(iterador, _LINHAS_POR_BLOCO))
+        if not bloco:
+            return
+        yield bloco
+
+def _escrever_csv(destino: Path, colunas: Sequence[str], blocos) -> Iterable[int]:
+    # BOM e ';' para abrir direto no Excel em português
+    with open(destino, 'w', encoding='utf-8-sig', newline='') as f:
+        escritor = csv.writer(f, delimiter=';')
+        escritor.writerow(colunas)
+        for bloco in blocos:
+            escritor.writerows(bloco)
+            yield len(bloco)
+
+def _escrever_jsonl(destino: Path, colunas: Sequence[str], blocos) -> Iterable[int]:
+    with open(destino, 'w', encoding='utf-8') as f:
+        for bloco in blocos:
+            f.write(''.join(
+                json.dumps(dict(zip(colunas, linha)), ensure_ascii=False) + '\n' for linha in bloco))
+            yield len(bloco)
+
+def _escrever_xlsx(destino: Path, colunas: Sequence[str], blocos) -> Iterable[int]:
+    # write_only grava as linhas em disco conforme chegam, sem manter a planilha em memória
+    livro = Workbook(write_only=True)
+    planilha, linhas_planilha, numero = None, _LIMITE_LINHAS_XLSX, 0
+    for bloco in blocos:
+        for linha in bloco:
+            if linhas_planilha >= _LIMITE_LINHAS_XLSX:
+                numero += 1
+                planilha = livro.create_sheet(f"Dados {numero}" if numero > 1 else "Dados")
+                planilha.append(list(colunas))
+                linhas_planilha = 1
+            planilha.append(linha)
+            linhas_planilha += 1
+        yield len(bloco)
+    if planilha is None:
+        livro.create_sheet("Dados").append(list(colunas))
+    livro.save(destino)
+
+_ESCRITORES = {
+    'csv': _escrever_csv,
+    'jsonl': _escrever_jsonl,
+    'xlsx': _escrever_xlsx,
+}
+
+class ExportacaoService:
+    """Exporta relatórios para CSV, JSONL ou XLSX lendo o cursor em fluxo
+
+    As linhas vão do fetchmany do banco direto para o arquivo, em blocos,
+    então a memória usada não depende do tamanho do relatório. O arquivo é
+    escrito com sufixo '.parcial' e só recebe o nome final se tudo der certo.
+    A leitura usa um instantâneo somente leitura (db_manager.leitura), então
+    exportações longas não atrasam o registro de movimentações.
+    """
+
+    @staticmethod
+    def exportar(colunas: Sequence[str], linhas: Iterable[tuple], caminho: Union[str, Path],
+                 formato: Optional[str] = None, ao_progresso: Optional[Progresso] = None,
+                 intervalo_progresso: int = 10_000) -> ResultadoExportacao:
+        """Grava as linhas no formato informado (ou deduzido da extensão do arquivo)"""
+        caminho = Path(caminho)
+        formato = (formato or caminho.suffix.lstrip('.') or 'csv').lower()
+        if formato not in FORMATOS:
+            return ResultadoExportacao(False, f"Formato inválido (use {', '.join(FORMATOS)})")
+        if formato == 'xlsx' and Workbook is None:
+            return ResultadoExportacao(
+                False, "Exportação em XLSX requer o pacote openpyxl (pip install openpyxl)")
+        if caminho.suffix.lower() != f".{formato}":
+            caminho = caminho.with_name(f"{caminho.name}.{formato}")
+
+        caminho.parent.mkdir(parents=True, exist_ok=True)
+        parcial = caminho.with_name(caminho.name + '.parcial')
+        resultado = ResultadoExportacao(True, "", caminho)
+        inicio = time.perf_counter()
+        proximo_aviso = intervalo_progresso
+        try:
+            with db_manager.leitura():
+                for quantidade in _ESCRITORES[formato](parcial, colunas, _blocos(linhas)):
+                    resultado.linhas += quantidade
+                    if ao_progresso and resultado.linhas >= proximo_aviso:
+                        ao_progresso(resultado.linhas, time.perf_counter() - inicio)
+                        proximo_aviso += intervalo_progresso
+            os.replace(parcial, caminho)
+        except Exception as e:
+            logger.error(f"Erro ao exportar para {caminho}: {e}")
+            parcial.unlink(missing_ok=True)
+            return ResultadoExportacao(False, f"Erro ao exportar: {e}", linhas=resultado.linhas,
+                                       segundos=time.perf_counter() - inicio)
+
+        resultado.segundos = time.perf_counter() - inicio
+        resultado.mensagem = (f"{resultado.linhas} linhas exportadas em {resultado.segundos:.1f}s "
+                              f"({resultado.linhas_por_segundo:.0f} linhas/s)")
+        return resultado
+
+    @staticmethod
+    def exportar_prox_validade(dias: int, caminho: Union[str, Path], **opcoes) -> ResultadoExportacao:
+        return ExportacaoService.exportar(
+            COLUNAS_VALIDADE, RelatorioRepository.iter_prox_validade(dias), caminho, **opcoes)
+
+    @staticmethod
+    def exportar_estoque_baixo(minimo: int, caminho: Union[str, Path], **opcoes) -> ResultadoExportacao:
+        return ExportacaoService.exportar(
+            COLUNAS_ESTOQUE_BAIXO, RelatorioRepository.iter_estoque_baixo(minimo), caminho, **opcoes)
+
+    @staticmethod
+    def exportar_movimentacoes_periodo(data_inicio: Optional[str], data_fim: Optional[str],
+                                       caminho: Union[str, Path], detalhado: bool = False,
+                                       **opcoes) -> ResultadoExportacao:
+        """Resumo por item ou, com detalhado=True, cada movimentação (datas em DD/MM/AAAA)"""
+        data_inicio_db = converter_data_para_banco(data_inicio) if data_inicio else None
+        data_fim_db = converter_data_para_banco(data_fim) if data_fim else None
+
+        if detalhado:
+            return ExportacaoService.exportar(
+                COLUNAS_DETALHADAS,
+                RelatorioRepository.iter_movimentacoes_detalhadas(data_inicio_db, data_fim_db),
+                caminho, **opcoes)
+        return ExportacaoService.exportar(
+            COLUNAS_RESUMO, RelatorioRepository.iter_resumo_movimentacoes(data_inicio_db, data_fim_db),
+            caminho, **opcoes)
+
+    @staticmethod
+    def exportar_historico_item(item_id: int, data_inicio: Optional[str], data_fim: Optional[str],
+                                caminho: Union[str, Path], **opcoes) -> ResultadoExportacao:
+        """Histórico cronológico do item com o saldo após cada movimentação (datas em DD/MM/AAAA)"""
+        data_inicio_db = converter_data_para_banco(data_inicio) if data_inicio else None
+        data_fim_db = converter_data_para_banco(data_fim) if data_fim else None
+
+        # Saldo inicial e movimentações do mesmo instantâneo
+        with db_manager.leitura():
+            saldos = MovimentacaoRepository.saldos_periodo(item_id, data_inicio_db, data_fim_db)
+            if saldos is None:
+                return ResultadoExportacao(False, "Item não encontrado")
+
+            def com_saldo():
+                saldo = saldos[0]
+                for linha in RelatorioRepository.iter_historico_item(item_id, data_inicio_db, data_fim_db):
+                    saldo += linha[3] if linha[2] == 'entrada' else -linha[3]
+                    yield linha + (saldo,)
+
+            return ExportacaoService.exportar(COLUNAS_HISTORICO + ('saldo_apos',), com_saldo(), caminho, **opcoes)
+
+    @staticmethod
+    def exportar_curva_abc(criterio: str, data_inicio: Optional[str], data_fim: Optional[str],
+                           caminho: Union[str, Path], **opcoes) -> ResultadoExportacao:
+        """Curva ABC do catálogo inteiro por 'estoque' ou 'consumo' (datas em DD/MM/AAAA)"""
+        data_inicio_db = converter_data_para_banco(data_inicio) if data_inicio else None
+        data_fim_db = converter_data_para_banco(data_fim) if data_fim else None
+
+        return ExportacaoService.exportar(
+            COLUNAS_ABC,
+            RelatorioRepository.iter_curva_abc(criterio, data_inicio_db, data_fim_db,
+                                               config.ABC_LIMITE_A, config.ABC_LIMITE_B),
+            caminho, **opcoes)
+
+    @staticmethod
+    def exportar_previsao_consumo(linhas: List[dict], caminho: Union[str, Path], **opcoes) -> ResultadoExportacao:
+        """Grava a previsão já calculada por RelatorioService.previsao_consumo"""
+        return ExportacaoService.exportar(
+            COLUNAS_PREVISAO, (tuple(linha[coluna] for coluna in COLUNAS_PREVISAO) for linha in linhas),
+            caminho, **opcoes)
@@ -0,0 +1,265 @@
+import csv
+import hashlib
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+from typing import Callable, Iterator, List, Optional, Tuple, Union
+
+from src.core import config
+from src.models.item import Item
+from src.models.movimentacao import Movimentacao
+from src.repositories.importacao_repository import ImportacaoRepository
+from src.utils.helpers import data_hora_banco
+from src.utils.logger import logger
+
+@dataclass
+class ResultadoImportacao:
+    arquivo: str
+    tipo: str
+    retomada_da_linha: int = 0    # última linha já confirmada antes desta execução
+    linhas_lidas: int = 0         # linhas processadas nesta execução
+    gravadas: int = 0
+    erros: int = 0
+    concluida: bool = False
+    relatorio_erros: Optional[Path] = None
+    mensagem: str = ""
+
+Registro = Union[dict, ValueError]
+
+def _assinatura(caminho: Path) -> str:
+    """Hash do conteúdo: identifica o arquivo mesmo se renomeado e muda se for editado"""
+    sha = hashlib.sha256()
+    with open(caminho, 'rb') as f:
+        for bloco in iter(lambda: f.read(1024 * 1024), b''):
+            sha.update(bloco)
+    return sha.hexdigest()
+
+def _ler_registros(caminho: Path) -> Iterator[Tuple[int, Registro]]:
+    """Lê o arquivo linha a linha como (número da linha, registro)
+
+    CSV (separado por ',' ou ';', com cabeçalho) ou JSONL (um objeto por
+    linha). Linhas que não puderem ser lidas saem como ValueError para
+    entrarem no relatório de erros sem interromper a importação.
+    """
+    if caminho.suffix.lower() in ('.jsonl', '.ndjson'):
+        with open(caminho, encoding='utf-8') as f:
+            for numero, linha in enumerate(f, 1):
+                if not linha.strip():
+                    continue
+                try:
+                    registro = json.loads(linha)
+                except json.JSONDecodeError as e:
+                    yield numero, ValueError(f"JSON inválido: {e.msg}")
+                    continue
+                if not isinstance(registro, dict):
+                    yield numero, ValueError("Linha deve conter um objeto JSON")
+                    continue
+                yield numero, registro
+        return
+
+    with open(caminho, encoding='utf-8-sig', newline='') as f:
+        cabecalho = f.readline()
+        f.seek(0)
+        delimitador = ';' if cabecalho.count(';') > cabecalho.count(',') else ','
+        leitor = csv.DictReader(f, delimiter=delimitador)
+        if leitor.fieldnames:
+            leitor.fieldnames = [campo.strip().lower() for campo in leitor.fieldnames]
+        for registro in leitor:
+            if not any(valor and valor.strip() for valor in registro.values() if isinstance(valor, str)):
+                continue
+            yield leitor.line_num, registro
+
+def _texto(valor) -> Optional[str]:
+    if valor is None:
+        return None
+    texto = str(valor).strip()
+    return texto or None
+
+def _inteiro(registro: dict, campo: str, padrao: Optional[int] = None) -> int:
+    valor = _texto(registro.get(campo))
+    if valor is None:
+        if padrao is None:
+            raise ValueError(f"Campo '{campo}' é obrigatório")
+        return padrao
+    try:
+        return int(valor)
+    except ValueError:
+        raise ValueError(f"Campo '{campo}' deve ser inteiro")
+
+def _decimal(registro: dict, campo: str, padrao: float) -> float:
+    valor = _texto(registro.get(campo))
+    if valor is None:
+        return padrao
+    if ',' in valor:  # Formato brasileiro: 1.234,56
+        valor = valor.replace('.', '').replace(',', '.')
+    try:
+        return float(valor)
+    except ValueError:
+        raise ValueError(f"Campo '{campo}' deve ser numérico")
+
+def _data(valor, com_hora: bool) -> Optional[str]:
+    """Aceita DD/MM/AAAA, AAAA-MM-DD e, com hora, AAAA-MM-DD HH:MM:SS"""
+    texto = _texto(valor)
+    if texto is None:
+        return None
+    formatos = ("%d/%m/%Y %H:%M:%S", "%d/%m/%Y %H:%M", "%d/%m/%Y",
+                "%Y-%m-%d %H:%M:%S", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%d")
+    for formato in formatos:
+        try:
+            data = datetime.strptime(texto, formato)
+        except ValueError:
+            continue
+        return data_hora_banco(data) if com_hora else data.strftime("%Y-%m-%d")
+    return texto  # a validação do modelo aponta o formato inválido
+
+def _item(registro: dict) -> Item:
+    item = Item(
+        nome=_texto(registro.get('nome')) or "",
+        marca=_texto(registro.get('marca')),
+        quantidade=_inteiro(registro, 'quantidade', 0),
+        unidade=_texto(registro.get('unidade')),
+        preco=_decimal(registro, 'preco', 0.0),
+        tipo=_texto(registro.get('tipo')) or "",
+        descricao=_texto(registro.get('descricao')),
+        data_validade=_data(registro.get('data_validade'), com_hora=False)
+    )
+    item.validar()
+    return item
+
+def _movimentacao(registro: dict, agora: str) -> Movimentacao:
+    mov = Movimentacao(
+        item_id=_inteiro(registro, 'item_id'),
+        tipo=(_texto(registro.get('tipo')) or "").lower().replace('saida', 'saída'),
+        quantidade=_inteiro(registro, 'quantidade'),
+        data=_data(registro.get('data'), com_hora=True) or agora,
+        responsavel=_texto(registro.get('responsavel')) or "",
+        motivo=_texto(registro.get('motivo'))
+    )
+    mov.validar()
+    return mov
+
+class _RelatorioErros:
+    """CSV de erros (linha; erro; registro), aberto só quando o primeiro erro aparece"""
+
+    def __init__(self, caminho: Path, continuar: bool):
+        self.caminho = caminho
+        self._modo = 'a' if continuar and caminho.exists() else 'w'
+        self._arquivo = None
+        self._escritor = None
+
+    def escrever(self, erros: List[Tuple[int, str, Registro]]):
+        if not erros:
+            return
+        if self._arquivo is None:
+            self._arquivo = open(self.caminho, self._modo, encoding='utf-8', newline='')
+            self._escritor = csv.writer(self._arquivo, delimiter=';')
+            if self._modo == 'w':
+                self._escritor.writerow(['linha', 'erro', 'registro'])
+        for linha, mensagem, registro in sorted(erros, key=lambda erro: erro[0]):
+            conteudo = json.dumps(registro, ensure_ascii=False) if isinstance(registro, dict) else ""
+            self._escritor.writerow([linha, mensagem, conteudo])
+        self._arquivo.flush()
+
+    def fechar(self):
+        if self._arquivo is not None:
+            self._arquivo.close()
+
+class ImportacaoService:
+    """Importação em lote de itens e movimentações a partir de CSV ou JSONL
+
+    O arquivo é lido em fluxo e gravado em blocos de 'tamanho_lote' linhas;
+    cada bloco é confirmado junto com o progresso da importação, então uma
+    execução interrompida é retomada do último bloco confirmado. Linhas
+    inválidas vão para '<arquivo>.erros.csv' sem interromper a carga.
+    """
+
+    @staticmethod
+    def importar_itens(caminho: Union[str, Path], tamanho_lote: int = config.IMPORTACAO_LOTE,
+                       reiniciar: bool = False,
+                       ao_confirmar: Optional[Callable[[ResultadoImportacao], None]] = None) -> ResultadoImportacao:
+        """Colunas: nome, marca, quantidade (saldo de abertura), unidade, preco, tipo, descricao, data_validade"""
+        return ImportacaoService._importar(
+            Path(caminho), 'itens', _item, ImportacaoRepository.gravar_itens,
+            tamanho_lote, reiniciar, ao_confirmar)
+
+    @staticmethod
+    def importar_movimentacoes(caminho: Union[str, Path], tamanho_lote: int = config.IMPORTACAO_LOTE,
+                               reiniciar: bool = False,
+                               ao_confirmar: Optional[Callable[[ResultadoImportacao], None]] = None) -> ResultadoImportacao:
+        """Colunas: item_id, tipo (entrada/saída), quantidade, data (opcional), responsavel, motivo"""
+        agora = data_hora_banco()
+        return ImportacaoService._importar(
+            Path(caminho), 'movimentacoes', lambda registro: _movimentacao(registro, agora),
+            ImportacaoRepository.gravar_movimentacoes, tamanho_lote, reiniciar, ao_confirmar)
+
+    @staticmethod
+    def _importar(caminho: Path, tipo: str, converter: Callable, gravar: Callable,
+                  tamanho_lote: int, reiniciar: bool,
+                  ao_confirmar: Optional[Callable[[ResultadoImportacao], None]]) -> ResultadoImportacao:
+        resultado = ResultadoImportacao(arquivo=str(caminho), tipo=tipo)
+        if not caminho.is_file():
+            resultado.mensagem = "Arquivo não encontrado"
+            return resultado
+        if tamanho_lote < 1:
+            raise ValueError("Tamanho do lote deve ser positivo")
+
+        assinatura = _assinatura(caminho)
+        if reiniciar:
+            ImportacaoRepository.descartar_progresso(assinatura, tipo)
+        progresso = ImportacaoRepository.progresso(assinatura, tipo)
+        if progresso and progresso['concluida']:
+            resultado.concluida = True
+            resultado.retomada_da_linha = progresso['linhas_confirmadas']
+            resultado.mensagem = (f"Arquivo já importado ({progresso['gravadas']} registros, "
+                                  f"{progresso['erros']} erros)")
+            return resultado
+
+        ja_confirmadas = progresso['linhas_confirmadas'] if progresso else 0
+        resultado.retomada_da_linha = ja_confirmadas
+        relatorio = _RelatorioErros(caminho.with_name(caminho.name + '.erros.csv'), continuar=bool(progresso))
+
+        registros = ((numero, registro) for numero, registro in _ler_registros(caminho)
+                     if numero > ja_confirmadas)
+        try:
+            bloco = list(islice(registros, tamanho_lote))
+            while bloco:
+                proximo = list(islice(registros, tamanho_lote))
+                ultima_linha = bloco[-1][0]
+
+                validos, erros_validacao = [], []
+                for numero, registro in bloco:
+                    try:
+                        if isinstance(registro, ValueError):
+                            raise registro
+                        validos.append((numero, converter(registro)))
+                    except (ValueError, TypeError) as e:
+                        erros_validacao.append((numero, str(e), registro))
+
+                erros_gravacao = gravar(validos, assinatura, str(caminho), ultima_linha,
+                                        len(erros_validacao), concluida=not proximo)
+
+                originais = dict(bloco)
+                relatorio.escrever(erros_validacao + [
+                    (numero, mensagem, originais[numero]) for numero, mensagem in erros_gravacao])
+
+                resultado.linhas_lidas += len(bloco)
+                resultado.erros += len(erros_validacao) + len(erros_gravacao)
+                resultado.gravadas += len(validos) - len(erros_gravacao)
+                if ao_confirmar:
+                    ao_confirmar(resultado)
+                bloco = proximo
+
+            resultado.concluida = True
+            resultado.mensagem = f"{resultado.gravadas} registros importados, {resultado.erros} erros"
+        except Exception as e:
+            logger.error(f"Erro ao importar {tipo} de {caminho}: {e}")
+            resultado.mensagem = (f"Importação interrompida: {e}. "
+                                  "Execute novamente para continuar do último bloco confirmado.")
+        finally:
+            relatorio.fechar()
+
+        if resultado.erros:
+            resultado.relatorio_erros = relatorio.caminho
+        return resultado
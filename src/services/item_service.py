@@ -1,9 +1,10 @@
 from datetime import datetime
-from typing import List, Tuple, Optional
+from typing import Iterator, List, Tuple, Optional
 from src.models.item import Item
 from src.repositories.item_repository import ItemRepository
-from src.models.movimentacao import Movimentacao
 from src.repositories.movimentacao_repository import MovimentacaoRepository
+from src.core.escritor import escritor
+from src.utils.helpers import data_hora_banco
 from src.utils.logger import logger
 
 class ItemService:
@@ -19,7 +20,7 @@ class ItemService:
             if self._item_existe(item.nome):
                 return False, "Item já cadastrado com este nome"
 
-            return self.repository.salvar(item)
+            return self._salvar(item)
 
         except ValueError as e:
             return False, str(e)
@@ -35,6 +36,19 @@ class ItemService:
             logger.error(f"Erro ao listar itens: {e}")
             return []
 
+    def iter_todos(self, visao: bool = False) -> Iterator[Item]:
+        """Percorre todos os itens ordenados por nome, em blocos (visao=True entrega ItemView)"""
+        return self.repository.iter_todos(visao=visao)
+
+    def listar_pagina(self, limite: int = 20, apos: Optional[Tuple[str, int]] = None,
+                      antes: Optional[Tuple[str, int]] = None) -> List[Item]:
+        """Retorna uma página de itens ordenados por nome"""
+        try:
+            return self.repository.listar_pagina(limite, apos=apos, antes=antes)
+        except Exception as e:
+            logger.error(f"Erro ao listar itens: {e}")
+            return []
+
     def buscar_por_nome(self, nome: str) -> List[Item]:
         """Busca itens por similaridade no nome"""
         try:
@@ -63,7 +77,7 @@ class ItemService:
             if not self.repository.buscar_por_id(item.id):
                 return False, "Item não encontrado"
 
-            return self.repository.salvar(item)
+            return self._salvar(item)
 
         except ValueError as e:
             return False, str(e)
@@ -84,11 +98,16 @@ class ItemService:
             logger.error(f"Erro ao remover item: {e}")
             return False, "Erro interno ao remover item"
 
+    def _salvar(self, item: Item) -> Tuple[bool, str]:
+        """Grava o item diretamente ou pelo escritor dedicado, se estiver ativo"""
+        if escritor.ativo:
+            return self.repository.submeter_salvar(item).result()
+        return self.repository.salvar(item)
+
     def _item_existe(self, nome: str) -> bool:
         """Verifica se item com mesmo nome já existe"""
         try:
-            itens = self.repository.buscar_por_nome(nome)
-            return any(item.nome.lower() == nome.lower() for item in itens)
+            return self.repository.existe_nome(nome)
         except Exception:
             return False
 
@@ -100,28 +119,30 @@ class ItemService:
             logger.error(f"Erro ao buscar itens próximos da validade: {e}")
             return []
 
+    def baixar_vencidos(self, desde: Optional[str] = None,
+                        agora: Optional[datetime] = None) -> Tuple[bool, str, List[Tuple[int, str, int]]]:
+        """Baixa os itens vencidos e retorna (sucesso, mensagem, itens baixados)
+
+        'desde' (AAAA-MM-DD) limita a baixa aos itens vencidos a partir dessa
+        data, para execuções incrementais; 'agora' fixa o momento de referência.
+        """
+        return MovimentacaoRepository.baixar_vencidos(
+            data=data_hora_banco(agora),
+            responsavel='SISTEMA',
+            motivo='Baixa automática - Item vencido',
+            desde=desde
+        )
+
     def processar_vencimentos(self):
         """Realiza baixa automática de itens vencidos"""
-        itens_vencidos = self.repository.itens_vencidos()
-        resultados = []
-
-        for item in itens_vencidos:
-            mov = Movimentacao(
-                item_id=item.id,
-                tipo='saída',
-                quantidade=item.quantidade,
-                data=datetime.now().isoformat(),
-                responsavel='SISTEMA',
-                motivo='Baixa automática - Item vencido'
-            )
-
-            sucesso, msg = MovimentacaoRepository.registrar(mov)
-
-            resultados.append({
-                'item': item.nome,
-                'quantidade': item.quantidade,
+        sucesso, msg, itens_baixados = self.baixar_vencidos()
+
+        return [
+            {
+                'item': nome,
+                'quantidade': quantidade,
                 'sucesso': sucesso,
                 'mensagem': msg
-            })
-
-        return resultados
\ No newline at end of file
+            }
+            for _, nome, quantidade in itens_baixados
+        ]
@@ -1,9 +1,9 @@
-from typing import List, Tuple, Optional
-from datetime import datetime
+from typing import Iterator, List, Tuple, Optional
 from src.models.movimentacao import Movimentacao
 from src.repositories.movimentacao_repository import MovimentacaoRepository
-from src.repositories.item_repository import ItemRepository
-from src.utils.helpers import converter_data_para_banco
+from src.core.escritor import escritor
+from src.core.database import db_manager
+from src.utils.helpers import converter_data_para_banco, data_hora_banco
 
 class MovimentacaoService:
 
@@ -13,14 +13,15 @@ class MovimentacaoService:
             tipo: str,
             quantidade: int,
             responsavel: str,
-            motivo: str = None
+            motivo: str = None,
+            data: Optional[str] = None
     ) -> Tuple[bool, str]:
-        """Registra uma nova movimentação"""
+        """Registra uma nova movimentação ('data' em AAAA-MM-DD HH:MM:SS; padrão: agora)"""
         mov = Movimentacao(
             item_id=item_id,
             tipo=tipo,
             quantidade=quantidade,
-            data=datetime.now().isoformat(sep=' ', timespec='seconds'),
+            data=data or data_hora_banco(),
             responsavel=responsavel,
             motivo=motivo
         )
@@ -36,19 +37,41 @@ class MovimentacaoService:
             if not responsavel.strip():
                 return False, "Responsável é obrigatório"
 
-            # Verifica estoque para saída
-            if tipo == 'saída':
-                item = ItemRepository.buscar_por_id(item_id)
-                if not item:
-                    return False, "Item não encontrado"
-                if item.quantidade < quantidade:
-                    return False, f"Estoque insuficiente (disponível: {item.quantidade})"
-
+            # A checagem de estoque da saída é feita atomicamente no repositório
+            if escritor.ativo:
+                return MovimentacaoRepository.submeter(mov).result()
             return MovimentacaoRepository.registrar(mov)
 
         except Exception as e:
             return False, str(e)
 
+    @staticmethod
+    def registrar_movimentacoes(movimentacoes: List[Movimentacao]) -> List[Tuple[bool, str]]:
+        """Registra um lote de movimentações de forma atômica
+
+        Retorna o resultado de cada linha. Se qualquer linha for inválida ou
+        deixar o estoque negativo, nenhuma movimentação do lote é gravada.
+        """
+        data = data_hora_banco()
+        resultados = []
+        for mov in movimentacoes:
+            if not mov.data:
+                mov.data = data
+            try:
+                mov.validar()
+                resultados.append((True, "Movimentação válida"))
+            except ValueError as e:
+                resultados.append((False, str(e)))
+
+        if not all(sucesso for sucesso, _ in resultados):
+            return [
+                (False, "Lote não registrado devido a erros em outras linhas") if sucesso
+                else (sucesso, msg)
+                for sucesso, msg in resultados
+            ]
+
+        return MovimentacaoRepository.registrar_lote(movimentacoes)
+
     @staticmethod
     def listar_todas(data_inicio: Optional[str] = None, data_fim: Optional[str] = None) -> List[Movimentacao]:
         """Lista todas as movimentações com filtro por período"""
@@ -59,45 +82,53 @@ class MovimentacaoService:
         return MovimentacaoRepository.listar_todas(data_inicio_db, data_fim_db)
 
     @staticmethod
-    def historico_por_item(item_id: int, data_inicio: Optional[str] = None, data_fim: Optional[str] = None) -> Tuple[List[Movimentacao], int, int]:
-        """Retorna histórico, saldo inicial e saldo final"""
-        # Converte datas para formato do banco
+    def iter_todas(data_inicio: Optional[str] = None, data_fim: Optional[str] = None,
+                   visao: bool = False) -> Iterator[Movimentacao]:
+        """Percorre as movimentações do período (datas em DD/MM/AAAA) em blocos
+
+        Com visao=True entrega MovimentacaoView, mais leve para leituras em massa.
+        """
         data_inicio_db = converter_data_para_banco(data_inicio) if data_inicio else None
         data_fim_db = converter_data_para_banco(data_fim) if data_fim else None
 
-        # Busca movimentações do período
-        movimentacoes = MovimentacaoRepository.listar_por_item(item_id, data_inicio_db, data_fim_db)
-        item = ItemRepository.buscar_por_id(item_id)
+        return MovimentacaoRepository.iter_todas(data_inicio_db, data_fim_db, visao=visao)
 
-        if not item:
-            return [], 0, 0
+    @staticmethod
+    def listar_pagina(limite: int = 20, apos: Optional[Tuple[str, int]] = None,
+                      antes: Optional[Tuple[str, int]] = None, item_id: Optional[int] = None,
+                      data_inicio: Optional[str] = None, data_fim: Optional[str] = None) -> List[Movimentacao]:
+        """Retorna uma página de movimentações, mais recentes primeiro (datas em DD/MM/AAAA)"""
+        data_inicio_db = converter_data_para_banco(data_inicio) if data_inicio else None
+        data_fim_db = converter_data_para_banco(data_fim) if data_fim else None
 
-        # 1. Calcula saldo inicial: saldo antes do período filtrado
-        saldo_inicial = item.saldo_inicial  # Começa com o saldo inicial do item
+        return MovimentacaoRepository.listar_pagina(
+            limite, apos=apos, antes=antes, item_id=item_id,
+            data_inicio=data_inicio_db, data_fim=data_fim_db)
 
-        # Busca TODAS as movimentações anteriores ao período
-        movimentacoes_anteriores = MovimentacaoRepository.listar_por_item(
-            item_id,
-            data_fim=None,  # Todas até o início do período
-            data_inicio=None if not data_inicio else "0000-01-01"  # Data fictícia inicial
-        )
+    @staticmethod
+    def historico_por_item(item_id: int, data_inicio: Optional[str] = None, data_fim: Optional[str] = None) -> Tuple[List[Movimentacao], int, int]:
+        """Retorna histórico, saldo inicial e saldo final
 
-        # Aplica apenas as movimentações anteriores
-        for mov in movimentacoes_anteriores:
-            if data_inicio and mov.data >= data_inicio_db:
-                continue  # Ignora movimentações dentro do período
+        Saldos e movimentações vêm do mesmo instantâneo de leitura, então
+        um registro feito no meio da consulta não os deixa incoerentes.
+        """
+        # Converte datas para formato do banco
+        data_inicio_db = converter_data_para_banco(data_inicio) if data_inicio else None
+        data_fim_db = converter_data_para_banco(data_fim) if data_fim else None
 
-            if mov.tipo == 'entrada':
-                saldo_inicial += mov.quantidade
-            else:
-                saldo_inicial -= mov.quantidade
+        # Só leitura: os checkpoints são mantidos pela tarefa agendada e
+        # _saldo_ate soma as movimentações posteriores ao último deles
+        with db_manager.leitura():
+            saldos = MovimentacaoRepository.saldos_periodo(item_id, data_inicio_db, data_fim_db)
+            if saldos is None:
+                return [], 0, 0
+            saldo_inicial, saldo_final = saldos
 
-        # 2. Calcula saldo final: saldo inicial + movimentações do período
-        saldo_final = saldo_inicial
-        for mov in movimentacoes:
-            if mov.tipo == 'entrada':
-                saldo_final += mov.quantidade
-            else:
-                saldo_final -= mov.quantidade
+            movimentacoes = MovimentacaoRepository.listar_por_item(item_id, data_inicio_db, data_fim_db)
 
-        return movimentacoes, saldo_inicial, saldo_final
\ No newline at end of file
+        return movimentacoes, saldo_inicial, saldo_final
+
+    @staticmethod
+    def atualizar_checkpoints(item_id: Optional[int] = None) -> int:
+        """Atualiza incrementalmente os checkpoints de saldo (de um item ou de todos)"""
+        return MovimentacaoRepository.atualizar_checkpoints(item_id)
@@ -0,0 +1,132 @@
+from datetime import date, datetime, timedelta
+from itertools import islice
+from typing import List, Optional, Tuple
+from src.core import config
+from src.core.database import db_manager
+from src.models.item import Item
+from src.repositories.item_repository import ItemRepository
+from src.repositories.relatorio_repository import RelatorioRepository, COLUNAS_ABC, CRITERIOS_ABC
+from src.utils.helpers import converter_data_para_banco
+from src.utils.logger import logger
+
+class RelatorioService:
+    """Relatórios lidos de um instantâneo somente leitura (db_manager.leitura)
+
+    Assim um relatório longo nunca segura nem espera o registro de
+    movimentações, e todas as consultas de um mesmo relatório são coerentes.
+    """
+
+    @staticmethod
+    def itens_prox_validade(dias: int) -> List[Item]:
+        """Itens que vencem nos próximos 'dias' dias"""
+        try:
+            with db_manager.leitura():
+                return ItemRepository.itens_prox_validade(dias)
+        except Exception as e:
+            logger.error(f"Erro ao gerar relatório de validade: {e}")
+            return []
+
+    @staticmethod
+    def estoque_baixo(minimo: int) -> List[Item]:
+        """Itens com estoque abaixo do mínimo, filtrados no banco"""
+        try:
+            with db_manager.leitura():
+                return ItemRepository.itens_estoque_baixo(minimo)
+        except Exception as e:
+            logger.error(f"Erro ao gerar relatório de estoque baixo: {e}")
+            return []
+
+    @staticmethod
+    def movimentacoes_por_periodo(data_inicio: Optional[str] = None, data_fim: Optional[str] = None) -> List[dict]:
+        """Entradas, saídas e saldo do período por item (datas em DD/MM/AAAA)"""
+        data_inicio_db = converter_data_para_banco(data_inicio) if data_inicio else None
+        data_fim_db = converter_data_para_banco(data_fim) if data_fim else None
+
+        try:
+            with db_manager.leitura():
+                return RelatorioRepository.resumo_movimentacoes(data_inicio_db, data_fim_db)
+        except Exception as e:
+            logger.error(f"Erro ao gerar relatório de movimentações por período: {e}")
+            return []
+
+    @staticmethod
+    def movimentacoes_detalhadas(data_inicio: Optional[str] = None, data_fim: Optional[str] = None) -> List[dict]:
+        """Movimentações do período com nome do item (datas em DD/MM/AAAA)"""
+        data_inicio_db = converter_data_para_banco(data_inicio) if data_inicio else None
+        data_fim_db = converter_data_para_banco(data_fim) if data_fim else None
+
+        try:
+            with db_manager.leitura():
+                return RelatorioRepository.movimentacoes_detalhadas(data_inicio_db, data_fim_db)
+        except Exception as e:
+            logger.error(f"Erro ao gerar relatório de movimentações detalhadas: {e}")
+            return []
+
+    @staticmethod
+    def curva_abc(criterio: str = 'estoque', data_inicio: Optional[str] = None, data_fim: Optional[str] = None,
+                  limite: int = 20) -> Tuple[List[dict], List[dict]]:
+        """Resumo por tipo e classe e os 'limite' itens de maior valor na curva ABC
+
+        Critério 'estoque' (valor em estoque) ou 'consumo' (valor das saídas
+        do período, datas em DD/MM/AAAA). Só os itens exibidos são lidos do
+        banco; a classificação do catálogo inteiro é feita no SQL.
+        """
+        if criterio not in CRITERIOS_ABC:
+            raise ValueError(f"Critério inválido (use {', '.join(CRITERIOS_ABC)})")
+        data_inicio_db = converter_data_para_banco(data_inicio) if data_inicio else None
+        data_fim_db = converter_data_para_banco(data_fim) if data_fim else None
+        limites = (config.ABC_LIMITE_A, config.ABC_LIMITE_B)
+
+        try:
+            with db_manager.leitura():
+                resumo = RelatorioRepository.resumo_curva_abc(criterio, data_inicio_db, data_fim_db, *limites)
+                itens = [dict(zip(COLUNAS_ABC, linha)) for linha in islice(
+                    RelatorioRepository.iter_curva_abc(criterio, data_inicio_db, data_fim_db, *limites), limite)]
+        except Exception as e:
+            logger.error(f"Erro ao gerar curva ABC: {e}")
+            return [], []
+        return resumo, itens
+
+    @staticmethod
+    def previsao_consumo(referencia: Optional[str] = None,
+                         janela: int = config.PREVISAO_JANELA_DIAS,
+                         janela_recente: int = config.PREVISAO_JANELA_RECENTE_DIAS,
+                         prazo_reposicao: float = config.PREVISAO_PRAZO_REPOSICAO_DIAS,
+                         nivel_servico: float = config.PREVISAO_NIVEL_SERVICO) -> Tuple[bool, str, List[dict]]:
+        """Consumo diário, cobertura, data de ruptura e ponto de reposição de todo o catálogo
+
+        O histórico são as saídas dos 'janela' dias até a data de referência
+        (DD/MM/AAAA, padrão hoje), inclusive. Retorna (sucesso, mensagem,
+        linhas) com os itens que tiveram saída, dos mais urgentes para os
+        menos; sem o numpy instalado, sucesso é False.
+        """
+        # numpy só é importado aqui, para não atrasar a partida do sistema
+        from src.services import analise_consumo
+
+        if not analise_consumo.disponivel():
+            return False, "A previsão de consumo requer o pacote numpy (pip install numpy)", []
+        if janela < 1 or not 1 <= janela_recente <= janela:
+            return False, "Janelas inválidas", []
+        if not 0 < nivel_servico < 1:
+            return False, "O nível de serviço deve estar entre 0 e 1", []
+
+        try:
+            fim = datetime.strptime(referencia, "%d/%m/%Y").date() if referencia else date.today()
+        except ValueError:
+            return False, "Data de referência inválida! Use o formato DD/MM/AAAA", []
+
+        inicio = fim - timedelta(days=janela - 1)
+        try:
+            # Estoque e saídas do mesmo instante
+            with db_manager.leitura():
+                itens = RelatorioRepository.estoques()
+                consumo = RelatorioRepository.consumo_diario(inicio.isoformat(), fim.isoformat())
+            colunas = analise_consumo.prever(itens, consumo, fim, janela, janela_recente,
+                                             prazo_reposicao, nivel_servico)
+            linhas = analise_consumo.linhas_previsao(itens, colunas)
+        except Exception as e:
+            logger.error(f"Erro ao gerar previsão de consumo: {e}")
+            return False, f"Erro ao gerar previsão de consumo: {e}", []
+
+        repor = sum(1 for linha in linhas if linha['repor'])
+        return True, f"{len(linhas)} itens com consumo no período, {repor} no ponto de reposição", linhas
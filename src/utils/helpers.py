@@ -1,5 +1,9 @@
-from datetime import datetime
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Optional, Tuple
+import calendar
 import os
+import unicodedata
 
 def input_int(mensagem: str, min_val: int = None, max_val: int = None) -> int:
     """Garante que o usuário digite um inteiro válido"""
@@ -55,9 +59,141 @@ def converter_data_para_banco(data_str: str, formato_origem: str = "%d/%m/%Y") -
     except ValueError:
         return data_str  # Retorna original se falhar
 
+# Formato canônico de movimentacoes.data; movimentacoes.data_ts é derivado dele
+FORMATO_DATA_HORA_BANCO = "%Y-%m-%d %H:%M:%S"
+_EPOCA = datetime(1970, 1, 1)
+
+def data_hora_banco(momento: Optional[datetime] = None) -> str:
+    """Data e hora no formato canônico do banco (padrão: agora)"""
+    return (momento or datetime.now()).strftime(FORMATO_DATA_HORA_BANCO)
+
+def para_timestamp(data_str: str) -> int:
+    """AAAA-MM-DD[ HH:MM:SS] para segundos desde 1970, como strftime('%s', ...) do SQLite
+
+    A data é tratada como está (hora local, sem fuso), o mesmo critério da
+    coluna data_ts, então os valores podem ser comparados diretamente.
+    """
+    return calendar.timegm(datetime.fromisoformat(data_str).timetuple())
+
+def de_timestamp(segundos: int) -> str:
+    """Inverso de para_timestamp, no formato canônico do banco"""
+    return (_EPOCA + timedelta(seconds=segundos)).strftime(FORMATO_DATA_HORA_BANCO)
+
+def limites_periodo(data_inicio: Optional[str],
+                    data_fim: Optional[str]) -> Tuple[Optional[int], Optional[int]]:
+    """Período [início, fim) em data_ts a partir de datas AAAA-MM-DD inclusivas
+
+    Uma data final sem hora inclui o dia inteiro (o limite vira a meia-noite
+    do dia seguinte); com hora, inclui aquele segundo.
+    """
+    inicio = para_timestamp(data_inicio) if data_inicio else None
+    fim = None
+    if data_fim:
+        fim = para_timestamp(data_fim) + (86400 if len(data_fim) <= 10 else 1)
+    return inicio, fim
+
 def converter_data_para_exibir(data_str: str, formato_banco: str = "%Y-%m-%d %H:%M:%S") -> str:
     """Converte data do banco para formato legível"""
     try:
         return datetime.strptime(data_str, formato_banco).strftime("%d/%m/%Y %H:%M")
     except ValueError:
-        return data_str  # Retorna original se falhar
\ No newline at end of file
+        return data_str  # Retorna original se falhar
+
+def normalizar_texto(texto: Optional[str]) -> Optional[str]:
+    """Remove acentos, ignora maiúsculas e espaços repetidos ("Sabão  Neutro" -> "sabao neutro")"""
+    if texto is None:
+        return None
+    decomposto = unicodedata.normalize("NFKD", str(texto))
+    sem_acentos = "".join(c for c in decomposto if not unicodedata.combining(c))
+    return " ".join(sem_acentos.casefold().split())
+
+def navegar_paginas(buscar_pagina: Callable, exibir_pagina: Callable, chave: Callable, tamanho: int = 20) -> int:
+    """Exibe registros página a página, buscando apenas a página atual
+
+    buscar_pagina(limite=..., apos=..., antes=...) retorna uma lista de registros
+    e chave(registro) a posição dele na ordenação. Retorna o número de páginas
+    percorridas (0 quando não há registros).
+    """
+    pagina = buscar_pagina(limite=tamanho + 1)
+    tem_proxima = len(pagina) > tamanho
+    pagina = pagina[:tamanho]
+    numero = 1
+    if not pagina:
+        return 0
+
+    while True:
+        exibir_pagina(pagina)
+
+        opcoes = []
+        if numero > 1:
+            opcoes.append("[A] anterior")
+        if tem_proxima:
+            opcoes.append("[P] próxima")
+        opcoes.append("[Enter] sair")
+        escolha = input(f"Página {numero} | {' | '.join(opcoes)}: ").strip().lower()
+
+        if escolha == 'p' and tem_proxima:
+            nova = buscar_pagina(limite=tamanho + 1, apos=chave(pagina[-1]))
+            tem_proxima = len(nova) > tamanho
+            if nova:
+                pagina = nova[:tamanho]
+                numero += 1
+        elif escolha == 'a' and numero > 1:
+            nova = buscar_pagina(limite=tamanho, antes=chave(pagina[0]))
+            if nova:
+                pagina = nova
+                tem_proxima = True
+            numero = numero - 1 if nova else 1
+        elif not escolha:
+            return numero
+
+def executar_importacao(importar: Callable, colunas: str):
+    """Pede o arquivo, executa a importação exibindo o progresso e mostra o resumo
+
+    importar(caminho, ao_confirmar=...) é um dos métodos do ImportacaoService.
+    """
+    print(f"Colunas esperadas: {colunas}")
+    caminho = input("Arquivo (.csv ou .jsonl): ").strip().strip('"')
+    if not caminho:
+        print("Operação cancelada.")
+        return
+
+    def ao_confirmar(resultado):
+        print(f"\r  {resultado.linhas_lidas} linhas lidas | {resultado.gravadas} gravadas | "
+              f"{resultado.erros} erros", end="", flush=True)
+
+    resultado = importar(caminho, ao_confirmar=ao_confirmar)
+    if resultado.linhas_lidas:
+        print()
+    if resultado.retomada_da_linha and not resultado.mensagem.startswith("Arquivo já"):
+        print(f"Importação retomada após a linha {resultado.retomada_da_linha}.")
+    print(f"\n{resultado.mensagem}")
+    if resultado.relatorio_erros:
+        print(f"Relatório de erros: {resultado.relatorio_erros}")
+
+def executar_exportacao(exportar: Callable, nome: str, diretorio, pergunta: str = "Exportar para arquivo?"):
+    """Oferece exportar o relatório, exibindo o progresso e a vazão em linhas/s
+
+    exportar(caminho, formato=..., ao_progresso=...) é um dos métodos do
+    ExportacaoService com os filtros do relatório já aplicados.
+    """
+    if input(f"\n{pergunta} (s/n): ").strip().lower() != 's':
+        return
+
+    formato = input("Formato [csv/jsonl/xlsx] (padrão csv): ").strip().lower() or 'csv'
+    padrao = Path(diretorio) / f"{nome}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{formato}"
+    caminho = input(f"Arquivo [{padrao}]: ").strip().strip('"') or padrao
+
+    exibiu_progresso = False
+
+    def ao_progresso(linhas: int, segundos: float):
+        nonlocal exibiu_progresso
+        exibiu_progresso = True
+        print(f"\r  {linhas} linhas ({linhas / segundos:.0f} linhas/s)", end="", flush=True)
+
+    resultado = exportar(caminho, formato=formato, ao_progresso=ao_progresso)
+    if exibiu_progresso:
+        print()
+    print(resultado.mensagem)
+    if resultado.sucesso:
+        print(f"Arquivo: {resultado.caminho}")
@@ -1,22 +1,25 @@
 import logging
 from pathlib import Path
 
-def configurar_logger():
-    """Configura o sistema de logging global"""
+def configurar_logger(console: bool = True):
+    """Configura o sistema de logging global
+
+    Chamado pelo ponto de entrada (main.py), não ao importar o módulo. O
+    arquivo de log só é aberto na primeira mensagem gravada. Com
+    console=False (menu interativo) as mensagens vão só para o arquivo, para
+    que as tarefas em segundo plano não escrevam no meio do login e dos menus.
+    """
     logs_dir = Path("logs")
     logs_dir.mkdir(exist_ok=True)
 
+    handlers = [logging.FileHandler(logs_dir / "almoxarifado.log", delay=True)]
+    if console:
+        handlers.append(logging.StreamHandler())
     logging.basicConfig(
         level=logging.INFO,
         format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler(logs_dir / "almoxarifado.log"),
-            logging.StreamHandler()
-        ]
+        handlers=handlers
     )
 
-# Configura o logger ao importar o módulo
-configurar_logger()
-
 # Cria o logger global
-logger = logging.getLogger(__name__)
\ No newline at end of file
+logger = logging.getLogger(__name__)
@@ -0,0 +1,52 @@
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+# O banco dos testes fica num diretório temporário, nunca em database/
+_DIRETORIO = Path(tempfile.mkdtemp(prefix="almox_testes_"))
+os.environ["ALMOX_DB_PATH"] = str(_DIRETORIO / "almoxarifado.db")
+os.environ["ALMOX_BACKUP_DIR"] = str(_DIRETORIO / "backups")
+
+RAIZ = Path(__file__).resolve().parent.parent
+if str(RAIZ) not in sys.path:
+    sys.path.insert(0, str(RAIZ))
+
+from src.core.database import db_manager
+from src.core.escritor import escritor
+from src.models.item import Item
+from src.repositories.cache import cache_itens
+from src.repositories.item_repository import ItemRepository
+
+def pytest_unconfigure(config):
+    db_manager.fechar_conexoes()
+    shutil.rmtree(_DIRETORIO, ignore_errors=True)
+
+@pytest.fixture
+def banco():
+    """Banco de testes vazio (apagar os itens leva junto as movimentações, por ON DELETE CASCADE)"""
+    with db_manager.conexao() as conn:
+        conn.execute("DELETE FROM itens")
+    cache_itens.invalidar()
+    yield db_manager.db_path
+
+@pytest.fixture
+def criar_item(banco):
+    """Cadastra um item com o estoque informado e retorna o seu id"""
+    def criar(nome: str, quantidade: int = 0, **campos) -> int:
+        item = Item(nome=nome, quantidade=quantidade, preco=campos.pop('preco', 1.0),
+                    tipo=campos.pop('tipo', 'Material'), **campos)
+        sucesso, mensagem = ItemRepository.salvar(item)
+        assert sucesso, mensagem
+        return item.id
+    return criar
+
+@pytest.fixture
+def escritor_dedicado(banco):
+    """Escritor dedicado em execução durante o teste"""
+    escritor.iniciar()
+    yield escritor
+    escritor.parar()
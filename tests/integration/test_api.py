@@ -0,0 +1,86 @@
+import http.client
+import json
+import threading
+
+import pytest
+
+from src.api.servidor import criar_servidor
+
+@pytest.fixture
+def api(banco):
+    """Servidor da API numa porta livre; devolve uma função (método, caminho, corpo) -> (status, json)
+
+    O endereço do servidor fica em 'endereco', para requisições montadas à mão.
+    """
+    servidor = criar_servidor(porta=0)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    conexao = http.client.HTTPConnection(*servidor.server_address, timeout=10)
+
+    def requisitar(metodo, caminho, corpo=None):
+        dados = json.dumps(corpo).encode('utf-8') if corpo is not None else None
+        conexao.request(metodo, caminho, body=dados, headers={'Content-Type': 'application/json'})
+        resposta = conexao.getresponse()
+        return resposta.status, json.loads(resposta.read() or b'null')
+
+    requisitar.endereco = servidor.server_address
+    yield requisitar
+    conexao.close()
+    servidor.shutdown()
+    servidor.server_close()
+
+def test_cadastro_consulta_e_movimentacao_de_item(api):
+    status, corpo = api('POST', '/itens', {'nome': "Cimento", 'quantidade': 10, 'preco': 32.5, 'tipo': "Construção"})
+    assert status == 201
+    item_id = corpo['id']
+
+    status, corpo = api('POST', '/movimentacoes',
+                        {'item_id': item_id, 'tipo': 'saída', 'quantidade': 4, 'responsavel': "Ana"})
+    assert status == 201, corpo
+
+    status, corpo = api('GET', f'/itens/{item_id}')
+    assert (status, corpo['nome'], corpo['quantidade']) == (200, "Cimento", 6)
+
+def test_lote_invalido_nao_grava_nada(api):
+    _, corpo = api('POST', '/itens', {'nome': "Cimento", 'quantidade': 1, 'preco': 1, 'tipo': "Construção"})
+    item_id = corpo['id']
+
+    status, _ = api('POST', '/movimentacoes/lote', [
+        {'item_id': item_id, 'tipo': 'entrada', 'quantidade': 1, 'responsavel': "Ana"},
+        {'item_id': item_id, 'tipo': 'saída', 'quantidade': 5, 'responsavel': "Ana"},
+    ])
+
+    assert status >= 400
+    assert api('GET', f'/itens/{item_id}')[1]['quantidade'] == 1
+
+def test_erros_do_cliente(api):
+    assert api('GET', '/nada')[0] == 404
+    assert api('DELETE', '/saude')[0] == 405
+    assert api('GET', '/itens/999999')[0] == 404
+    status, corpo = api('POST', '/itens', {'nome': "Cimento", 'cor': "cinza"})
+    assert status == 400 and "cor" in corpo['mensagem']
+    status, corpo = api('POST', '/itens', {'nome': "Cimento", 'quantidade': "10"})
+    assert status == 422 and set(corpo['campos']) == {'quantidade'}
+
+def test_movimentacao_com_data_informada(api):
+    _, corpo = api('POST', '/itens', {'nome': "Cimento", 'quantidade': 10, 'preco': 1, 'tipo': "Construção"})
+    item_id = corpo['id']
+
+    status, corpo = api('POST', '/movimentacoes', {'item_id': item_id, 'tipo': 'saída', 'quantidade': 1,
+                                                   'responsavel': "Ana", 'data': "2025-03-10 08:30:00"})
+    assert status == 201, corpo
+
+    _, corpo = api('GET', f'/itens/{item_id}/historico')
+    assert [m['data'] for m in corpo['movimentacoes']] == ["2025-03-10 08:30:00"]
+
+@pytest.mark.parametrize("tamanho", ["abc", "-1"])
+def test_content_length_invalido(api, tamanho):
+    conexao = http.client.HTTPConnection(*api.endereco, timeout=10)
+    try:
+        conexao.putrequest('POST', '/itens')
+        conexao.putheader('Content-Length', tamanho)
+        conexao.endheaders()
+        resposta = conexao.getresponse()
+        assert resposta.status == 400
+        assert json.loads(resposta.read())['mensagem'] == "Content-Length inválido"
+    finally:
+        conexao.close()
@@ -0,0 +1,85 @@
+import gzip
+import sqlite3
+from datetime import datetime
+
+import pytest
+
+from src.core import backup
+from src.core.database import db_manager
+
+@pytest.fixture
+def backups(banco, tmp_path, monkeypatch):
+    """Diretório de backups próprio do teste"""
+    diretorio = tmp_path / "backups"
+    diretorio.mkdir()
+    monkeypatch.setattr(db_manager, "backup_dir", diretorio)
+    return diretorio
+
+@pytest.mark.parametrize("modo,compressao", [("online", "gzip"), ("vacuum", None)])
+def test_backup_verificado_com_checksum(criar_item, backups, modo, compressao):
+    criar_item("Cimento", 10)
+
+    destino = db_manager.fazer_backup(modo=modo, compressao=compressao, pausa=0)
+
+    assert destino is not None and destino.exists()
+    assert backup.conferir_checksum(destino)
+    assert sorted(p.name for p in backups.iterdir()) == [destino.name, destino.name + ".sha256"]
+
+    copia = backups / "restaurado.db"
+    conteudo = destino.read_bytes()
+    copia.write_bytes(gzip.decompress(conteudo) if compressao else conteudo)
+    conn = sqlite3.connect(copia)
+    try:
+        assert conn.execute("PRAGMA integrity_check").fetchone()[0] == "ok"
+        assert conn.execute("SELECT nome, quantidade FROM itens").fetchall() == [("Cimento", 10)]
+    finally:
+        conn.close()
+
+def test_backup_corrompido_reprova_no_checksum(criar_item, backups):
+    criar_item("Cimento", 10)
+    destino = db_manager.fazer_backup(compressao="gzip", pausa=0)
+
+    conteudo = bytearray(destino.read_bytes())
+    conteudo[len(conteudo) // 2] ^= 0xFF
+    destino.write_bytes(bytes(conteudo))
+
+    assert not backup.conferir_checksum(destino)
+
+def test_backup_com_compressao_indisponivel_nao_deixa_arquivos(criar_item, backups, monkeypatch):
+    criar_item("Cimento", 10)
+    monkeypatch.setattr(backup, "zstandard", None)
+
+    assert db_manager.fazer_backup(compressao="zstd") is None
+    assert db_manager.fazer_backup(compressao="rar") is None
+    assert not any(backups.iterdir())
+
+def test_backups_no_mesmo_segundo_nao_colidem(criar_item, backups):
+    criar_item("Cimento", 10)
+
+    primeiro = db_manager.fazer_backup(compressao=None, pausa=0)
+    segundo = db_manager.fazer_backup(compressao=None, pausa=0)
+
+    assert primeiro != segundo
+    assert len(backup.listar_backups(backups)) == 2
+
+def test_retencao_mantem_o_mais_recente_de_cada_dia_e_mes(tmp_path):
+    momentos = [
+        datetime(2025, 1, 15, 3), datetime(2025, 1, 31, 3),
+        datetime(2025, 2, 27, 3), datetime(2025, 2, 28, 3), datetime(2025, 2, 28, 15),
+        datetime(2025, 3, 1, 3), datetime(2025, 3, 2, 3),
+    ]
+    for momento in momentos:
+        caminho = tmp_path / backup.nome_backup(momento, "gzip")
+        caminho.write_bytes(b"backup")
+        backup.gravar_checksum(caminho)
+    (tmp_path / "backup_20250101_030000.db").write_bytes(b"nome antigo")
+    (tmp_path / "outro_arquivo.db").write_bytes(b"fora do padrao")
+
+    removidos = backup.aplicar_retencao(tmp_path, diarios=2, mensais=2)
+
+    restantes = [momento for momento, _ in backup.listar_backups(tmp_path)]
+    assert restantes == [datetime(2025, 3, 2, 3), datetime(2025, 3, 1, 3), datetime(2025, 2, 28, 15)]
+    assert len(removidos) == 5
+    assert (tmp_path / "outro_arquivo.db").exists()
+    for caminho in removidos:
+        assert not caminho.with_name(caminho.name + ".sha256").exists()
@@ -0,0 +1,90 @@
+import csv
+
+import pytest
+
+from src.core.database import db_manager
+from src.services.importacao_service import ImportacaoService
+
+class Interrupcao(Exception):
+    pass
+
+def _interromper_apos(blocos: int):
+    """ao_confirmar que simula a queda do processo depois de 'blocos' blocos confirmados"""
+    confirmados = []
+
+    def ao_confirmar(resultado):
+        confirmados.append(resultado.linhas_lidas)
+        if len(confirmados) == blocos:
+            raise Interrupcao("processo encerrado")
+    return ao_confirmar
+
+def _contar(tabela: str) -> int:
+    with db_manager.conexao() as conn:
+        return conn.execute(f"SELECT COUNT(*) FROM {tabela}").fetchone()[0]
+
+@pytest.fixture
+def importacoes(banco):
+    """Sem progresso de importações anteriores"""
+    with db_manager.conexao() as conn:
+        conn.execute("DELETE FROM importacoes")
+
+@pytest.fixture
+def arquivo_itens(importacoes, tmp_path):
+    caminho = tmp_path / "itens.csv"
+    caminho.write_text(
+        "nome;quantidade;preco;tipo\n"
+        "Cimento;10;32,50;Construção\n"
+        "Areia;5;80;Construção\n"
+        "Brita;x;90;Construção\n"
+        "Luva;20;4,90;EPI\n"
+        "Bota;3;120;EPI\n"
+        "Capacete;7;45;EPI\n",
+        encoding='utf-8')
+    return caminho
+
+def test_importacao_interrompida_continua_do_ultimo_bloco(arquivo_itens):
+    primeira = ImportacaoService.importar_itens(arquivo_itens, tamanho_lote=2,
+                                                ao_confirmar=_interromper_apos(1))
+    assert not primeira.concluida
+    assert "interrompida" in primeira.mensagem
+    assert _contar("itens") == 2
+
+    segunda = ImportacaoService.importar_itens(arquivo_itens, tamanho_lote=2)
+    assert segunda.concluida
+    assert segunda.retomada_da_linha == 3
+    assert (segunda.linhas_lidas, segunda.gravadas, segunda.erros) == (4, 3, 1)
+    assert _contar("itens") == 5
+
+    with open(segunda.relatorio_erros, encoding='utf-8', newline='') as f:
+        linhas = list(csv.reader(f, delimiter=';'))
+    assert [linha[0] for linha in linhas[1:]] == ["4"]
+
+    terceira = ImportacaoService.importar_itens(arquivo_itens, tamanho_lote=2)
+    assert terceira.concluida and terceira.linhas_lidas == 0
+    assert "já importado" in terceira.mensagem
+    assert _contar("itens") == 5
+
+def test_reiniciar_descarta_o_progresso(arquivo_itens):
+    ImportacaoService.importar_itens(arquivo_itens, tamanho_lote=2, ao_confirmar=_interromper_apos(1))
+
+    resultado = ImportacaoService.importar_itens(arquivo_itens, tamanho_lote=2, reiniciar=True)
+
+    assert resultado.retomada_da_linha == 0
+    assert resultado.gravadas == 3
+    assert resultado.erros == 3  # Cimento e Areia já cadastrados, Brita inválida
+    assert _contar("itens") == 5
+
+def test_movimentacoes_retomadas_nao_sao_aplicadas_duas_vezes(importacoes, criar_item, tmp_path):
+    item_id = criar_item("Cimento", 0)
+    caminho = tmp_path / "movimentacoes.jsonl"
+    caminho.write_text("".join(
+        f'{{"item_id": {item_id}, "tipo": "entrada", "quantidade": {quantidade}, "responsavel": "Teste"}}\n'
+        for quantidade in (1, 2, 3, 4, 5)), encoding='utf-8')
+
+    ImportacaoService.importar_movimentacoes(caminho, tamanho_lote=2, ao_confirmar=_interromper_apos(2))
+    resultado = ImportacaoService.importar_movimentacoes(caminho, tamanho_lote=2)
+
+    assert resultado.concluida and resultado.retomada_da_linha == 4
+    assert _contar("movimentacoes") == 5
+    with db_manager.conexao() as conn:
+        assert conn.execute("SELECT quantidade FROM itens WHERE id = ?", (item_id,)).fetchone()[0] == 15
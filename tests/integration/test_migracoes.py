@@ -0,0 +1,81 @@
+import shutil
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from src.core.database import db_manager
+from src.core.migrations import VERSAO_ATUAL, versao_banco
+from src.repositories.item_repository import ItemRepository
+from src.repositories.movimentacao_repository import MovimentacaoRepository
+from src.utils.helpers import normalizar_texto, para_timestamp
+
+BANCO_ORIGINAL = Path(__file__).resolve().parents[2] / "database" / "almoxarifado.db"
+
+@pytest.fixture
+def banco_original(tmp_path, monkeypatch):
+    """Cópia do banco distribuído com o projeto (sem migrações) com datas em formatos variados
+
+    O db_manager passa a usar a cópia, migrada na primeira conexão, e volta
+    ao banco dos testes ao final.
+    """
+    banco = tmp_path / "almoxarifado.db"
+    shutil.copyfile(BANCO_ORIGINAL, banco)
+    conn = sqlite3.connect(banco)
+    try:
+        assert versao_banco(conn) == 0
+        item_id = conn.execute("SELECT MIN(id) FROM itens").fetchone()[0]
+        conn.executemany(
+            "INSERT INTO movimentacoes (item_id, tipo, quantidade, data, responsavel) VALUES (?, 'entrada', 1, ?, 'Teste')",
+            [(item_id, "2025-03-31T10:00:00.123"), (item_id, "2025-03-31")])
+        conn.commit()
+        antes = {
+            'itens': conn.execute("SELECT id, nome, quantidade FROM itens ORDER BY id").fetchall(),
+            'movimentacoes': conn.execute("SELECT id, data FROM movimentacoes ORDER BY id").fetchall(),
+        }
+    finally:
+        conn.close()
+
+    db_manager.fechar_conexoes()
+    monkeypatch.setattr(db_manager, "db_path", banco)
+    monkeypatch.setattr(db_manager, "_pronto", False)
+    yield antes
+    db_manager.fechar_conexoes()
+
+def test_migracoes_preservam_os_dados(banco_original):
+    with db_manager.conexao() as conn:
+        assert versao_banco(conn) == VERSAO_ATUAL
+        itens = conn.execute("SELECT id, nome, quantidade FROM itens ORDER BY id").fetchall()
+        movimentacoes = conn.execute("SELECT id FROM movimentacoes ORDER BY id").fetchall()
+        assert conn.execute("PRAGMA integrity_check").fetchone()[0] == "ok"
+
+    assert itens == banco_original['itens']
+    assert [m for m, in movimentacoes] == [m for m, _ in banco_original['movimentacoes']]
+
+def test_migracoes_normalizam_as_datas(banco_original):
+    with db_manager.conexao() as conn:
+        datas = dict(conn.execute("SELECT id, data FROM movimentacoes"))
+        carimbos = dict(conn.execute("SELECT id, data_ts FROM movimentacoes"))
+
+    originais = dict(banco_original['movimentacoes'])
+    for mov_id, data in datas.items():
+        assert len(data) == 19 and data[10] == " "
+        assert data[:10] == originais[mov_id][:10]
+        assert carimbos[mov_id] == para_timestamp(data)
+    assert sorted(datas.values())[-2:] == ["2025-05-08 21:28:54", "2025-05-08 21:28:54"]
+    assert "2025-03-31 10:00:00" in datas.values()
+    assert "2025-03-31 00:00:00" in datas.values()
+
+    do_dia = MovimentacaoRepository.listar_todas("2025-03-31", "2025-03-31")
+    assert len(do_dia) == 2
+
+def test_migracoes_indexam_a_busca_textual(banco_original):
+    with db_manager.conexao() as conn:
+        nomes = conn.execute("SELECT nome, nome_normalizado FROM itens").fetchall()
+        indexados = conn.execute("SELECT COUNT(*) FROM itens_fts").fetchone()[0]
+
+    assert indexados == len(nomes)
+    for nome, normalizado in nomes:
+        assert normalizado.split("#")[0] == normalizar_texto(nome)
+    nome = nomes[0][0]
+    assert nome in [i.nome for i in ItemRepository.buscar_por_nome(normalizar_texto(nome))]
@@ -0,0 +1,20 @@
+from src.core.database import db_manager
+from src.models.movimentacao import Movimentacao
+from src.repositories.movimentacao_repository import MovimentacaoRepository
+from src.services.movimentacao_service import MovimentacaoService
+
+def test_historico_nao_grava_checkpoints(criar_item):
+    item_id = criar_item("Tinta", 0)
+    for data in ("2025-01-10 08:00:00", "2025-02-10 08:00:00"):
+        assert MovimentacaoRepository.registrar(Movimentacao(
+            item_id=item_id, tipo='entrada', quantidade=10, data=data, responsavel="Teste"))[0]
+
+    movimentacoes, saldo_inicial, saldo_final = MovimentacaoService.historico_por_item(
+        item_id, "01/02/2025", "28/02/2025")
+
+    assert (len(movimentacoes), saldo_inicial, saldo_final) == (1, 10, 20)
+    with db_manager.conexao() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM saldos_checkpoint").fetchone()[0] == 0
+
+def test_historico_de_item_inexistente(banco):
+    assert MovimentacaoService.historico_por_item(-1) == ([], 0, 0)
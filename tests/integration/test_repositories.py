@@ -0,0 +1,292 @@
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.core.database import db_manager
+from src.core.escritor import escritor
+from src.models.item import Item, ItemView
+from src.models.movimentacao import Movimentacao
+from src.repositories.cache import cache_itens
+from src.repositories.item_repository import ItemRepository
+from src.repositories.movimentacao_repository import MovimentacaoRepository
+from src.repositories.relatorio_repository import RelatorioRepository
+
+def _mov(item_id, tipo, quantidade, data="2025-03-10 10:00:00"):
+    return Movimentacao(item_id=item_id, tipo=tipo, quantidade=quantidade, data=data, responsavel="Teste")
+
+def _estoque(item_id):
+    with db_manager.conexao() as conn:
+        return conn.execute("SELECT quantidade FROM itens WHERE id = ?", (item_id,)).fetchone()[0]
+
+def _total_movimentacoes():
+    with db_manager.conexao() as conn:
+        return conn.execute("SELECT COUNT(*) FROM movimentacoes").fetchone()[0]
+
+# Lote de movimentações
+
+def test_lote_com_saida_negativa_nao_grava_nada(criar_item):
+    cimento = criar_item("Cimento", 10)
+    areia = criar_item("Areia", 5)
+
+    resultados = MovimentacaoRepository.registrar_lote([
+        _mov(cimento, 'entrada', 3),
+        _mov(areia, 'saída', 2),
+        _mov(cimento, 'saída', 14),
+    ])
+
+    assert [sucesso for sucesso, _ in resultados] == [False, False, False]
+    assert "Estoque insuficiente" in resultados[2][1]
+    assert _estoque(cimento) == 10
+    assert _estoque(areia) == 5
+    assert _total_movimentacoes() == 0
+
+def test_lote_soma_as_linhas_do_mesmo_item_em_ordem(criar_item):
+    cimento = criar_item("Cimento", 1)
+
+    resultados = MovimentacaoRepository.registrar_lote([
+        _mov(cimento, 'entrada', 4),
+        _mov(cimento, 'saída', 5),
+    ])
+
+    assert all(sucesso for sucesso, _ in resultados)
+    assert _estoque(cimento) == 0
+    assert _total_movimentacoes() == 2
+
+def test_lote_com_item_inexistente_nao_grava_nada(criar_item):
+    cimento = criar_item("Cimento", 10)
+
+    resultados = MovimentacaoRepository.registrar_lote([_mov(cimento, 'saída', 1), _mov(-1, 'entrada', 1)])
+
+    assert resultados[1] == (False, "Item não encontrado")
+    assert _estoque(cimento) == 10
+    assert _total_movimentacoes() == 0
+
+# Saídas concorrentes (UPDATE condicional)
+
+def test_saidas_concorrentes_nao_deixam_estoque_negativo(criar_item):
+    item_id = criar_item("Luva", 10)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        resultados = list(executor.map(
+            lambda _: MovimentacaoRepository.registrar(_mov(item_id, 'saída', 1)), range(30)))
+
+    assert sum(sucesso for sucesso, _ in resultados) == 10
+    assert all(mensagem == "Estoque insuficiente (disponível: 0)" for sucesso, mensagem in resultados if not sucesso)
+    assert _estoque(item_id) == 0
+    assert _total_movimentacoes() == 10
+
+def test_saidas_concorrentes_pelo_escritor_dedicado(criar_item, escritor_dedicado):
+    item_id = criar_item("Luva", 10)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        futuros = list(executor.map(
+            lambda _: MovimentacaoRepository.submeter(_mov(item_id, 'saída', 3)), range(8)))
+    resultados = [futuro.result(timeout=10) for futuro in futuros]
+
+    assert sum(sucesso for sucesso, _ in resultados) == 3
+    assert all("Estoque insuficiente" in mensagem for sucesso, mensagem in resultados if not sucesso)
+    assert _estoque(item_id) == 1
+    assert _total_movimentacoes() == 3
+
+def test_falha_do_escritor_resolve_os_pedidos(criar_item, monkeypatch):
+    item_id = criar_item("Luva", 10)
+    escritor.parar()
+
+    def sem_conexao():
+        raise sqlite3.OperationalError("disco indisponível")
+    monkeypatch.setattr(db_manager, "criar_conexao", sem_conexao)
+    with pytest.raises(RuntimeError, match="disco indisponível"):
+        MovimentacaoRepository.submeter(_mov(item_id, 'saída', 1)).result(timeout=10)
+    with pytest.raises(RuntimeError, match="interrompido"):
+        MovimentacaoRepository.submeter(_mov(item_id, 'saída', 1)).result(timeout=10)
+
+    monkeypatch.undo()
+    escritor.iniciar()
+    try:
+        assert MovimentacaoRepository.submeter(_mov(item_id, 'saída', 1)).result(timeout=10)[0]
+    finally:
+        escritor.parar()
+    assert _estoque(item_id) == 9
+
+def test_saida_de_item_inexistente(banco):
+    assert MovimentacaoRepository.registrar(_mov(-1, 'saída', 1)) == (False, "Item não encontrado")
+
+# Períodos [início, fim)
+
+def test_limites_do_periodo_sao_semiabertos(criar_item):
+    item_id = criar_item("Cabo", 0)
+    for data in ("2025-01-01 00:00:00", "2025-01-31 23:59:59", "2025-02-01 00:00:00"):
+        assert MovimentacaoRepository.registrar(_mov(item_id, 'entrada', 1, data))[0]
+
+    janeiro = MovimentacaoRepository.listar_por_item(item_id, "2025-01-01", "2025-01-31")
+    fevereiro = MovimentacaoRepository.listar_por_item(item_id, "2025-02-01", "2025-02-28")
+    ate_segundo = MovimentacaoRepository.listar_por_item(item_id, "2025-01-01", "2025-01-31 23:59:58")
+
+    assert sorted(m.data for m in janeiro) == ["2025-01-01 00:00:00", "2025-01-31 23:59:59"]
+    assert [m.data for m in fevereiro] == ["2025-02-01 00:00:00"]
+    assert [m.data for m in ate_segundo] == ["2025-01-01 00:00:00"]
+    assert MovimentacaoRepository.saldos_periodo(item_id, "2025-01-01", "2025-01-31") == (0, 2)
+    assert MovimentacaoRepository.saldos_periodo(item_id, "2025-02-01", "2025-02-28") == (2, 3)
+
+def test_datas_fora_do_formato_canonico(criar_item):
+    item_id = criar_item("Cabo", 0)
+    assert MovimentacaoRepository.registrar(_mov(item_id, 'entrada', 1, "2025-01-31T23:59:59.500"))[0]
+
+    assert [m.data for m in MovimentacaoRepository.listar_por_item(item_id)] == ["2025-01-31 23:59:59"]
+    assert not MovimentacaoRepository.registrar(_mov(item_id, 'entrada', 1, "31/01/2025"))[0]
+
+# Checkpoints de saldo
+
+def _checkpoints(item_id):
+    with db_manager.conexao() as conn:
+        return [data for data, in conn.execute(
+            "SELECT data FROM saldos_checkpoint WHERE item_id = ? ORDER BY data", (item_id,))]
+
+def _entradas_mensais(item_id):
+    for data in ("2025-01-10 08:00:00", "2025-02-10 08:00:00", "2025-03-10 08:00:00"):
+        assert MovimentacaoRepository.registrar(_mov(item_id, 'entrada', 10, data))[0]
+
+def test_checkpoints_mensais_e_saldos_do_periodo(criar_item):
+    item_id = criar_item("Tinta", 0)
+    _entradas_mensais(item_id)
+
+    assert MovimentacaoRepository.atualizar_checkpoints(item_id, ate="2025-04-01") == 3
+    assert _checkpoints(item_id) == ["2025-02-01", "2025-03-01", "2025-04-01"]
+    assert MovimentacaoRepository.atualizar_checkpoints(item_id, ate="2025-04-01") == 0
+    assert MovimentacaoRepository.saldos_periodo(item_id, "2025-02-01", "2025-02-28") == (10, 20)
+    assert MovimentacaoRepository.saldos_periodo(item_id) == (0, 30)
+    assert MovimentacaoRepository.saldos_periodo(-1) is None
+
+def test_movimentacao_retroativa_invalida_checkpoints_posteriores(criar_item):
+    item_id = criar_item("Tinta", 0)
+    _entradas_mensais(item_id)
+    MovimentacaoRepository.atualizar_checkpoints(item_id, ate="2025-04-01")
+
+    assert MovimentacaoRepository.registrar(_mov(item_id, 'saída', 5, "2025-02-20 08:00:00"))[0]
+
+    assert _checkpoints(item_id) == ["2025-02-01"]
+    assert MovimentacaoRepository.saldos_periodo(item_id, "2025-03-01", "2025-03-31") == (15, 25)
+
+def test_alteracao_e_exclusao_invalidam_checkpoints(criar_item):
+    item_id = criar_item("Tinta", 0)
+    _entradas_mensais(item_id)
+
+    MovimentacaoRepository.atualizar_checkpoints(item_id, ate="2025-04-01")
+    with db_manager.conexao() as conn:
+        conn.execute("UPDATE movimentacoes SET quantidade = 20 WHERE data = '2025-03-10 08:00:00'")
+    assert _checkpoints(item_id) == ["2025-02-01", "2025-03-01"]
+
+    MovimentacaoRepository.atualizar_checkpoints(item_id, ate="2025-04-01")
+    with db_manager.conexao() as conn:
+        conn.execute("DELETE FROM movimentacoes WHERE data = '2025-01-10 08:00:00'")
+    assert _checkpoints(item_id) == []
+
+# Busca textual
+
+def test_busca_ignora_acentos_e_maiusculas(criar_item):
+    acucar = criar_item("Açúcar Cristal", marca="União")
+    criar_item("Sabão Neutro", descricao="Limpeza pesada")
+
+    assert [i.id for i in ItemRepository.buscar_por_nome("acucar")] == [acucar]
+    assert [i.id for i in ItemRepository.buscar_por_nome("AÇÚCAR")] == [acucar]
+    assert [i.id for i in ItemRepository.buscar_por_nome("uniao")] == [acucar]
+    assert [i.nome for i in ItemRepository.buscar_por_nome("pesada")] == ["Sabão Neutro"]
+
+def test_busca_de_termo_curto_usa_substring_do_nome(criar_item):
+    pa = criar_item("Pá de Bico")
+    criar_item("Martelo", descricao="pá")
+
+    assert [i.id for i in ItemRepository.buscar_por_nome("pa")] == [pa]
+    assert [i.id for i in ItemRepository.buscar_por_nome("PÁ")] == [pa]
+    assert ItemRepository.buscar_por_nome("%") == []
+
+def test_nome_repetido_e_reconhecido_sem_acentos(criar_item):
+    criar_item("Açúcar Cristal")
+
+    assert ItemRepository.existe_nome("ACUCAR  cristal")
+    assert not ItemRepository.existe_nome("Açúcar")
+
+def test_escrita_de_outro_cliente_sqlite_entra_na_busca(banco, criar_item):
+    martelo = criar_item("Martelo")
+
+    externa = sqlite3.connect(banco)
+    try:
+        externa.execute("UPDATE itens SET descricao = 'Cabo de MADEIRA' WHERE id = ?", (martelo,))
+        externa.execute("INSERT INTO itens (nome, quantidade, preco, tipo) VALUES ('Serrote', 1, 1, 'Ferramenta')")
+        externa.commit()
+    finally:
+        externa.close()
+
+    assert [i.id for i in ItemRepository.buscar_por_nome("madeira")] == [martelo]
+    assert [i.nome for i in ItemRepository.buscar_por_nome("serrote")] == ["Serrote"]
+
+# Mapeamento das linhas
+
+def test_leitura_em_modelos_e_em_visoes(criar_item):
+    item_id = criar_item("Cimento", 10, marca="Votoran", preco=32.5)
+
+    item = ItemRepository.buscar_por_id(item_id)
+    visoes = list(ItemRepository.iter_todos(visao=True))
+
+    assert isinstance(item, Item)
+    assert (item.nome, item.marca, item.quantidade, item.preco) == ("Cimento", "Votoran", 10, 32.5)
+    assert visoes == [ItemView(*(getattr(item, campo) for campo in ItemView._fields))]
+
+# Cache de itens
+
+def test_cache_devolve_copias(criar_item):
+    item_id = criar_item("Luva", 5)
+    ItemRepository.buscar_por_id(item_id)
+    acertos = cache_itens.acertos
+
+    item = ItemRepository.buscar_por_id(item_id)
+    item.quantidade = 99
+
+    assert cache_itens.acertos == acertos + 1
+    assert ItemRepository.buscar_por_id(item_id).quantidade == 5
+
+def test_cache_mantem_entradas_apos_escrita_local(criar_item):
+    luva = criar_item("Luva", 5)
+    bota = criar_item("Bota", 5)
+    ItemRepository.buscar_por_id(luva)
+    ItemRepository.buscar_por_id(bota)
+
+    assert MovimentacaoRepository.registrar(_mov(luva, 'saída', 2))[0]
+
+    assert cache_itens.obter(bota) is not None
+    assert cache_itens.obter(luva) is None
+
+    assert ItemRepository.buscar_por_id(luva).quantidade == 3
+
+def test_cache_descarta_tudo_apos_escrita_de_outra_conexao(banco, criar_item):
+    luva = criar_item("Luva", 5)
+    ItemRepository.buscar_por_id(luva)
+
+    externa = sqlite3.connect(banco)
+    try:
+        externa.execute("UPDATE itens SET quantidade = 1 WHERE id = ?", (luva,))
+        externa.commit()
+    finally:
+        externa.close()
+
+    assert ItemRepository.buscar_por_id(luva).quantidade == 1
+
+# Relatórios do período
+
+def test_resumo_e_detalhe_do_periodo(criar_item):
+    cimento = criar_item("Cimento", 10)
+    areia = criar_item("Areia", 0)
+    for mov in (_mov(cimento, 'saída', 4), _mov(cimento, 'entrada', 1, "2025-03-11 10:00:00"), _mov(areia, 'entrada', 2),
+                _mov(cimento, 'entrada', 5, "2025-04-01 00:00:00")):
+        assert MovimentacaoRepository.registrar(mov)[0]
+
+    resumo = RelatorioRepository.resumo_movimentacoes("2025-03-01", "2025-03-31")
+    detalhe = RelatorioRepository.movimentacoes_detalhadas("2025-03-01", "2025-03-31")
+
+    assert [(r['nome'], r['movimentacoes'], r['entradas'], r['saidas'], r['saldo']) for r in resumo] == [
+        ("Areia", 1, 2, 0, 2), ("Cimento", 2, 1, 4, -3)]
+    assert [(d['nome'], d['tipo'], d['quantidade']) for d in detalhe] == [
+        ("Areia", 'entrada', 2), ("Cimento", 'saída', 4), ("Cimento", 'entrada', 1)]
+    assert [tuple(d.values()) for d in detalhe] == list(
+        RelatorioRepository.iter_movimentacoes_detalhadas("2025-03-01", "2025-03-31"))
@@ -0,0 +1,57 @@
+from datetime import date
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.services import analise_consumo
+
+ITENS = [(1, "Luva", "par", 4), (2, "Cimento", "saco", 100), (3, "Tinta", "lata", 5)]
+# (item_id, dia, quantidade) na janela de 10 dias; o item 4 não existe mais
+CONSUMO = [(1, 8, 2), (1, 9, 2), (2, 0, 10), (4, 5, 3)]
+
+def _prever():
+    return analise_consumo.prever(ITENS, CONSUMO, date(2025, 3, 10), janela=10, janela_recente=2,
+                                  prazo_reposicao=4, nivel_servico=0.95)
+
+def test_consumo_medio_recente_e_desvio():
+    colunas = _prever()
+
+    np.testing.assert_allclose(colunas['consumo_medio'], [0.4, 1.0, 0.0])
+    np.testing.assert_allclose(colunas['consumo_recente'], [2.0, 0.0, 0.0])
+    np.testing.assert_allclose(colunas['consumo_pico'], [2.0, 5.0, 0.0])
+    np.testing.assert_allclose(colunas['desvio_padrao'], [0.8, 3.0, 0.0])
+    assert colunas['dias_com_saida'].tolist() == [2, 1, 0]
+
+def test_cobertura_pelo_maior_consumo():
+    colunas = _prever()
+
+    np.testing.assert_allclose(colunas['dias_cobertura'], [2.0, 100.0, np.inf])
+    assert colunas['data_ruptura'][0] == np.datetime64('2025-03-12')
+    assert np.isnat(colunas['data_ruptura'][2])
+
+def test_linhas_ordenadas_pela_cobertura():
+    linhas = analise_consumo.linhas_previsao(ITENS, _prever())
+
+    assert [linha['item_id'] for linha in linhas] == [1, 2]
+    assert linhas[0]['data_ruptura'] == '2025-03-12'
+    assert (linhas[0]['ponto_reposicao'], linhas[0]['repor']) == (5, True)
+    assert (linhas[1]['ponto_reposicao'], linhas[1]['repor']) == (14, False)
+
+def test_medias_moveis_iguais_ao_calculo_direto(monkeypatch):
+    monkeypatch.setattr(analise_consumo, "_ITENS_POR_BLOCO", 3)
+    gerador = np.random.default_rng(42)
+    itens, janela, largura = 7, 30, 5
+    posicao = gerador.integers(0, itens - 1, 200)  # o último item fica sem saídas
+    dia = gerador.integers(0, janela, 200)
+    quantidade = gerador.integers(1, 10, 200).astype(np.float64)
+
+    ultima, pico = analise_consumo.medias_moveis(posicao, dia, quantidade, itens, janela, largura)
+
+    diario = np.zeros((itens, janela))
+    np.add.at(diario, (posicao, dia), quantidade)
+    janelas = np.array([[diario[i, fim - largura + 1:fim + 1].sum() / largura
+                         for fim in range(largura - 1, janela)] for i in range(itens)])
+    np.testing.assert_allclose(ultima, janelas[:, -1])
+    np.testing.assert_allclose(pico, janelas.max(axis=1))
+    assert ultima[-1] == pico[-1] == 0
@@ -0,0 +1,22 @@
+from src.utils.helpers import de_timestamp, limites_periodo, normalizar_texto, para_timestamp
+
+def test_normalizar_texto():
+    assert normalizar_texto("  Sabão   NEUTRO ") == "sabao neutro"
+    assert normalizar_texto("Açúcar") == "acucar"
+    assert normalizar_texto(None) is None
+
+def test_limites_de_periodo_com_data_final_sem_hora_incluem_o_dia_inteiro():
+    inicio, fim = limites_periodo("2025-01-01", "2025-01-31")
+
+    assert inicio == para_timestamp("2025-01-01 00:00:00")
+    assert fim == para_timestamp("2025-02-01 00:00:00")
+
+def test_limites_de_periodo_com_hora_incluem_so_aquele_segundo():
+    _, fim = limites_periodo(None, "2025-01-31 12:30:00")
+
+    assert fim == para_timestamp("2025-01-31 12:30:01")
+    assert limites_periodo(None, None) == (None, None)
+
+def test_timestamp_ida_e_volta():
+    assert de_timestamp(para_timestamp("2024-02-29 23:59:59")) == "2024-02-29 23:59:59"
+    assert para_timestamp("1970-01-02") == 86400
@@ -0,0 +1,46 @@
+import pytest
+
+from src.models.item import Item, ItemView
+from src.models.movimentacao import Movimentacao, MovimentacaoView
+
+def test_modelos_sem_dict_por_instancia():
+    item = Item(nome="Cimento")
+
+    assert not hasattr(item, '__dict__')
+    with pytest.raises(AttributeError):
+        item.cor = "cinza"
+
+def test_visoes_tem_os_campos_dos_modelos():
+    assert ItemView._fields == tuple(Item.__slots__)
+    assert MovimentacaoView._fields == tuple(Movimentacao.__slots__)
+
+def test_item_valido():
+    Item(nome="Cimento", quantidade=10, preco=32.5, tipo="Construção", data_validade="2026-01-31").validar()
+
+@pytest.mark.parametrize("campos,mensagem", [
+    ({'nome': ""}, "Nome"),
+    ({'nome': "x" * 101}, "Nome"),
+    ({'quantidade': -1}, "Quantidade"),
+    ({'preco': -0.01}, "Preço"),
+    ({'data_validade': "31/01/2026"}, "AAAA-MM-DD"),
+])
+def test_item_invalido(campos, mensagem):
+    item = Item(**{'nome': "Cimento", 'quantidade': 1, 'preco': 1.0, **campos})
+    with pytest.raises(ValueError, match=mensagem):
+        item.validar()
+
+def test_movimentacao_valida():
+    Movimentacao(item_id=1, tipo='saída', quantidade=1, data="2025-03-31 10:00:00", responsavel="Ana").validar()
+
+@pytest.mark.parametrize("campos,mensagem", [
+    ({'tipo': 'saida'}, "Tipo"),
+    ({'quantidade': 0}, "Quantidade"),
+    ({'responsavel': ""}, "Responsável"),
+    ({'data': "2025-03-31"}, "Data"),
+    ({'data': "2025-03-31T10:00:00"}, "Data"),
+])
+def test_movimentacao_invalida(campos, mensagem):
+    mov = Movimentacao(**{'item_id': 1, 'tipo': 'entrada', 'quantidade': 1,
+                          'data': "2025-03-31 10:00:00", 'responsavel': "Ana", **campos})
+    with pytest.raises(ValueError, match=mensagem):
+        mov.validar()
@@ -0,0 +1,45 @@
+from http import HTTPStatus
+
+import pytest
+
+from src.api.servidor import ErroRequisicao, _item_do_corpo, _movimentacao_do_corpo
+
+def test_corpo_de_item_valido():
+    item = _item_do_corpo({'nome': "Cimento", 'quantidade': 10, 'preco': 32, 'marca': None}, item_id=7)
+
+    assert (item.id, item.nome, item.quantidade, item.preco, item.marca) == (7, "Cimento", 10, 32.0, None)
+    assert isinstance(item.preco, float)
+
+def test_corpo_de_item_com_tipos_errados_lista_todos_os_campos():
+    with pytest.raises(ErroRequisicao) as erro:
+        _item_do_corpo({'nome': None, 'quantidade': "10", 'preco': True, 'data_validade': "31/01/2026"})
+
+    assert erro.value.status == HTTPStatus.UNPROCESSABLE_ENTITY
+    assert set(erro.value.campos) == {'nome', 'quantidade', 'preco', 'data_validade'}
+    assert "AAAA-MM-DD" in erro.value.campos['data_validade']
+
+def test_corpo_com_campo_desconhecido():
+    with pytest.raises(ErroRequisicao, match="Campos desconhecidos: cor") as erro:
+        _item_do_corpo({'nome': "Cimento", 'cor': "cinza"})
+    assert erro.value.status == HTTPStatus.BAD_REQUEST
+
+def test_id_do_item_vem_da_rota():
+    with pytest.raises(ErroRequisicao, match="Campos desconhecidos: id"):
+        _item_do_corpo({'id': 3, 'nome': "Cimento"}, item_id=7)
+
+def test_corpo_que_nao_e_objeto():
+    with pytest.raises(ErroRequisicao, match="Corpo deve ser um objeto JSON"):
+        _item_do_corpo(["Cimento"])
+    with pytest.raises(ErroRequisicao, match="Cada movimentação deve ser um objeto JSON"):
+        _movimentacao_do_corpo([1, 2])
+
+def test_corpo_de_movimentacao_valido():
+    mov = _movimentacao_do_corpo({'item_id': 1, 'tipo': 'entrada', 'quantidade': 2, 'responsavel': "Ana"})
+
+    assert (mov.item_id, mov.tipo, mov.quantidade, mov.responsavel) == (1, 'entrada', 2, "Ana")
+
+def test_corpo_de_movimentacao_exige_campos_obrigatorios():
+    with pytest.raises(ErroRequisicao) as erro:
+        _movimentacao_do_corpo({'tipo': 'entrada', 'quantidade': 1.5})
+
+    assert set(erro.value.campos) == {'item_id', 'quantidade', 'responsavel'}